@@ -6,3 +6,6 @@ from django.utils.translation import gettext_lazy as _
 class ApiConfig(AppConfig):
     name = "apps.api"
     verbose_name = _("API")
+
+    def ready(self) -> None:
+        from . import checks
@@ -0,0 +1,195 @@
+"""
+Async versions of the list and detail views, served under ASGI.
+
+Django 3.2 has no async ORM and DRF no async views, so these views await the
+sync parts of DRF (authentication, throttling, filtering, queries and
+serialization) with ``run_sync``, which keeps them off the single thread
+Django runs sync views in under ASGI. Lists count their rows while their
+page is fetched and serialized. Writes are handled by the sync handlers, in
+a thread.
+
+The views share their names, and so their response cache entries and
+validators, with the sync views they extend.
+"""
+
+from functools import update_wrapper
+
+from django.utils.decorators import classonlymethod
+
+from rest_framework.response import Response
+
+from . import views
+from .cache import CachedResponseMixin, ConditionalGetMixin
+from .concurrency import run_sync
+
+
+class AsyncAPIViewMixin:
+    """
+    Dispatch requests to the ``a<method>`` coroutine of the view if it has
+    one, and to its sync handler otherwise.
+
+    Every thread hop may take a database connection, so the sync work of a
+    request is grouped into as few hops as possible: ``initial`` and the
+    lookups of the conditional GET and of the response cache in one, then
+    the queries of the response, then storing and rendering it.
+    """
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        sync_view = super().as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.adispatch(request, *args, **kwargs)
+
+        # Keeps cls, initkwargs and csrf_exempt, set by DRF
+        update_wrapper(view, sync_view)
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        self.cache_key = None
+
+        try:
+            handler = getattr(self, f"a{request.method.lower()}", None)
+            if handler is not None:
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await run_sync(self.handle, request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return await run_sync(self.finish, self.response)
+
+    def handle(self, request, *args, **kwargs):
+        """Run ``initial`` and the sync handler of the request"""
+        self.initial(request, *args, **kwargs)
+        method = request.method.lower()
+        if method in self.http_method_names:
+            handler = getattr(self, method, self.http_method_not_allowed)
+        else:
+            handler = self.http_method_not_allowed
+        return handler(request, *args, **kwargs)
+
+    def finish(self, response):
+        """
+        Store a response built for the response cache, and render it, as
+        Django would render it in its sync thread
+        """
+        if self.cache_key is not None:
+            self.set_cached_data(self.cache_key, response)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def prepare(self, request, *args, **kwargs):
+        """
+        Run ``initial`` and look the response up with the conditional GET and
+        the response cache of the view, when it has them. Return that
+        response, or ``None`` when it has to be built.
+        """
+        self.initial(request, *args, **kwargs)
+        if isinstance(self, ConditionalGetMixin):
+            self.etag = self.get_etag()
+            if self.etag is not None:
+                response = self.get_precondition_response(request, self.etag)
+                if response is not None:
+                    return response
+
+        if isinstance(self, CachedResponseMixin):
+            key, data = self.get_cached_data()
+            if data is not None:
+                return Response(data)
+            self.cache_key = key
+        return None
+
+    async def aserve(self, handler, request, *args, **kwargs):
+        """
+        Await ``handler`` unless the conditional GET or the response cache of
+        the view answer the request.
+        """
+        response = await run_sync(self.prepare, request, *args, **kwargs)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        if isinstance(self, ConditionalGetMixin):
+            response = self.set_validators(response, self.etag)
+        return response
+
+
+class AsyncListMixin(AsyncAPIViewMixin):
+    async def aget(self, request, *args, **kwargs):
+        return await self.aserve(self.alist, request, *args, **kwargs)
+
+    def prepare(self, request, *args, **kwargs):
+        response = super().prepare(request, *args, **kwargs)
+        if response is None:
+            # Filters may read the database, to validate their values
+            self.filtered_queryset = self.filter_queryset(self.get_queryset())
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filtered_queryset
+        if self.paginator is not None:
+            data = await self.paginator.apaginate_queryset(
+                queryset, request, self, self.serialize
+            )
+            if data is not None:
+                return self.get_paginated_response(data)
+
+        return Response(await run_sync(self.serialize, queryset))
+
+    def serialize(self, instances):
+        return self.get_serializer(instances, many=True).data
+
+
+class AsyncRetrieveMixin(AsyncAPIViewMixin):
+    async def aget(self, request, *args, **kwargs):
+        return await self.aserve(self.aretrieve, request, *args, **kwargs)
+
+    def prepare(self, request, *args, **kwargs):
+        response = super().prepare(request, *args, **kwargs)
+        if response is None:
+            # A single query, run in the same hop
+            self.data = self.get_serializer(self.get_object()).data
+        return response
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return Response(self.data)
+
+
+class DroneCategoryListView(AsyncListMixin, views.DroneCategoryListView):
+    pass
+
+
+class DroneCategoryDetailView(AsyncRetrieveMixin, views.DroneCategoryDetailView):
+    pass
+
+
+class DroneListView(AsyncListMixin, views.DroneListView):
+    pass
+
+
+class DroneDetailView(AsyncRetrieveMixin, views.DroneDetailView):
+    pass
+
+
+class PilotListView(AsyncListMixin, views.PilotListView):
+    pass
+
+
+class PilotDetailView(AsyncRetrieveMixin, views.PilotDetailView):
+    pass
+
+
+class CompetitionListView(AsyncListMixin, views.CompetitionListView):
+    pass
+
+
+class CompetitionDetailView(AsyncRetrieveMixin, views.CompetitionDetailView):
+    pass
@@ -0,0 +1,237 @@
+import hashlib
+import json
+
+from rest_framework.relations import Hyperlink
+from rest_framework.response import Response
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
+
+from apps.core.cache import get_generations
+
+STATS_KEY = "response-cache:{view}:{outcome}"
+
+# Names of the views using the response cache, for the statistics
+cached_views = set()
+
+
+def _record(view_name, outcome):
+    key = STATS_KEY.format(view=view_name, outcome=outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, default=str).encode()).hexdigest()
+
+
+def _to_cacheable(data):
+    """
+    Strip the serializer and model instances that response data carries.
+    """
+    if isinstance(data, dict):
+        return {key: _to_cacheable(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_to_cacheable(value) for value in data]
+    if isinstance(data, Hyperlink):
+        return str(data)
+    return data
+
+
+def get_stats():
+    """
+    Return the hits and misses of every cached view since the cache was
+    last cleared.
+    """
+    keys = {
+        (view_name, outcome): STATS_KEY.format(view=view_name, outcome=outcome)
+        for view_name in cached_views
+        for outcome in ("hits", "misses")
+    }
+    counts = cache.get_many(keys.values())
+    stats = {}
+    for (view_name, outcome), key in sorted(keys.items()):
+        stats.setdefault(view_name, {})[outcome] = counts.get(key, 0)
+    for view_stats in stats.values():
+        lookups = view_stats["hits"] + view_stats["misses"]
+        view_stats["hit_ratio"] = view_stats["hits"] / lookups if lookups else None
+    return stats
+
+
+class CachedResponseMixin:
+    """
+    Cache the data of successful list and retrieve responses.
+
+    Keys are made of the view, its URL kwargs, the normalized query
+    parameters, the API version, the auth scope and the generations of the
+    ``cache_dependencies`` models, which are bumped by the signal handlers of
+    ``apps.drones.signals`` on every write.
+    """
+
+    cache_dependencies = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cached_views.add(cls.__name__)
+
+    def get_cache_scope(self):
+        """
+        Requests that may see different data must get different scopes.
+        """
+        return "authenticated" if self.request.user.is_authenticated else "anonymous"
+
+    def get_cache_key(self):
+        request = self.request
+        key = [
+            type(self).__name__,
+            # Hyperlinks in the data are built from the requested host
+            request.build_absolute_uri("/"),
+            sorted(self.kwargs.items()),
+            sorted(
+                (name, sorted(values)) for name, values in request.query_params.lists()
+            ),
+            request.version,
+            self.get_cache_scope(),
+            get_generations(self.cache_dependencies),
+        ]
+        return "response-cache:{}".format(_digest(key))
+
+    def get_cached_data(self):
+        """
+        Return the cache key of the request and the data cached under it, or
+        ``None``.
+        """
+        key = self.get_cache_key()
+        data = cache.get(key)
+        _record(type(self).__name__, "misses" if data is None else "hits")
+        return key, data
+
+    def set_cached_data(self, key, response):
+        if response.status_code == 200:
+            cache.set(
+                key, _to_cacheable(response.data), settings.RESPONSE_CACHE_TIMEOUT
+            )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key, data = self.get_cached_data()
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        self.set_cached_data(key, response)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Answer list and retrieve requests with ``304 Not Modified`` when the
+    client already has the current representation.
+
+    The ETag comes from one aggregate query over the filtered queryset
+    (``max(updated_at)`` and the row count), the normalized query
+    parameters and the generations of the ``cache_dependencies`` models,
+    which also catch changes and deletions of the nested objects. Nothing
+    is serialized to compute it. No ``Last-Modified`` is sent, as no date
+    covers the deletions of nested objects.
+    """
+
+    cache_dependencies = ()
+
+    def get_etag(self):
+        """
+        Return the ETag, or ``None`` when there is nothing to validate.
+
+        It is cached until a dependency changes, so that revalidating costs
+        no query either.
+        """
+        request = self.request
+        scope = [
+            type(self).__name__,
+            request.build_absolute_uri("/"),
+            sorted(self.kwargs.items()),
+            sorted(
+                (name, sorted(values)) for name, values in request.query_params.lists()
+            ),
+            request.version,
+            request.accepted_media_type,
+            get_generations(self.cache_dependencies),
+        ]
+        key = "validators:{}".format(_digest(scope))
+        etag = cache.get(key)
+        if etag is not None:
+            return etag or None
+
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        state = queryset.order_by().aggregate(
+            last_modified=Max("updated_at"), count=Count("pk")
+        )
+        if state["count"]:
+            etag = quote_etag(_digest(scope + [state["last_modified"], state["count"]]))
+        else:
+            # Missing objects and empty lists are cheap to send anyway
+            etag = ""
+        cache.set(key, etag, settings.RESPONSE_CACHE_TIMEOUT)
+        return etag or None
+
+    def patch_cache_headers(self, response):
+        if self.request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response, public=True, max_age=settings.PUBLIC_CACHE_MAX_AGE
+            )
+        patch_vary_headers(response, ("Accept", "Authorization", "Cookie"))
+
+    def get_precondition_response(self, request, etag):
+        """
+        Return the ``304`` or ``412`` response the ETag calls for, or
+        ``None`` when the request has to be handled.
+        """
+        return get_conditional_response(request, etag=etag)
+
+    def set_validators(self, response, etag):
+        """
+        Set the ETag, when there is one, and the cache headers, which empty
+        lists need as well.
+        """
+        if response.status_code in (200, 304):
+            if etag is not None:
+                response["ETag"] = etag
+            self.patch_cache_headers(response)
+        return response
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        etag = self.get_etag()
+        response = None
+        if etag is not None:
+            response = self.get_precondition_response(request, etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.set_validators(response, etag)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+POOLED_ENGINE = "apps.core.db.postgresql"
+
+
+@register()
+def check_async_connections(app_configs, **kwargs):
+    """
+    Refuse to serve the async views from the threads of the event loop with
+    a new connection for each of their thread hops.
+    """
+    if not (settings.ASYNC_API and settings.ASYNC_API_THREADS):
+        return []
+    database = settings.DATABASES["default"]
+    if database["ENGINE"] == POOLED_ENGINE or database.get("CONN_MAX_AGE"):
+        return []
+    return [
+        Error(
+            "ASYNC_API opens a database connection for most thread hops of a "
+            "request without pooled or persistent connections.",
+            hint="Set DB_POOL, or DB_CONN_MAX_AGE to a number of seconds.",
+            id="api.E001",
+        )
+    ]
@@ -0,0 +1,34 @@
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+def run_sync(function, *args, **kwargs):
+    """
+    Await ``function`` run in a thread.
+
+    With ``ASYNC_API_THREADS``, it runs in a thread of the pool of the event
+    loop, with the database connection of that thread, so that independent
+    queries of a request, and the queries of concurrent requests, overlap.
+    Otherwise it runs in the thread Django runs every sync code of the
+    process in under ASGI, one call at a time, as sync views are.
+
+    Each call may open a connection in its thread, so ``ASYNC_API_THREADS``
+    requires pooled or persistent connections (see ``apps.api.checks``).
+    Connections are given back at the end of every call, unless they are
+    persistent, so idle threads don't hold them.
+    """
+    if not settings.ASYNC_API_THREADS:
+        return sync_to_async(function)(*args, **kwargs)
+
+    def call():
+        # Pool threads outlive requests, so their connections must be
+        # recycled like those of request threads
+        close_old_connections()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(call, thread_sensitive=False)()
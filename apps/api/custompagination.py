@@ -1,5 +1,353 @@
+import asyncio
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.template import loader
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.cache import get_generations
+from .concurrency import run_sync
 
 
 class LimitOffsetPaginationWithUpperBound(LimitOffsetPagination):
-    max_limit = 8
\ No newline at end of file
+    """
+    Limit/offset pagination whose counts cost no ``COUNT(*)`` on most pages.
+
+    Unfiltered lists of more than ``COUNT_ESTIMATE_THRESHOLD`` rows are
+    counted from the row estimate of the planner on PostgreSQL, other lists
+    exactly. Counts are cached until a row of the ``cache_dependencies`` of
+    the view changes, so every page of a filter shares one count.
+    ``?count=exact`` always counts the rows; ``count_estimated`` tells
+    whether the count is an estimate.
+    """
+
+    max_limit = 8
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.request = request
+        self.view = view
+        self.count = self.get_count(queryset)
+        page = list(queryset[self.offset : self.offset + self.limit])
+        return self.check_page(page)
+
+    async def apaginate_queryset(self, queryset, request, view, serialize):
+        """
+        ``paginate_queryset`` for async views, returning the page serialized
+        with ``serialize``. The rows are counted while the page is fetched
+        and serialized, each in one thread hop.
+        """
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.request = request
+        self.view = view
+
+        def fetch_page():
+            page = list(queryset[self.offset : self.offset + self.limit])
+            return page, serialize(page)
+
+        self.count, (page, data) = await asyncio.gather(
+            run_sync(self.get_count, queryset), run_sync(fetch_page)
+        )
+        return data if self.check_page(page) else []
+
+    def check_page(self, page):
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        if self.count_estimated:
+            # The next link follows the page, as rows may go past the estimate
+            self.page_is_full = len(page) == self.limit
+            return page
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return page
+
+    def get_count(self, queryset):
+        if self.request.query_params.get(self.count_query_param) == "exact":
+            self.count_estimated = False
+            return super().get_count(queryset)
+
+        dependencies = getattr(self.view, "cache_dependencies", ()) or (queryset.model,)
+        sql, params = queryset.order_by().query.sql_with_params()
+        key = "count:{}".format(
+            hashlib.sha256(
+                repr((queryset.db, sql, params, get_generations(dependencies))).encode()
+            ).hexdigest()
+        )
+        cached = cache.get(key)
+        if cached is None:
+            cached = self.estimate_count(queryset)
+            if cached is None:
+                cached = (super().get_count(queryset), False)
+            cache.set(key, cached, settings.RESPONSE_CACHE_TIMEOUT)
+        count, self.count_estimated = cached
+        return count
+
+    def estimate_count(self, queryset):
+        """
+        Return the count of an unfiltered queryset on PostgreSQL and whether
+        it is the row estimate of its table, or ``None`` if it should be
+        counted by the ORM.
+        """
+        query = queryset.query
+        connection = connections[queryset.db]
+        if (
+            connection.vendor != "postgresql"
+            or query.where
+            or query.distinct
+            or query.combinator
+            or query.is_sliced
+        ):
+            return None
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        # Tables never analyzed are estimated at -1 rows, and small ones are
+        # counted exactly, in the same round trip
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples >= %s, CASE WHEN reltuples >= %s "
+                f"THEN reltuples::bigint ELSE (SELECT COUNT(*) FROM {table}) END "
+                "FROM pg_class WHERE oid = %s::regclass",
+                [settings.COUNT_ESTIMATE_THRESHOLD] * 2 + [table],
+            )
+            estimated, count = cursor.fetchone()
+        return count, estimated
+
+    def get_next_link(self):
+        if not self.count_estimated:
+            return super().get_next_link()
+        if not self.page_is_full:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("count_estimated", self.count_estimated),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+
+class KeysetPaginationWithUpperBound(LimitOffsetPaginationWithUpperBound):
+    """
+    Limit/offset pagination that switches to keyset pagination when the
+    request has a ``cursor`` parameter (``?cursor=`` for the first page).
+
+    Keyset pages are fetched with a ``WHERE`` on the ordering fields, with the
+    primary key as a tiebreaker, instead of an ``OFFSET``, and don't count
+    the rows, so every page costs the same at any depth.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _("The pagination cursor value.")
+    invalid_cursor_message = _("Invalid cursor")
+    invalid_ordering_message = _("This ordering cannot be used with a cursor.")
+    cursor_template = "rest_framework/pagination/previous_and_next.html"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        self.request = request
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+        reverse, position = self.decode_cursor(request)
+
+        if reverse:
+            queryset = queryset.order_by(
+                *(self._reverse_ordering(ordering) for ordering in self.ordering)
+            )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position, reverse))
+        names, deferred = queryset.query.deferred_loading
+        if not deferred:
+            # Positions are read from the rows, even with a sparse fieldset
+            queryset = queryset.only(
+                *names, *(ordering.lstrip("-") for ordering in self.ordering)
+            )
+
+        results = list(queryset[: self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or reverse:
+                self.next_position = self.get_position(results[-1])
+            if (has_more and reverse) or (not reverse and position is not None):
+                self.previous_position = self.get_position(results[0])
+        self.display_page_controls = bool(self.next_position or self.previous_position)
+        return results
+
+    async def apaginate_queryset(self, queryset, request, view, serialize):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return await super().apaginate_queryset(queryset, request, view, serialize)
+
+        def fetch_page():
+            page = self.paginate_queryset(queryset, request, view)
+            return None if page is None else serialize(page)
+
+        # Keyset pages are a single query, fetched and serialized in one hop
+        return await run_sync(fetch_page)
+
+    def get_ordering(self, queryset):
+        """
+        Return the ordering of the queryset as field names, ending with the
+        primary key so that every row has a unique position.
+        """
+        model = queryset.model
+        if queryset.query.order_by:
+            ordering = list(queryset.query.order_by)
+        elif queryset.query.default_ordering:
+            ordering = list(model._meta.ordering)
+        else:
+            ordering = []
+
+        pk_name = model._meta.pk.name
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str) or "__" in item:
+                raise NotFound(self.invalid_ordering_message)
+            descending = item.startswith("-")
+            name = item.lstrip("-")
+            if name == "pk":
+                name = pk_name
+            try:
+                model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise NotFound(self.invalid_ordering_message)
+            fields.append(f"-{name}" if descending else name)
+            if name == pk_name:
+                return fields
+        return fields + [pk_name]
+
+    def _reverse_ordering(self, ordering):
+        return ordering[1:] if ordering.startswith("-") else f"-{ordering}"
+
+    def get_position(self, instance):
+        return [
+            self.model_field(ordering).value_to_string(instance)
+            for ordering in self.ordering
+        ]
+
+    def get_keyset_filter(self, position, reverse):
+        """
+        Build ``(a, b, pk) > (x, y, z)`` for the ordering, with each field
+        compared in its own direction.
+        """
+        keyset_filter = Q()
+        equal = Q()
+        for ordering, value in zip(self.ordering, position):
+            descending = ordering.startswith("-") != reverse
+            name = ordering.lstrip("-")
+            lookup = "lt" if descending else "gt"
+            keyset_filter |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return keyset_filter
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            cursor = json.loads(urlsafe_b64decode(encoded + padding))
+            ordering, reverse, raw_position = cursor["o"], cursor["r"], cursor["p"]
+            if ordering != self.ordering or len(raw_position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model_field(ordering).to_python(value)
+                for ordering, value in zip(self.ordering, raw_position)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return bool(reverse), position
+
+    def model_field(self, ordering):
+        return self.model._meta.get_field(ordering.lstrip("-"))
+
+    def encode_cursor(self, position, reverse):
+        cursor = json.dumps(
+            {"o": self.ordering, "r": int(reverse), "p": position},
+            separators=(",", ":"),
+        )
+        encoded = urlsafe_b64encode(cursor.encode()).decode().rstrip("=")
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def to_html(self):
+        if not self.use_cursor:
+            return super().to_html()
+        template = loader.get_template(self.cursor_template)
+        context = {
+            "previous_url": self.get_previous_link(),
+            "next_url": self.get_next_link(),
+        }
+        return template.render(context)
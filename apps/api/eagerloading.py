@@ -0,0 +1,327 @@
+import re
+
+from rest_framework import permissions, relations, serializers
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import F, Prefetch, QuerySet, Window
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
+
+DISPLAY_METHOD_PATTERN = re.compile(r"^get_(?P<field>\w+)_display$")
+
+
+class FirstRowsPerParentQuerySet(QuerySet):
+    """
+    Queryset keeping the first ``limit`` rows of each value of
+    ``parent_field``, in its ordering.
+
+    Prefetching only filters the queryset down to the parents of the page
+    when it evaluates it, so the rows are numbered then, with
+    ``ROW_NUMBER() OVER (PARTITION BY parent_field ...)`` over the rows of
+    those parents, in one pass served by a ``(parent_field, ordering)``
+    index.
+    """
+
+    parent_field = None
+    limit = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone.parent_field = self.parent_field
+        clone.limit = self.limit
+        return clone
+
+    def _fetch_all(self):
+        if self._result_cache is None and self.limit is not None:
+            rows = self.first_rows()
+            rows._fetch_all()
+            self._result_cache = rows._result_cache
+            self._prefetch_done = rows._prefetch_done
+        super()._fetch_all()
+
+    def get_ordering(self):
+        ordering = []
+        for item in self.query.order_by or self.model._meta.ordering:
+            if isinstance(item, str):
+                item = F(item[1:]).desc() if item.startswith("-") else F(item).asc()
+            ordering.append(item)
+        return ordering + [F("pk").asc()]
+
+    def first_rows(self):
+        ranked = self._chain()
+        ranked.limit = None
+        ranked = (
+            ranked.prefetch_related(None)
+            .order_by()
+            .annotate(
+                per_parent_rank=Window(
+                    RowNumber(),
+                    partition_by=F(self.parent_field),
+                    order_by=self.get_ordering(),
+                )
+            )
+            .values("pk", "per_parent_rank")
+        )
+        sql, params = ranked.query.sql_with_params()
+        quote_name = connections[self.db].ops.quote_name
+        rows = self._chain()
+        rows.limit = None
+        return rows.filter(
+            pk__in=RawSQL(
+                "SELECT {} FROM ({}) ranked WHERE {} <= %s".format(
+                    quote_name(self.model._meta.pk.column),
+                    sql,
+                    quote_name("per_parent_rank"),
+                ),
+                (*params, self.limit),
+            )
+        )
+
+
+class QueryPlan:
+    """
+    Columns and relations a serializer reads from one model.
+
+    Forward single-valued relations are joined with ``select_related`` and
+    multi-valued relations are loaded with one ``prefetch_related`` query each.
+    A serializer field with a ``prefetch_limit`` only gets that many related
+    rows per parent.
+    """
+
+    def __init__(self, model, annotations=()):
+        self.model = model
+        self.annotations = set(annotations)
+        self.columns = set()
+        self.load_all_columns = False
+        self.joins = {}
+        self.prefetches = {}
+        self.parent_field = None
+        self.limit = None
+
+    def join(self, field):
+        if field.name not in self.joins:
+            self.joins[field.name] = QueryPlan(field.related_model)
+        self.columns.add(field.name)
+        return self.joins[field.name]
+
+    def prefetch(self, field, limit=None):
+        name = field.get_accessor_name() if field.auto_created else field.name
+        if name not in self.prefetches:
+            plan = QueryPlan(field.related_model)
+            if field.one_to_many:
+                # The prefetched rows are matched back to their parent by
+                # this column, so it can never be deferred.
+                plan.parent_field = field.field.name
+                plan.columns.add(plan.parent_field)
+                plan.limit = limit
+            self.prefetches[name] = plan
+        return self.prefetches[name]
+
+    def limit_per_parent(self, queryset):
+        """
+        Keep the first ``limit`` rows of each parent, in the default ordering.
+        """
+        if self.limit is None:
+            return queryset
+        queryset = FirstRowsPerParentQuerySet(
+            model=queryset.model,
+            query=queryset.query.chain(),
+            using=queryset._db,
+            hints=queryset._hints,
+        )
+        queryset.parent_field = self.parent_field
+        queryset.limit = self.limit
+        return queryset
+
+    def select_related_lookups(self, prefix=""):
+        for name, plan in self.joins.items():
+            lookup = f"{prefix}{name}"
+            yield lookup
+            yield from plan.select_related_lookups(f"{lookup}__")
+
+    def only_lookups(self, prefix=""):
+        """
+        Return the ``only()`` arguments, or ``None`` if any joined model
+        needs every column.
+        """
+        if self.load_all_columns:
+            return None
+
+        lookups = {f"{prefix}{column}" for column in self.columns}
+        for name, plan in self.joins.items():
+            nested = plan.only_lookups(f"{prefix}{name}__")
+            if nested is None:
+                return None
+            lookups.update(nested)
+        return lookups
+
+    def prefetch_lookups(self, prefix=""):
+        """
+        Yield the prefetches of this plan, including the ones reached
+        through its joins (e.g. ``drone__category__drones``).
+        """
+        for name, plan in self.prefetches.items():
+            yield f"{prefix}{name}", plan
+        for name, plan in self.joins.items():
+            yield from plan.prefetch_lookups(f"{prefix}{name}__")
+
+    def apply(self, queryset, defer=True):
+        lookups = list(self.select_related_lookups())
+        if lookups:
+            queryset = queryset.select_related(*lookups)
+
+        for lookup, plan in self.prefetch_lookups():
+            related_queryset = plan.limit_per_parent(plan.model._default_manager.all())
+            queryset = queryset.prefetch_related(
+                Prefetch(lookup, queryset=plan.apply(related_queryset, defer=defer))
+            )
+
+        only = self.only_lookups() if defer else None
+        if only is not None:
+            queryset = queryset.only(*only)
+        return queryset
+
+
+def _get_model_field(model, name):
+    if name == "pk":
+        return model._meta.pk
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _plan_relation_value(plan, field, serializer_field):
+    """
+    Record what is read from the related object of a relation that is the
+    final source attribute of ``serializer_field``.
+    """
+    limit = getattr(serializer_field, "prefetch_limit", None)
+    if isinstance(serializer_field, serializers.ListSerializer):
+        _plan_serializer(plan.prefetch(field, limit), serializer_field.child)
+        return
+    if isinstance(serializer_field, serializers.BaseSerializer):
+        _plan_serializer(plan.join(field), serializer_field)
+        return
+    if isinstance(serializer_field, relations.ManyRelatedField):
+        child = serializer_field.child_relation
+        _plan_related_field(plan.prefetch(field, limit), child)
+        return
+    if field.many_to_many or field.one_to_many:
+        plan.prefetch(field).load_all_columns = True
+        return
+    if isinstance(serializer_field, relations.RelatedField):
+        lookup = _related_field_lookup(serializer_field)
+        target_field = getattr(field, "target_field", None)
+        if lookup in ("pk", getattr(target_field, "name", None)):
+            # Primary key and hyperlinked relations only need the foreign key.
+            plan.columns.add(field.name)
+            return
+        _plan_related_field(plan.join(field), serializer_field)
+        return
+    # Anything else (e.g. ``str()`` of the related object) may read any column.
+    plan.join(field).load_all_columns = True
+
+
+def _related_field_lookup(serializer_field):
+    if isinstance(serializer_field, relations.SlugRelatedField):
+        return serializer_field.slug_field
+    if isinstance(serializer_field, relations.HyperlinkedRelatedField):
+        return serializer_field.lookup_field
+    if isinstance(serializer_field, relations.PrimaryKeyRelatedField):
+        return "pk"
+    return None
+
+
+def _plan_related_field(plan, serializer_field):
+    """
+    Record what a relation field reads from each related object.
+    """
+    lookup = _related_field_lookup(serializer_field)
+    if lookup is None:
+        plan.load_all_columns = True
+        return
+    _plan_source(plan, lookup.split("__"), None)
+
+
+def _plan_source(plan, source_attrs, serializer_field):
+    for index, attr in enumerate(source_attrs):
+        is_last = index == len(source_attrs) - 1
+        field = _get_model_field(plan.model, attr)
+
+        if field is None and attr in plan.annotations:
+            return
+
+        if field is None:
+            match = DISPLAY_METHOD_PATTERN.match(attr)
+            if match and _get_model_field(plan.model, match.group("field")):
+                plan.columns.add(match.group("field"))
+            else:
+                # A property or method may read any column of the instance.
+                plan.load_all_columns = True
+            return
+
+        if not field.is_relation:
+            plan.columns.add(field.name)
+            return
+
+        if is_last:
+            _plan_relation_value(plan, field, serializer_field)
+            return
+
+        if field.many_to_one or (field.one_to_one and field.concrete):
+            plan = plan.join(field)
+        else:
+            # Dotted sources through a multi-valued relation are unusual and
+            # not worth planning precisely.
+            plan.prefetch(field).load_all_columns = True
+            return
+
+
+def _plan_serializer(plan, serializer):
+    for serializer_field in serializer.fields.values():
+        if serializer_field.write_only:
+            continue
+
+        if serializer_field.source == "*":
+            if isinstance(serializer_field, serializers.BaseSerializer):
+                _plan_serializer(plan, serializer_field)
+            elif not isinstance(serializer_field, relations.HyperlinkedIdentityField):
+                # e.g. SerializerMethodField: the method gets the whole instance.
+                plan.load_all_columns = True
+            continue
+
+        _plan_source(plan, serializer_field.source_attrs, serializer_field)
+
+
+def plan_queryset(queryset, serializer, defer=True):
+    """
+    Apply ``select_related``, ``prefetch_related`` and ``only`` to
+    ``queryset`` so that ``serializer`` can render any number of rows
+    with a fixed number of queries.
+
+    ``defer`` restricts the selected columns to the ones the serializer
+    reads. It should be disabled for querysets whose instances get saved,
+    as Django only saves the loaded fields of a deferred instance.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    plan = QueryPlan(queryset.model, annotations=queryset.query.annotations)
+    _plan_serializer(plan, serializer)
+    return plan.apply(queryset, defer=defer)
+
+
+class EagerLoadingMixin:
+    """
+    Plan the view's queryset from the fields of its serializer.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return plan_queryset(
+            queryset,
+            self.get_serializer(),
+            defer=self.request.method in permissions.SAFE_METHODS,
+        )
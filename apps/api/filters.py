@@ -1,9 +1,91 @@
 from django_filters import rest_framework as filters
-from django_filters import AllValuesFilter, DateTimeFilter, NumberFilter
+from django_filters import CharFilter, DateTimeFilter, NumberFilter, UUIDFilter
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Greatest
+from django.utils.translation import gettext_lazy as _
 
 from apps.drones.models import Competition
 
 
+class ExistingValueFilter(CharFilter):
+    """
+    ``CharFilter`` rejecting values that no row has, like the choices of an
+    ``AllValuesFilter``, with an ``EXISTS`` lookup on the unique column at
+    the end of ``field_name`` instead of loading every value.
+    """
+
+    default_error_messages = {
+        "invalid_choice": _(
+            "Select a valid choice. %(value)s is not one of the available choices."
+        ),
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.extra["validators"] = [self.validate_exists]
+
+    def validate_exists(self, value):
+        model = self.model
+        *path, name = self.field_name.split(LOOKUP_SEP)
+        for related_name in path:
+            model = model._meta.get_field(related_name).related_model
+        if not model._default_manager.filter(**{name: value}).exists():
+            raise ValidationError(
+                self.default_error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+
+
+class RankedSearchFilter(SearchFilter):
+    """
+    ``SearchFilter`` ranking the results by trigram similarity on Postgres.
+
+    The ``icontains`` and ``istartswith`` lookups of the search fields are
+    served by the ``UPPER(name) gin_trgm_ops`` indexes of the drones
+    migrations. Results are ordered by relevance unless an ordering is
+    requested or the list is paginated with a cursor, which can only follow
+    the ordering of model fields.
+    """
+
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        connection = connections[queryset.db]
+        if (
+            not search_fields
+            or not search_terms
+            or connection.vendor != "postgresql"
+            or request.query_params.get(self.ordering_param)
+            or self.uses_cursor(request, view)
+        ):
+            return queryset
+
+        # Needs psycopg2, which only Postgres deployments have
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        term = " ".join(search_terms)
+        similarities = [
+            TrigramSimilarity(field.lstrip("".join(self.lookup_prefixes)), term)
+            for field in search_fields
+        ]
+        rank = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+        return queryset.annotate(search_rank=rank).order_by("-search_rank", "pk")
+
+    def uses_cursor(self, request, view):
+        paginator = getattr(view, "paginator", None)
+        cursor_query_param = getattr(paginator, "cursor_query_param", None)
+        return cursor_query_param in request.query_params
+
+
 class CompetitionFilter(filters.FilterSet):
     from_achievement_date = DateTimeFilter(
         field_name="distance_achievement_date", lookup_expr="gte"
@@ -17,8 +99,11 @@ class CompetitionFilter(filters.FilterSet):
     max_distance_in_feet = NumberFilter(
         field_name="distance_in_feet", lookup_expr="lte"
     )
-    drone_name = AllValuesFilter(field_name="drone__name")
-    pilot_name = AllValuesFilter(field_name="pilot__name")
+    drone_name = ExistingValueFilter(field_name="drone__name")
+    pilot_name = ExistingValueFilter(field_name="pilot__name")
+    # Without the choices query of a model choice filter
+    drone = UUIDFilter(field_name="drone")
+    pilot = UUIDFilter(field_name="pilot")
 
     class Meta:
         model = Competition
@@ -30,4 +115,6 @@ class CompetitionFilter(filters.FilterSet):
             "max_distance_in_feet",
             "drone_name",
             "pilot_name",
+            "drone",
+            "pilot",
         )
\ No newline at end of file
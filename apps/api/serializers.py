@@ -1,24 +1,179 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.reverse import reverse
+
+from django.utils.http import urlencode
 
 from apps.drones.models import (
     DroneCategory,
     Drone,
     Pilot,
     Competition,
+    CompetitionRollup,
+    LeaderboardEntry,
 )
 
 
-class DroneCategorySerializer(serializers.HyperlinkedModelSerializer):
-    drones = serializers.HyperlinkedRelatedField(
-        many=True, read_only=True, view_name="drone-detail"
+def get_names(context, param):
+    """
+    Return the names listed in the ``param`` query parameter, comma separated
+    """
+    request = context.get("request")
+    if request is None:
+        return set()
+    value = request.query_params.get(param, "")
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def get_expansions(context):
+    """
+    Return the relations requested with ``?expand=``
+    """
+    return get_names(context, "expand")
+
+
+class SparseFieldsetMixin:
+    """
+    Render only the fields listed with ``?fields=``, less the ones listed with
+    ``?exclude=``, on reads. Nested serializers keep their fields.
+
+    Views plan their queries from the fields of their serializer (see
+    ``apps.api.eagerloading``), so the columns of pruned fields are not
+    selected and their relations are neither joined nor prefetched.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+        # The root serializer, or the child of a root list serializer
+        if self.root is not self and self.root is not self.parent:
+            return fields
+
+        only = get_names(self.context, "fields")
+        exclude = get_names(self.context, "exclude")
+        unknown = (only | exclude) - set(fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"error": "Unknown fields: {}.".format(", ".join(sorted(unknown)))}
+            )
+        for name in list(fields):
+            if (only and name not in only) or name in exclude:
+                del fields[name]
+        return fields
+
+
+def get_path(field):
+    """
+    Return the dotted path of a nested serializer from the root one, such
+    as ``competitions.drone``
+    """
+    names = []
+    while field.parent is not None:
+        # The child of a list serializer has an empty name
+        if field.field_name:
+            names.append(field.field_name)
+        field = field.parent
+    return ".".join(reversed(names))
+
+
+class ExpandableFieldsMixin:
+    """
+    Render the relations of ``expandable_fields`` with the serializer they
+    map to only when they are listed with ``?expand=``; they keep their
+    declared field, a link, or are left out otherwise. The relations of
+    expanded objects are expanded with dotted paths, such as
+    ``?expand=competitions.drone``, which also expands ``competitions``, up
+    to ``max_expansion_depth`` levels.
+
+    Expanded lists are capped to ``expansion_limit`` objects, in the default
+    ordering of their model. As views plan their queries from the fields of
+    their serializer, only the expanded relations are prefetched.
+    """
+
+    # Names of relations to their serializer class and its arguments
+    expandable_fields = {}
+    expansion_limit = 20
+    max_expansion_depth = 2
+
+    def get_fields(self):
+        fields = super().get_fields()
+        path = get_path(self)
+        prefix = f"{path}." if path else ""
+        expansions = get_expansions(self.context)
+        if not path:
+            too_deep = [
+                expansion
+                for expansion in expansions
+                if expansion.count(".") >= self.max_expansion_depth
+            ]
+            if too_deep:
+                raise serializers.ValidationError(
+                    {
+                        "error": "Expansions are limited to {} levels: {}.".format(
+                            self.max_expansion_depth, ", ".join(sorted(too_deep))
+                        )
+                    }
+                )
+
+        for expansion in sorted(expansions):
+            if not expansion.startswith(prefix):
+                continue
+            name = expansion[len(prefix) :].split(".")[0]
+            if name not in self.expandable_fields:
+                raise serializers.ValidationError(
+                    {"error": f"{expansion} cannot be expanded."}
+                )
+            serializer_class, kwargs = self.expandable_fields[name]
+            fields[name] = serializer_class(read_only=True, **kwargs)
+            if kwargs.get("many"):
+                fields[name].prefetch_limit = self.expansion_limit
+        return fields
+
+
+class FilteredCollectionField(serializers.HyperlinkedIdentityField):
+    """
+    Link to a list endpoint filtered down to the rows related to the instance
+    """
+
+    def __init__(self, view_name, filter_param, **kwargs):
+        self.filter_param = filter_param
+        super().__init__(view_name=view_name, **kwargs)
+
+    def get_url(self, obj, view_name, request, format):
+        url = reverse(view_name, request=request, format=format)
+        return "{}?{}".format(url, urlencode({self.filter_param: obj.pk}))
+
+
+class DroneCategorySerializer(
+    ExpandableFieldsMixin, serializers.HyperlinkedModelSerializer
+):
+    """
+    Drones are summarized by their count and a link to the filtered drone
+    list. Links to the first ``expansion_limit`` drones are only embedded
+    with ``?expand=drones``.
+    """
+
+    expandable_fields = {
+        "drones": (
+            serializers.HyperlinkedRelatedField,
+            {"many": True, "view_name": "drone-detail"},
+        )
+    }
+    expansion_limit = 50
+
+    drones_count = serializers.IntegerField(read_only=True, default=0)
+    drones_url = FilteredCollectionField(
+        view_name="drone-list", filter_param="category"
     )
 
     class Meta:
         model = DroneCategory
-        fields = ("url", "pk", "name", "drones")
+        fields = ("url", "pk", "name", "drones_count", "drones_url")
 
 
-class DroneSerializer(serializers.HyperlinkedModelSerializer):
+class DroneSerializer(SparseFieldsetMixin, serializers.HyperlinkedModelSerializer):
     owner = serializers.ReadOnlyField(source="owner.username")
     category = serializers.SlugRelatedField(
         slug_field="name", queryset=DroneCategory.objects.all()
@@ -39,24 +194,46 @@ class DroneSerializer(serializers.HyperlinkedModelSerializer):
         )
 
 
-class CompetitionSerializer(serializers.HyperlinkedModelSerializer):
+class CompetitionSerializer(
+    ExpandableFieldsMixin, serializers.HyperlinkedModelSerializer
+):
     """
-    Use to serialize competition instaces as the detail of a pilot
+    Use to serialize competition instaces as the detail of a pilot. The drone
+    is a link unless expanded.
     """
 
-    drone = DroneSerializer()
+    expandable_fields = {"drone": (DroneSerializer, {})}
+
+    drone = serializers.HyperlinkedRelatedField(
+        read_only=True, view_name="drone-detail"
+    )
 
     class Meta:
         model = Competition
         fields = ("url", "pk", "drone", "distance_in_feet", "distance_achievement_date")
 
 
-class PilotSerializer(serializers.HyperlinkedModelSerializer):
+class PilotSerializer(
+    SparseFieldsetMixin,
+    ExpandableFieldsMixin,
+    serializers.HyperlinkedModelSerializer,
+):
+    """
+    Competitions are summarized by their count and a link to the filtered
+    competition list. The best ``expansion_limit`` of them are only embedded
+    with ``?expand=competitions``.
+    """
+
+    expandable_fields = {"competitions": (CompetitionSerializer, {"many": True})}
+
     gender = serializers.ChoiceField(choices=Pilot.GENDER_CHOICES)
     gender_description = serializers.CharField(
         source="get_gender_display", read_only=True
     )
-    competitions = CompetitionSerializer(many=True, read_only=True)
+    competitions_count = serializers.IntegerField(read_only=True, default=0)
+    competitions_url = FilteredCollectionField(
+        view_name="competition-list", filter_param="pilot"
+    )
 
     class Meta:
         model = Pilot
@@ -67,11 +244,12 @@ class PilotSerializer(serializers.HyperlinkedModelSerializer):
             "gender",
             "gender_description",
             "races_count",
-            "competitions",
+            "competitions_count",
+            "competitions_url",
         )
 
 
-class PilotCompetitionSerializer(serializers.ModelSerializer):
+class PilotCompetitionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Uses to serialize competition instance
     """
@@ -93,3 +271,107 @@ class PilotCompetitionSerializer(serializers.ModelSerializer):
             "pilot",
             "drone",
         )
+
+
+class BulkCompetitionSerializer(PilotCompetitionSerializer):
+    """
+    Uses to validate one competition of a bulk insert, leaving the pilot
+    and drone names to be resolved for the whole batch at once
+    """
+
+    pilot = serializers.CharField(max_length=250)
+    drone = serializers.CharField(max_length=255)
+
+    class Meta(PilotCompetitionSerializer.Meta):
+        fields = ("distance_in_feet", "distance_achievement_date", "pilot", "drone")
+
+
+class SubjectStatsSerializer(serializers.Serializer):
+    """
+    Uses to serialize the competition statistics of a pilot, a drone or a
+    category. ``percentile`` is within the category for drones, and within
+    all the subjects otherwise.
+    """
+
+    id = serializers.UUIDField()
+    competitions_count = serializers.IntegerField()
+    best_distance_in_feet = serializers.IntegerField(allow_null=True)
+    average_distance_in_feet = serializers.FloatField(allow_null=True)
+    latest_distance_in_feet = serializers.IntegerField(allow_null=True)
+    latest_achievement_date = serializers.DateTimeField(allow_null=True)
+    rank = serializers.IntegerField(allow_null=True)
+    percentile = serializers.FloatField(allow_null=True)
+
+
+class CompetitionRollupSerializer(serializers.ModelSerializer):
+    """
+    Uses to serialize the competitions of a day, a week or a month
+    """
+
+    distance_average = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = CompetitionRollup
+        fields = (
+            "bucket",
+            "count",
+            "distance_sum",
+            "distance_min",
+            "distance_max",
+            "distance_average",
+        )
+
+
+class CompetitionRollupQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of a rollup chart: the period of the
+    buckets, at most one of a pilot, a drone or a category, and the range
+    of the buckets.
+    """
+
+    period = serializers.ChoiceField(
+        choices=CompetitionRollup.PERIOD_CHOICES, default=CompetitionRollup.DAY
+    )
+    pilot = serializers.UUIDField(required=False)
+    drone = serializers.UUIDField(required=False)
+    category = serializers.UUIDField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        subjects = [name for name in ("pilot", "drone", "category") if name in attrs]
+        if len(subjects) > 1:
+            raise serializers.ValidationError(
+                "Only one of pilot, drone or category can be given."
+            )
+        if "start" in attrs and "end" in attrs and attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError("start must not be after end.")
+        return attrs
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    """
+    Uses to serialize the rank of a pilot or a drone on a leaderboard
+    """
+
+    rank = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(source="subject.name", default=None)
+    competition = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = (
+            "rank",
+            "subject_id",
+            "name",
+            "distance_in_feet",
+            "distance_achievement_date",
+            "competition",
+        )
+
+    def get_competition(self, obj):
+        return reverse(
+            "competition-detail",
+            kwargs={"pk": obj.competition_id},
+            request=self.context.get("request"),
+        )
@@ -0,0 +1,125 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from apps.api import asyncviews, custompagination, views
+from apps.api.checks import check_async_connections
+from apps.authentication.models import User
+from apps.drones.models import Drone, DroneCategory
+from .test_setup import TestSetup
+
+
+class AsyncViewTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(**self.user_data)
+        category = DroneCategory.objects.create(name="Quadcopter")
+        self.drones = [
+            Drone.objects.create(
+                name=f"Drone {index}",
+                category=category,
+                owner=self.user,
+                manufacturing_date=timezone.now(),
+            )
+            for index in range(5)
+        ]
+
+    def call(self, view_class, request, **kwargs):
+        view = view_class.as_view()
+        response = view(request, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = async_to_sync(lambda: response)()
+        return response
+
+    def test_views_are_async(self):
+        self.assertTrue(asyncio.iscoroutinefunction(asyncviews.DroneListView.as_view()))
+
+    def test_list_matches_sync_view(self):
+        request = self.factory.get("/api/drones/", {"limit": 2, "offset": 1})
+        response = self.call(asyncviews.DroneListView, request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertTrue(response.is_rendered)
+
+        self.client.logout()
+        sync_response = self.call(
+            views.DroneListView,
+            self.factory.get("/api/drones/", {"limit": 2, "offset": 1}),
+        )
+        self.assertEqual(sync_response.data, response.data)
+
+    def test_detail_and_conditional_get(self):
+        kwargs = {"pk": self.drones[0].pk}
+        response = self.call(
+            asyncviews.DroneDetailView, self.factory.get("/api/drones/"), **kwargs
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Drone 0")
+
+        request = self.factory.get("/api/drones/", HTTP_IF_NONE_MATCH=response["ETag"])
+        response = self.call(asyncviews.DroneDetailView, request, **kwargs)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_use_the_sync_handlers(self):
+        request = self.factory.post(
+            "/api/drone-categories/", {"name": "Hexacopter"}, format="json"
+        )
+        response = self.call(asyncviews.DroneCategoryListView, request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        request = self.factory.post("/api/pilots/", {"name": "Pilot"}, format="json")
+        response = self.call(asyncviews.PilotListView, request)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        request = self.factory.delete("/api/drones/")
+        force_authenticate(request, self.user)
+        response = self.call(asyncviews.DroneDetailView, request, pk=self.drones[0].pk)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(Drone.objects.count(), 4)
+
+    def test_list_runs_in_few_thread_hops(self):
+        hops = []
+
+        def counting(run_sync):
+            def wrapper(function, *args, **kwargs):
+                hops.append(getattr(function, "__name__", function))
+                return run_sync(function, *args, **kwargs)
+
+            return wrapper
+
+        request = self.factory.get("/api/drones/", {"limit": 2})
+        with mock.patch.object(
+            asyncviews, "run_sync", counting(asyncviews.run_sync)
+        ), mock.patch.object(
+            custompagination, "run_sync", counting(custompagination.run_sync)
+        ):
+            response = self.call(asyncviews.DroneListView, request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # initial and lookups, count and page, storing and rendering
+        self.assertEqual(len(hops), 4)
+
+
+class AsyncConnectionsCheckTests(SimpleTestCase):
+    @override_settings(ASYNC_API=True, ASYNC_API_THREADS=True)
+    def test_new_connection_per_hop_is_refused(self):
+        with override_settings(
+            DATABASES={"default": {"ENGINE": "django.db.backends.postgresql"}}
+        ):
+            errors = check_async_connections(None)
+        self.assertEqual([error.id for error in errors], ["api.E001"])
+
+        for database in (
+            {"ENGINE": "apps.core.db.postgresql"},
+            {"ENGINE": "django.db.backends.postgresql", "CONN_MAX_AGE": 60},
+        ):
+            with override_settings(DATABASES={"default": database}):
+                self.assertEqual(check_async_connections(None), [])
@@ -0,0 +1,101 @@
+import json
+
+from rest_framework import status
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones import leaderboard
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from .test_setup import TestSetup
+
+
+class CompetitionBulkCreateTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.url = reverse("competition-bulk-create")
+        user = User.objects.create_user(**self.user_data)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {}".format(user.tokens.get("access"))
+        )
+        category = DroneCategory.objects.create(name="Racers")
+        for index in range(2):
+            Pilot.objects.create(name=f"Pilot {index}", races_count=1)
+            Drone.objects.create(
+                name=f"Drone {index}",
+                category=category,
+                owner=user,
+                manufacturing_date=timezone.now(),
+            )
+
+    def competition(self, pilot="Pilot 0", drone="Drone 0", distance=100):
+        return {
+            "pilot": pilot,
+            "drone": drone,
+            "distance_in_feet": distance,
+            "distance_achievement_date": timezone.now().isoformat(),
+        }
+
+    def test_bulk_create_with_errors(self):
+        """
+        Ensure valid competitions are inserted and invalid ones reported by
+        index
+        """
+        items = [
+            self.competition(distance=300),
+            self.competition(pilot="Nobody"),
+            self.competition(pilot="Pilot 1", drone="Drone 1", distance=800),
+            self.competition(distance="far"),
+        ]
+        response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 3])
+        self.assertIn("pilot", response.data["errors"][0]["errors"])
+        self.assertIn("distance_in_feet", response.data["errors"][1]["errors"])
+        self.assertEqual(Competition.objects.count(), 2)
+
+        # The leaderboards see the inserted competitions
+        top = leaderboard.read_range(leaderboard.PILOTS_BOARD, 1, 1)[0]
+        self.assertEqual(top.subject.name, "Pilot 1")
+
+    def test_bulk_create_invalidates_cached_lists(self):
+        """
+        Ensure lists cached before a bulk insert show the inserted rows
+        """
+        list_url = reverse("competition-list")
+        self.assertEqual(self.client.get(list_url).data["count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.url, [self.competition(), self.competition()], format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(list_url).data["count"], 2)
+
+    def test_bulk_create_ndjson(self):
+        """
+        Ensure competitions can be sent as newline delimited JSON
+        """
+        body = "\n".join(
+            json.dumps(self.competition(distance=distance))
+            for distance in (100, 200, 300)
+        )
+        response = self.client.post(
+            self.url, body + "\n\n", content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+
+    def test_bulk_create_all_invalid(self):
+        """
+        Ensure nothing is inserted when every competition is invalid
+        """
+        response = self.client.post(
+            self.url, [self.competition(drone="Nothing")], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Competition.objects.count(), 0)
+
+        response = self.client.post(self.url, self.competition(), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,65 @@
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.authentication.models import User
+from apps.drones.models import DroneCategory
+from .test_setup import TestSetup
+
+
+class ResponseCacheTests(TestSetup):
+    def get_categories(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.drone_category_list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(context.captured_queries)
+
+    def test_repeated_reads_are_served_from_cache(self):
+        """
+        Ensure a repeated read hits no table, with any parameter order
+        """
+        DroneCategory.objects.create(name="Hexacopter")
+        first, first_queries = self.get_categories(ordering="name", limit=2)
+        second, second_queries = self.get_categories(limit=2, ordering="name")
+        self.assertGreater(first_queries, 0)
+        self.assertEqual(second_queries, 0)
+        self.assertEqual(first.data, second.data)
+
+    def test_writes_invalidate_cached_responses(self):
+        """
+        Ensure a write to a dependency is visible on the next read
+        """
+        category = DroneCategory.objects.create(name="Hexacopter")
+        self.get_categories()
+        category.name = "Octocopter"
+        category.save()
+        response, queries = self.get_categories()
+        self.assertGreater(queries, 0)
+        self.assertEqual(response.data["results"][0]["name"], "Octocopter")
+
+        category.delete()
+        response, _ = self.get_categories()
+        self.assertEqual(response.data["count"], 0)
+
+    def test_stats(self):
+        """
+        Ensure hits and misses are exposed to admins only
+        """
+        self.get_categories()
+        self.get_categories()
+        self.get_categories(name="Hexacopter")
+
+        stats_url = reverse("response-cache-stats")
+        response = self.client.get(stats_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        admin = User.objects.create_superuser(**self.user_data)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {}".format(admin.tokens.get("access"))
+        )
+        response = self.client.get(stats_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.data["DroneCategoryListView"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
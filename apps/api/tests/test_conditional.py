@@ -0,0 +1,108 @@
+from rest_framework import status
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from apps.authentication.models import User
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from .test_setup import TestSetup
+
+
+class ConditionalGetTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user(**self.user_data)
+        self.category = DroneCategory.objects.create(name="Hexacopter")
+        self.drone = Drone.objects.create(
+            name="Skipper",
+            category=self.category,
+            owner=self.user,
+            manufacturing_date=timezone.now(),
+        )
+        self.drone_list_url = reverse("drone-list")
+
+    def authenticate(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {}".format(self.user.tokens.get("access"))
+        )
+
+    def test_not_modified(self):
+        """
+        Ensure a request with the current ETag gets an empty 304
+        """
+        response = self.client.get(self.drone_list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = self.client.get(self.drone_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_changes_update_the_etag(self):
+        """
+        Ensure writes to the rows, their nested objects and the filters all
+        change the ETag
+        """
+        detail_url = reverse("drone-detail", None, {self.drone.pk})
+        etag = self.client.get(detail_url)["ETag"]
+
+        self.category.name = "Octocopter"
+        self.category.save()
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["category"], "Octocopter")
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = self.client.get(self.drone_list_url)["ETag"]
+        response = self.client.get(
+            self.drone_list_url, {"name": "Skipper"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_nested_changes_ignore_if_modified_since(self):
+        """
+        Ensure If-Modified-Since cannot hide a change of a nested object,
+        and views with nested objects don't send a Last-Modified
+        """
+        self.authenticate()
+        pilot = Pilot.objects.create(name="Penelope", races_count=1)
+        url = reverse("pilot-detail", None, {pilot.pk}) + "?expand=competitions"
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        last_modified = http_date(pilot.updated_at.timestamp() + 1)
+        Competition.objects.create(
+            pilot=pilot,
+            drone=self.drone,
+            distance_in_feet=800,
+            distance_achievement_date=timezone.now(),
+        )
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["competitions"]), 1)
+
+    def test_cache_control(self):
+        """
+        Ensure anonymous responses may be stored by shared caches and
+        authenticated ones may not
+        """
+        response = self.client.get(self.drone_list_url)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+        for header in ("Accept", "Authorization", "Cookie"):
+            self.assertIn(header, response["Vary"])
+
+        self.authenticate()
+        response = self.client.get(self.drone_list_url)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertNotIn("public", response["Cache-Control"])
+
+    def test_empty_lists_get_cache_headers(self):
+        """
+        Ensure lists without an ETag still vary on the credentials
+        """
+        response = self.client.get(self.drone_list_url, {"name": "Nobody"})
+        self.assertEqual(response.data["results"], [])
+        self.assertNotIn("ETag", response)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("Authorization", response["Vary"])
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+from rest_framework import status
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from .test_setup import TestSetup
+
+
+class ExportTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        user = User.objects.create_user(**self.user_data)
+        category = DroneCategory.objects.create(name="Racers")
+        drone = Drone.objects.create(
+            name="Skipper",
+            category=category,
+            owner=user,
+            manufacturing_date=timezone.now(),
+        )
+        pilot = Pilot.objects.create(name="Penelope", races_count=1)
+        for distance in range(100, 1100, 100):
+            Competition.objects.create(
+                pilot=pilot,
+                drone=drone,
+                distance_in_feet=distance,
+                distance_achievement_date=timezone.now(),
+            )
+        self.url = reverse("competition-export")
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_csv(self):
+        """
+        Ensure the whole filtered result set is streamed as CSV
+        """
+        response = self.client.get(self.url, {"min_distance_in_feet": 300})
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[0]["distance_in_feet"], "1000")
+        self.assertEqual(rows[0]["pilot"], "Penelope")
+        self.assertEqual(rows[0]["drone"], "Skipper")
+
+    def test_export_ndjson(self):
+        """
+        Ensure rows can be streamed as NDJSON
+        """
+        response = self.client.get(
+            self.url, {"format": "ndjson", "ordering": "distance_in_feet"}
+        )
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[0]["distance_in_feet"], 100)
+
+    def test_export_requires_list_permissions(self):
+        """
+        Ensure exports are as restricted as the matching list
+        """
+        response = self.client.get(reverse("pilot-export"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
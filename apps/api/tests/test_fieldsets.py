@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from .test_setup import TestSetup
+
+
+class SparseFieldsetTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user(**self.user_data)
+        category = DroneCategory.objects.create(name="Quadcopter")
+        self.drone = Drone.objects.create(
+            name="Falcon",
+            category=category,
+            owner=self.user,
+            manufacturing_date=timezone.now(),
+        )
+        self.pilot = Pilot.objects.create(name="Penelope", races_count=1)
+        Competition.objects.create(
+            pilot=self.pilot,
+            drone=self.drone,
+            distance_in_feet=100,
+            distance_achievement_date=timezone.now(),
+        )
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        return response, context.captured_queries
+
+    def test_fields(self):
+        self.client.force_authenticate(self.user)
+        response, queries = self.get(reverse("pilot-list"), fields="pk,name")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"], [{"pk": str(self.pilot.pk), "name": "Penelope"}]
+        )
+        # validators, count, pilots: the competitions are not prefetched
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn("races_count", queries[-1]["sql"])
+
+    def test_exclude(self):
+        response, queries = self.get(
+            reverse("drone-detail", None, {self.drone.pk}), exclude="owner,category"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("owner", response.data)
+        self.assertNotIn("category", response.data)
+        self.assertIn("name", response.data)
+        self.assertNotIn("JOIN", queries[-1]["sql"])
+
+    def test_keyset_pages_with_deferred_ordering(self):
+        Drone.objects.create(
+            name="Griffin",
+            category=self.drone.category,
+            owner=self.user,
+            manufacturing_date=timezone.now(),
+        )
+        response, queries = self.get(
+            reverse("drone-list"), fields="pk", cursor="", limit=1
+        )
+        self.assertEqual(response.data["results"], [{"pk": str(self.drone.pk)}])
+        self.assertIsNotNone(response.data["next"])
+        # validators, drones: the name is loaded for the cursor
+        self.assertEqual(len(queries), 2)
+
+    def test_unknown_fields(self):
+        response = self.client.get(reverse("competition-list"), {"fields": "speed"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_writes_keep_every_field(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            reverse("drone-list") + "?fields=pk",
+            {
+                "name": "Eagle",
+                "category": "Quadcopter",
+                "manufacturing_date": timezone.now(),
+                "has_it_competed": False,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["name"], "Eagle")
@@ -0,0 +1,85 @@
+from rest_framework import status
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from .test_setup import TestSetup
+
+
+class LeaderboardTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user(**self.user_data)
+        self.category = DroneCategory.objects.create(name="Racers")
+        self.pilots = []
+        for index, distance in enumerate((300, 900, 600)):
+            pilot = Pilot.objects.create(name=f"Pilot {index}", races_count=1)
+            drone = Drone.objects.create(
+                name=f"Drone {index}",
+                category=self.category,
+                owner=self.user,
+                manufacturing_date=timezone.now(),
+            )
+            Competition.objects.create(
+                pilot=pilot,
+                drone=drone,
+                distance_in_feet=distance,
+                distance_achievement_date=timezone.now(),
+            )
+            self.pilots.append(pilot)
+
+    def authenticate(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {}".format(self.user.tokens.get("access"))
+        )
+
+    def test_pilot_leaderboard_range(self):
+        """
+        Ensure we can read a range of ranks of the pilots leaderboard
+        """
+        self.authenticate()
+        response = self.client.get(
+            reverse("pilot-leaderboard"), {"from_rank": 2, "to_rank": 3}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            [entry["name"] for entry in response.data["results"]],
+            ["Pilot 2", "Pilot 0"],
+        )
+        self.assertEqual(response.data["results"][0]["rank"], 2)
+
+    def test_pilot_rank(self):
+        """
+        Ensure we can look up the rank of a pilot, and only with a token
+        """
+        url = reverse("pilot-rank", None, {self.pilots[0].pk})
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.authenticate()
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rank"], 3)
+        self.assertEqual(response.data["distance_in_feet"], 300)
+
+    def test_category_top(self):
+        """
+        Ensure we can read the top drones of a category
+        """
+        url = reverse("dronecategory-leaderboard", None, {self.category.pk})
+        response = self.client.get(url, {"top": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["name"], "Drone 1")
+
+    def test_invalid_range(self):
+        """
+        Ensure oversized and reversed ranges are rejected
+        """
+        url = reverse("drone-leaderboard")
+        response = self.client.get(url, {"from_rank": 1, "to_rank": 1000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {"from_rank": 5, "to_rank": 2})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,164 @@
+import unittest
+
+from rest_framework import status
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.authentication.models import User
+from apps.drones.models import Pilot
+from .test_setup import TestSetup
+
+
+class KeysetPaginationTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.pilot_list_url = reverse("pilot-list")
+        user = User.objects.create_user(**self.user_data)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {}".format(user.tokens.get("access"))
+        )
+        # Many ties on races_count, so the pk tiebreaker matters
+        for index in range(11):
+            Pilot.objects.create(
+                name="Pilot {:02}".format(index), races_count=index % 3
+            )
+
+    def collect_pages(self, url, link="next"):
+        names = []
+        pages = 0
+        while url:
+            response = self.client.get(url, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            names.extend(pilot["name"] for pilot in response.data["results"])
+            url = response.data[link]
+            pages += 1
+        return names, pages
+
+    def test_walk_all_pages_forward(self):
+        """
+        Ensure following next links returns every row once, in order
+        """
+        url = "{}?cursor=&ordering=-races_count&limit=3".format(self.pilot_list_url)
+        names, pages = self.collect_pages(url)
+        expected = list(
+            Pilot.objects.order_by("-races_count", "uuid").values_list(
+                "name", flat=True
+            )
+        )
+        self.assertEqual(names, expected)
+        self.assertEqual(pages, 4)
+
+    def test_walk_back_with_previous_links(self):
+        """
+        Ensure previous links walk back over the same pages
+        """
+        url = "{}?cursor=&limit=4".format(self.pilot_list_url)
+        last_page_url = None
+        while url:
+            last_page_url = url
+            url = self.client.get(url, format="json").data["next"]
+        last_page = self.client.get(last_page_url, format="json").data
+        names, _ = self.collect_pages(last_page["previous"], link="previous")
+        names = [pilot["name"] for pilot in last_page["results"]] + names
+        expected = list(Pilot.objects.values_list("name", flat=True))
+        self.assertEqual(sorted(names), expected)
+        self.assertEqual(len(names), len(set(names)))
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "Requires PostgreSQL")
+    def test_walk_search_results(self):
+        """
+        Ensure searches can be paginated with a cursor, in the default
+        ordering rather than by relevance
+        """
+        url = "{}?cursor=&search=Pilot&limit=4".format(self.pilot_list_url)
+        names, pages = self.collect_pages(url)
+        self.assertEqual(names, list(Pilot.objects.values_list("name", flat=True)))
+        self.assertEqual(pages, 3)
+
+    def test_invalid_cursor(self):
+        """
+        Ensure a tampered cursor is rejected
+        """
+        response = self.client.get(self.pilot_list_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_limit_offset_still_available(self):
+        """
+        Ensure requests without a cursor keep the limit/offset pagination
+        """
+        response = self.client.get(self.pilot_list_url, {"limit": 3, "offset": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 11)
+        self.assertEqual(len(response.data["results"]), 3)
+
+
+class CountTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.pilot_list_url = reverse("pilot-list")
+        user = User.objects.create_user(**self.user_data)
+        self.client.force_authenticate(user)
+        for index in range(11):
+            Pilot.objects.create(name="Pilot {:02}".format(index), races_count=1)
+
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.pilot_list_url, {"limit": 4, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counted = any(
+            query["sql"].startswith("SELECT COUNT(*)")
+            for query in context.captured_queries
+        )
+        return response.data, counted
+
+    def test_counts_are_cached_until_a_write(self):
+        """
+        Ensure the pages of a filter share one count, until a pilot changes
+        """
+        data, counted = self.get(races_count=1)
+        self.assertEqual(data["count"], 11)
+        self.assertFalse(data["count_estimated"])
+        self.assertTrue(counted)
+
+        data, counted = self.get(races_count=1, offset=4)
+        self.assertEqual(data["count"], 11)
+        self.assertFalse(counted)
+
+        Pilot.objects.create(name="Pilot 11", races_count=1)
+        data, counted = self.get(races_count=1, offset=8)
+        self.assertEqual(data["count"], 12)
+        self.assertTrue(counted)
+
+    def test_exact_count(self):
+        """
+        Ensure ?count=exact counts the rows, even when the count is cached
+        """
+        self.get()
+        data, counted = self.get(count="exact", offset=4)
+        self.assertEqual(data["count"], 11)
+        self.assertFalse(data["count_estimated"])
+        self.assertTrue(counted)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "Requires PostgreSQL")
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1)
+    def test_estimated_count(self):
+        """
+        Ensure unfiltered lists are counted from the planner estimate, and
+        keep a next link while their pages are full
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE drones_pilot")
+        Pilot.objects.create(name="Pilot 11", races_count=1)
+
+        data, _ = self.get(offset=8)
+        self.assertTrue(data["count_estimated"])
+        self.assertEqual(data["count"], 11)
+        self.assertEqual(len(data["results"]), 4)
+        self.assertIsNotNone(data["next"])
+
+        data, _ = self.get(races_count=1)
+        self.assertEqual(data["count"], 12)
+        self.assertFalse(data["count_estimated"])
@@ -0,0 +1,127 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from .test_setup import TestSetup
+
+
+class QueryCountTests(TestSetup):
+    """
+    Ensure every endpoint costs a fixed number of queries, however many
+    rows and nested competitions there are
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user(**self.user_data)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {}".format(self.user.tokens.get("access"))
+        )
+        self.sequence = 0
+
+    def create_competitions(self, count):
+        """Create ``count`` competitions, each with its own pilot and drone"""
+        for _ in range(count):
+            self.sequence += 1
+            category = DroneCategory.objects.create(name=f"Category {self.sequence}")
+            drone = Drone.objects.create(
+                name=f"Drone {self.sequence}",
+                category=category,
+                owner=self.user,
+                manufacturing_date=timezone.now(),
+            )
+            pilot = Pilot.objects.create(name=f"Pilot {self.sequence}", races_count=1)
+            for distance in (100, 200):
+                Competition.objects.create(
+                    pilot=pilot,
+                    drone=drone,
+                    distance_in_feet=distance + self.sequence,
+                    distance_achievement_date=timezone.now(),
+                )
+
+    def count_queries(self, url):
+        # Measure the cost of building the response, not of reading it back
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assert_constant_queries(self, url, expected):
+        self.create_competitions(1)
+        self.assertEqual(self.count_queries(url), expected)
+        self.create_competitions(5)
+        self.assertEqual(self.count_queries(url), expected)
+
+    def assert_constant_detail_queries(self, model, url_name, expected):
+        self.create_competitions(1)
+        url = reverse(url_name, None, {model.objects.first().pk})
+        self.assertEqual(self.count_queries(url), expected)
+        # Attach more nested rows to the same instance
+        pilot = Pilot.objects.first()
+        for drone in Drone.objects.all()[:5]:
+            Competition.objects.create(
+                pilot=pilot,
+                drone=drone,
+                distance_in_feet=1,
+                distance_achievement_date=timezone.now(),
+            )
+        self.assertEqual(self.count_queries(url), expected)
+
+    def test_drone_list_queries(self):
+        # user, validators, count, drones with owner and category
+        self.assert_constant_queries(reverse("drone-list"), 4)
+
+    def test_drone_category_list_queries(self):
+        # user, validators, count, categories with their drones count
+        self.assert_constant_queries(self.drone_category_list_url, 4)
+
+    def test_drone_category_list_with_drones_queries(self):
+        # user, validators, count, categories with their drones count, drones
+        url = "{}?expand=drones".format(self.drone_category_list_url)
+        self.assert_constant_queries(url, 5)
+
+    def test_pilot_list_queries(self):
+        # user, validators, count, pilots with their competitions count
+        self.assert_constant_queries(reverse("pilot-list"), 4)
+
+    def test_pilot_list_with_competitions_queries(self):
+        # user, validators, count, pilots, competitions with drone, owner and
+        # category
+        url = "{}?expand=competitions.drone".format(reverse("pilot-list"))
+        self.assert_constant_queries(url, 5)
+
+    def test_competition_list_queries(self):
+        # user, validators, count, competitions with pilot and drone
+        self.assert_constant_queries(reverse("competition-list"), 4)
+
+    def test_filtered_competition_list_queries(self):
+        # user, pilot name lookup, validators, pilot name lookup, count,
+        # competitions: users are not cached in process memory
+        self.create_competitions(3)
+        url = reverse("competition-list")
+        self.client.get(url, {"pilot_name": "Pilot 1"})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {"pilot_name": "Pilot 2"})
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(len(context.captured_queries), 6)
+
+        # Unknown names are still rejected
+        response = self.client.get(url, {"pilot_name": "Nobody"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_drone_detail_queries(self):
+        self.assert_constant_detail_queries(Drone, "drone-detail", 3)
+
+    def test_drone_category_detail_queries(self):
+        self.assert_constant_detail_queries(DroneCategory, "dronecategory-detail", 3)
+
+    def test_pilot_detail_queries(self):
+        self.assert_constant_detail_queries(Pilot, "pilot-detail", 3)
+
+    def test_competition_detail_queries(self):
+        self.assert_constant_detail_queries(Competition, "competition-detail", 3)
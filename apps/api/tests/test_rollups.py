@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from rest_framework import status
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from .test_setup import TestSetup
+
+
+class RollupTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user(**self.user_data)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {}".format(self.user.tokens.get("access"))
+        )
+        start = timezone.make_aware(datetime(2021, 3, 1, 10))
+        self.drone = Drone.objects.create(
+            name="Drone",
+            category=DroneCategory.objects.create(name="Quadcopter"),
+            owner=self.user,
+            manufacturing_date=start,
+        )
+        self.pilot = Pilot.objects.create(name="Penelope", races_count=3)
+        other = Pilot.objects.create(name="Pablo", races_count=1)
+        # pilot, distance, days after the 1st of March
+        for pilot, distance, days in (
+            (self.pilot, 500, 0),
+            (self.pilot, 300, 0),
+            (other, 700, 1),
+            (self.pilot, 100, 8),
+        ):
+            Competition.objects.create(
+                drone=self.drone,
+                pilot=pilot,
+                distance_in_feet=distance,
+                distance_achievement_date=start + timedelta(days=days),
+            )
+        self.url = reverse("competition-rollups")
+
+    def test_rollups_of_everyone(self):
+        """
+        Ensure competitions are summarized by bucket, from the rollups only
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"period": "week"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                (row["bucket"], row["count"], row["distance_sum"])
+                for row in response.data
+            ],
+            [("2021-03-01", 3, 1500), ("2021-03-08", 1, 100)],
+        )
+        self.assertEqual(response.data[0]["distance_min"], 300)
+        self.assertEqual(response.data[0]["distance_max"], 700)
+        self.assertEqual(response.data[0]["distance_average"], 500)
+
+    def test_rollups_of_a_pilot_in_a_range(self):
+        response = self.client.get(
+            self.url,
+            {"pilot": self.pilot.pk, "start": "2021-03-01", "end": "2021-03-08"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["bucket"], row["count"]) for row in response.data],
+            [("2021-03-01", 2)],
+        )
+
+    def test_invalid_rollup_query(self):
+        response = self.client.get(
+            self.url, {"pilot": self.pilot.pk, "drone": self.drone.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {"period": "year"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
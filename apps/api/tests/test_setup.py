@@ -2,11 +2,14 @@ from faker import Faker
 
 from rest_framework.test import APITestCase
 
+from django.core.cache import cache
 from django.urls import reverse
 
 
 class TestSetup(APITestCase):
     def setUp(self) -> None:
+        # Throttle histories and cached responses must not leak between tests
+        cache.clear()
         self.register_url = reverse("register")
         self.login_url = reverse("login")
         self.drone_category_list_url = reverse("dronecategory-list")
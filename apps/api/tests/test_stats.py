@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from rest_framework import status
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from .test_setup import TestSetup
+
+
+class StatsTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user(**self.user_data)
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {}".format(self.user.tokens.get("access"))
+        )
+        self.now = timezone.now()
+        quads = DroneCategory.objects.create(name="Quadcopter")
+        hexas = DroneCategory.objects.create(name="Hexacopter")
+        self.drones = [
+            self.create_drone("Drone 0", quads),
+            self.create_drone("Drone 1", quads),
+            self.create_drone("Drone 2", hexas),
+        ]
+        self.pilot = Pilot.objects.create(name="Penelope", races_count=3)
+        other = Pilot.objects.create(name="Pablo", races_count=1)
+        # drone, pilot, distance, days ago
+        for drone, pilot, distance, days in (
+            (0, self.pilot, 500, 3),
+            (0, self.pilot, 300, 1),
+            (1, other, 700, 2),
+            (2, self.pilot, 100, 0),
+        ):
+            Competition.objects.create(
+                drone=self.drones[drone],
+                pilot=pilot,
+                distance_in_feet=distance,
+                distance_achievement_date=self.now - timedelta(days=days),
+            )
+
+    def create_drone(self, name, category):
+        return Drone.objects.create(
+            name=name,
+            category=category,
+            owner=self.user,
+            manufacturing_date=self.now,
+        )
+
+    def test_pilot_stats(self):
+        """
+        Ensure the statistics of a pilot are aggregated and ranked
+        """
+        response = self.client.get(reverse("pilot-stats", None, {self.pilot.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["competitions_count"], 3)
+        self.assertEqual(response.data["best_distance_in_feet"], 500)
+        self.assertEqual(response.data["average_distance_in_feet"], 300)
+        self.assertEqual(response.data["latest_distance_in_feet"], 100)
+        self.assertEqual(response.data["rank"], 2)
+        self.assertEqual(response.data["percentile"], 0)
+
+    def test_drone_percentile_within_category(self):
+        """
+        Ensure drones are ranked overall and placed within their category
+        """
+        response = self.client.get(
+            reverse("drone-stats-list"),
+            {"ids": ",".join(str(drone.pk) for drone in self.drones)},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {item["id"]: item for item in response.data["results"]}
+        first, second, third = (results[str(drone.pk)] for drone in self.drones)
+        self.assertEqual((first["rank"], second["rank"], third["rank"]), (2, 1, 3))
+        self.assertEqual(
+            (first["percentile"], second["percentile"], third["percentile"]),
+            (0, 100, 0),
+        )
+
+    def test_stats_are_refreshed_on_writes(self):
+        """
+        Ensure cached statistics change with the competitions
+        """
+        url = reverse("dronecategory-stats-list")
+        response = self.client.get(url, {"limit": 1})
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["best_distance_in_feet"], 700)
+        response = self.client.get(url, {"limit": 1, "offset": 5})
+        self.assertEqual((response.data["count"], response.data["results"]), (2, []))
+
+        Competition.objects.create(
+            drone=self.drones[2],
+            pilot=self.pilot,
+            distance_in_feet=900,
+            distance_achievement_date=self.now,
+        )
+        response = self.client.get(url, {"limit": 1})
+        self.assertEqual(
+            response.data["results"][0]["id"], str(self.drones[2].category_id)
+        )
+
+    def test_stats_without_competitions(self):
+        """
+        Ensure subjects without competitions are counted and ranked last,
+        and unknown ones are not found
+        """
+        pilot = Pilot.objects.create(name="Newcomer", races_count=0)
+        response = self.client.get(reverse("pilot-stats", None, {pilot.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["competitions_count"], 0)
+        self.assertIsNone(response.data["best_distance_in_feet"])
+        self.assertEqual(response.data["rank"], 3)
+        self.assertEqual(response.data["percentile"], 0)
+
+        response = self.client.get(
+            reverse("pilot-stats-list"), {"ids": f"{pilot.pk},{self.pilot.pk}"}
+        )
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([item["rank"] for item in response.data["results"]], [2, 3])
+
+        url = reverse("pilot-stats", None, {pilot.pk})
+        pilot.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from utils.throttling import TokenBucketThrottle
+from .test_setup import TestSetup
+
+RATES = {"anon": "3/min", "user": "5/min", "pilots": "2/min"}
+REST_FRAMEWORK = dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=RATES)
+
+
+class ScopedView:
+    throttle_scope = "pilots"
+
+
+@override_settings(REST_FRAMEWORK=REST_FRAMEWORK)
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self) -> None:
+        caches["default"].clear()
+        self.now = 1000.0
+        self.request = Request(APIRequestFactory().get("/"))
+
+    def allow(self, view=None):
+        throttle = TokenBucketThrottle()
+        throttle.timer = lambda: self.now
+        return throttle.allow_request(self.request, view), throttle.wait()
+
+    def test_bucket_empties_and_refills(self):
+        self.assertEqual([self.allow()[0] for _ in range(4)], [True] * 3 + [False])
+        # One token every 20 seconds
+        self.assertAlmostEqual(self.allow()[1], 20)
+        self.now += 10
+        self.assertFalse(self.allow()[0])
+        self.now += 10
+        self.assertEqual(self.allow(), (True, 0))
+        self.assertFalse(self.allow()[0])
+
+    def test_scopes_have_their_own_buckets(self):
+        self.assertEqual(
+            [self.allow(ScopedView())[0] for _ in range(3)], [True, True, False]
+        )
+        self.assertTrue(self.allow()[0])
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "throttle": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": "throttle_cache",
+            },
+        },
+        THROTTLE_CACHE="throttle",
+    )
+    def test_database_cache(self):
+        call_command("createcachetable", verbosity=0)
+        self.assertEqual([self.allow()[0] for _ in range(4)], [True] * 3 + [False])
+        self.assertEqual(len(caches["throttle"].get("throttle:anon:127.0.0.1")), 1)
+
+
+@override_settings(REST_FRAMEWORK=REST_FRAMEWORK)
+class ThrottledViewTests(TestSetup):
+    def test_too_many_requests(self):
+        url = reverse("dronecategory-list")
+        responses = [self.client.get(url) for _ in range(4)]
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_200_OK] * 3 + [status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+        self.assertIn("Retry-After", responses[-1])
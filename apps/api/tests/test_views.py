@@ -1,10 +1,14 @@
+from unittest import mock
+
 from rest_framework import status
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.http import urlencode
 
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from apps.drones.models import DroneCategory, Pilot
+from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from apps.api.serializers import DroneCategorySerializer, PilotSerializer
 from apps.authentication.models import User
 from .test_setup import TestSetup
 
@@ -53,6 +57,19 @@ class DroneCategoryTests(TestSetup):
         self.assertEqual(response.data["count"], 1)
         self.assertEqual(response.data["results"][0]["name"], drone_category_name1)
 
+    def test_search_drone_category_by_name_prefix(self):
+        """
+        Ensure we can search drone categories by the start of their name
+        """
+        for name in ("Hexacopter", "Octocopter", "Heavy Lifter"):
+            self.post_drone_category(name)
+        response = self.client.get(self.drone_category_list_url, {"search": "he"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(category["name"] for category in response.data["results"]),
+            ["Heavy Lifter", "Hexacopter"],
+        )
+
     def test_drone_categories_collection(self):
         new_drone_category_name = "Super Copter"
         self.post_drone_category(new_drone_category_name)
@@ -89,6 +106,66 @@ class DroneCategoryTests(TestSetup):
         self.assertEqual(get_response.status_code, status.HTTP_200_OK)
         self.assertEqual(get_response.data["name"], drone_category_name)
 
+    def test_drone_category_drones_summary(self):
+        """
+        Ensure a category returns its drones count and a link to its drones,
+        and embeds the drones only when expanded, up to a limit
+        """
+        response = self.post_drone_category("Quadcopter")
+        category = DroneCategory.objects.get()
+        owner = User.objects.create_user(**self.user_data)
+        for index in range(3):
+            Drone.objects.create(
+                name="Drone {}".format(index),
+                category=category,
+                owner=owner,
+                manufacturing_date=timezone.now(),
+            )
+        url = reverse("dronecategory-detail", None, {response.data.get("pk")})
+
+        get_response = self.client.get(url, format="json")
+        self.assertEqual(get_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_response.data["drones_count"], 3)
+        self.assertNotIn("drones", get_response.data)
+        drones_response = self.client.get(get_response.data["drones_url"])
+        self.assertEqual(drones_response.data["count"], 3)
+
+        with mock.patch.object(DroneCategorySerializer, "expansion_limit", 2):
+            expanded_response = self.client.get(url, {"expand": "drones"})
+        self.assertEqual(expanded_response.data["drones_count"], 3)
+        self.assertEqual(len(expanded_response.data["drones"]), 2)
+
+        bogus_response = self.client.get(url, {"expand": "pilots"})
+        self.assertEqual(bogus_response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_drone_category_list_caps_drones_per_category(self):
+        """
+        Ensure every category of a page embeds its own first drones
+        """
+        owner = User.objects.create_user(**self.user_data)
+        for category_name in ("Hexacopter", "Octocopter"):
+            category = DroneCategory.objects.create(name=category_name)
+            for index in (3, 1, 2):
+                Drone.objects.create(
+                    name="{} {}".format(category_name, index),
+                    category=category,
+                    owner=owner,
+                    manufacturing_date=timezone.now(),
+                )
+
+        with mock.patch.object(DroneCategorySerializer, "expansion_limit", 2):
+            response = self.client.get(
+                self.drone_category_list_url, {"expand": "drones"}
+            )
+        for category in response.data["results"]:
+            drones = [
+                Drone.objects.get(pk=url.rstrip("/").split("/")[-1]).name
+                for url in category["drones"]
+            ]
+            self.assertEqual(
+                drones, ["{} {}".format(category["name"], index) for index in (1, 2)]
+            )
+
 
 class PilotTests(TestSetup):
     def post_pilot(self, name, gender, races_count):
@@ -142,6 +219,73 @@ class PilotTests(TestSetup):
         unauthorized_get_response = self.client.get(url, format="json")
         assert unauthorized_get_response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_pilot_competitions_expansion(self):
+        """
+        Ensure a pilot returns its competitions count and a link to them, and
+        embeds them, then their drones, only when expanded, up to a limit
+        """
+        self.create_user_and_set_token_credentials()
+        category = DroneCategory.objects.create(name="Quadcopter")
+        drone = Drone.objects.create(
+            name="Falcon",
+            category=category,
+            owner=User.objects.get(),
+            manufacturing_date=timezone.now(),
+        )
+        pilot = Pilot.objects.create(name="Penelope", races_count=3)
+        for distance in (100, 300, 200):
+            Competition.objects.create(
+                pilot=pilot,
+                drone=drone,
+                distance_in_feet=distance,
+                distance_achievement_date=timezone.now(),
+            )
+        Competition.objects.create(
+            pilot=Pilot.objects.create(name="Pablo", races_count=1),
+            drone=drone,
+            distance_in_feet=400,
+            distance_achievement_date=timezone.now(),
+        )
+        url = reverse("pilot-detail", None, {pilot.pk})
+
+        response = self.client.get(url)
+        self.assertEqual(response.data["competitions_count"], 3)
+        self.assertNotIn("competitions", response.data)
+        competitions_response = self.client.get(response.data["competitions_url"])
+        self.assertEqual(competitions_response.data["count"], 3)
+
+        with mock.patch.object(PilotSerializer, "expansion_limit", 2):
+            response = self.client.get(url, {"expand": "competitions"})
+        competitions = response.data["competitions"]
+        self.assertEqual(
+            [competition["distance_in_feet"] for competition in competitions],
+            [300, 200],
+        )
+        self.assertTrue(competitions[0]["drone"].endswith(f"/{drone.pk}/"))
+
+        response = self.client.get(url, {"expand": "competitions.drone"})
+        self.assertEqual(response.data["competitions"][0]["drone"]["name"], "Falcon")
+
+        # Each pilot of a list gets its own best competitions
+        with mock.patch.object(PilotSerializer, "expansion_limit", 2):
+            response = self.client.get(
+                reverse("pilot-list"), {"expand": "competitions.drone"}
+            )
+        self.assertEqual(
+            {
+                pilot["name"]: [
+                    competition["distance_in_feet"]
+                    for competition in pilot["competitions"]
+                ]
+                for pilot in response.data["results"]
+            },
+            {"Pablo": [400], "Penelope": [300, 200]},
+        )
+
+        for expand in ("drones", "competitions.pilot", "competitions.drone.owner"):
+            response = self.client.get(url, {"expand": expand})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_try_to_post_without_token(self):
         new_pilot_name = "Unauthorized pilot"
         new_pilot_gender = Pilot.FEMALE
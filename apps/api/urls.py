@@ -1,6 +1,16 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.urls import path
 
-from . import views
+from . import asyncviews, views
+from .checks import check_async_connections
+
+# The list and detail views are async under ASGI
+read_views = asyncviews if settings.ASYNC_API else views
+
+# ASGI servers don't run the system checks
+for error in check_async_connections(None):
+    raise ImproperlyConfigured(f"{error.msg} {error.hint}")
 
 urlpatterns = [
     path(
@@ -10,42 +20,127 @@ urlpatterns = [
     ),
     path(
         "drones/",
-        views.DroneListView.as_view(),
+        read_views.DroneListView.as_view(),
         name="drone-list",
     ),
+    path(
+        "drones/export/",
+        views.DroneExportView.as_view(),
+        name="drone-export",
+    ),
+    path(
+        "drones/stats/",
+        views.DroneStatsListView.as_view(),
+        name="drone-stats-list",
+    ),
+    path(
+        "drones/<uuid:pk>/stats/",
+        views.DroneStatsView.as_view(),
+        name="drone-stats",
+    ),
     path(
         "drones/<uuid:pk>/",
-        views.DroneDetailView.as_view(),
+        read_views.DroneDetailView.as_view(),
         name="drone-detail",
     ),
     path(
         "categories/",
-        views.DroneCategoryListView.as_view(),
+        read_views.DroneCategoryListView.as_view(),
         name="dronecategory-list",
     ),
+    path(
+        "categories/stats/",
+        views.DroneCategoryStatsListView.as_view(),
+        name="dronecategory-stats-list",
+    ),
+    path(
+        "categories/<uuid:pk>/stats/",
+        views.DroneCategoryStatsView.as_view(),
+        name="dronecategory-stats",
+    ),
     path(
         "categories/<uuid:pk>/",
-        views.DroneCategoryDetailView.as_view(),
+        read_views.DroneCategoryDetailView.as_view(),
         name="dronecategory-detail",
     ),
     path(
         "pilots/",
-        views.PilotListView.as_view(),
+        read_views.PilotListView.as_view(),
         name="pilot-list",
     ),
+    path(
+        "pilots/export/",
+        views.PilotExportView.as_view(),
+        name="pilot-export",
+    ),
+    path(
+        "pilots/stats/",
+        views.PilotStatsListView.as_view(),
+        name="pilot-stats-list",
+    ),
+    path(
+        "pilots/<uuid:pk>/stats/",
+        views.PilotStatsView.as_view(),
+        name="pilot-stats",
+    ),
     path(
         "pilots/<uuid:pk>/",
-        views.PilotDetailView.as_view(),
+        read_views.PilotDetailView.as_view(),
         name="pilot-detail",
     ),
     path(
         "competitions/",
-        views.CompetitionListView.as_view(),
+        read_views.CompetitionListView.as_view(),
         name="competition-list",
     ),
+    path(
+        "competitions/bulk/",
+        views.CompetitionBulkCreateView.as_view(),
+        name="competition-bulk-create",
+    ),
+    path(
+        "competitions/export/",
+        views.CompetitionExportView.as_view(),
+        name="competition-export",
+    ),
+    path(
+        "competitions/rollups/",
+        views.CompetitionRollupView.as_view(),
+        name="competition-rollups",
+    ),
     path(
         "competitions/<uuid:pk>/",
-        views.CompetitionDetailView.as_view(),
+        read_views.CompetitionDetailView.as_view(),
         name="competition-detail",
     ),
+    path(
+        "leaderboards/pilots/",
+        views.PilotLeaderboardView.as_view(),
+        name="pilot-leaderboard",
+    ),
+    path(
+        "leaderboards/pilots/<uuid:pk>/",
+        views.PilotRankView.as_view(),
+        name="pilot-rank",
+    ),
+    path(
+        "leaderboards/drones/",
+        views.DroneLeaderboardView.as_view(),
+        name="drone-leaderboard",
+    ),
+    path(
+        "leaderboards/drones/<uuid:pk>/",
+        views.DroneRankView.as_view(),
+        name="drone-rank",
+    ),
+    path(
+        "leaderboards/categories/<uuid:pk>/",
+        views.DroneCategoryLeaderboardView.as_view(),
+        name="dronecategory-leaderboard",
+    ),
+    path(
+        "cache-stats/",
+        views.ResponseCacheStatsView.as_view(),
+        name="response-cache-stats",
+    ),
 ]
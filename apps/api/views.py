@@ -1,92 +1,519 @@
-from rest_framework import generics, permissions
+import uuid
+
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.relations import SlugRelatedField
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
-from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.settings import api_settings
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 
-from apps.drones.models import Competition, Drone, DroneCategory, Pilot
+from apps.drones import leaderboard, rollups, stats
+from apps.drones.models import (
+    Competition,
+    CompetitionRollup,
+    Drone,
+    DroneCategory,
+    Pilot,
+)
+from apps.drones.signals import competitions_bulk_created
+from .cache import CachedResponseMixin, ConditionalGetMixin, get_stats
 from .serializers import (
+    BulkCompetitionSerializer,
+    CompetitionRollupQuerySerializer,
+    CompetitionRollupSerializer,
     DroneSerializer,
     DroneCategorySerializer,
+    LeaderboardEntrySerializer,
     PilotCompetitionSerializer,
     PilotSerializer,
+    SubjectStatsSerializer,
 )
+from .custompagination import KeysetPaginationWithUpperBound
 from .custompermissions import IsCurrentUserOwnerOrReadOnly
+from .eagerloading import EagerLoadingMixin
+from .export import ExportView
 from .filters import CompetitionFilter
+from .parsers import NDJSONParser
 
 
-class DroneCategoryListView(generics.ListCreateAPIView):
+class DroneCategoryListView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+):
+    cache_dependencies = (DroneCategory, Drone)
     serializer_class = DroneCategorySerializer
-    queryset = DroneCategory.objects.all()
+    queryset = DroneCategory.objects.with_drones_count()
     filterset_fields = ("name",)
     search_fields = ("^name",)
     ordering_fields = ("name",)
 
 
-class DroneCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DroneCategoryDetailView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
+    cache_dependencies = (DroneCategory, Drone)
     serializer_class = DroneCategorySerializer
-    queryset = DroneCategory.objects.all()
+    queryset = DroneCategory.objects.with_drones_count()
 
 
-class DroneListView(generics.ListCreateAPIView):
+class DroneListView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+):
+    cache_dependencies = (Drone, DroneCategory, get_user_model())
     serializer_class = DroneSerializer
     queryset = Drone.objects.all()
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
     filterset_fields = (
         "name",
+        "category",
         "manufacturing_date",
         "has_it_competed",
     )
     search_fields = ("name",)
     ordering_fields = ("name", "manufacturing_date")
-    throttle_classes = (ScopedRateThrottle,)
+    pagination_class = KeysetPaginationWithUpperBound
     throttle_scope = "drones"
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class DroneDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DroneDetailView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
+    cache_dependencies = (Drone, DroneCategory, get_user_model())
     serializer_class = DroneSerializer
     queryset = Drone.objects.all()
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsCurrentUserOwnerOrReadOnly,
     )
-    throttle_classes = (ScopedRateThrottle,)
     throttle_scope = "drones"
 
 
-class PilotListView(generics.ListCreateAPIView):
-    queryset = Pilot.objects.all()
+class PilotListView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+):
+    cache_dependencies = (Pilot, Competition, Drone, DroneCategory, get_user_model())
+    queryset = Pilot.objects.with_competitions_count()
     serializer_class = PilotSerializer
     permission_classes = (permissions.IsAuthenticated,)
     filterset_fields = ("name", "gender", "races_count")
     ordering_fields = ("name", "races_count")
+    pagination_class = KeysetPaginationWithUpperBound
     search_fields = ("^name",)
-    throttle_classes = (ScopedRateThrottle,)
     throttle_scope = "pilots"
 
 
-class PilotDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Pilot.objects.all()
+class PilotDetailView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
+    cache_dependencies = (Pilot, Competition, Drone, DroneCategory, get_user_model())
+    queryset = Pilot.objects.with_competitions_count()
     serializer_class = PilotSerializer
     permission_classes = (permissions.IsAuthenticated,)
-    throttle_classes = (ScopedRateThrottle,)
     throttle_scope = "pilots"
 
 
-class CompetitionListView(generics.ListCreateAPIView):
+class CompetitionListView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+):
+    cache_dependencies = (Competition, Pilot, Drone)
     queryset = Competition.objects.all()
     serializer_class = PilotCompetitionSerializer
     ordering_fields = ("distance_in_feet", "distance_achievement_date")
+    pagination_class = KeysetPaginationWithUpperBound
     filter_class = CompetitionFilter
 
 
-class CompetitionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CompetitionDetailView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
+    cache_dependencies = (Competition, Pilot, Drone)
     queryset = Competition.objects.all()
     serializer_class = PilotCompetitionSerializer
 
 
+class CompetitionBulkCreateView(generics.GenericAPIView):
+    """
+    Insert a list of competitions, as a JSON array or as NDJSON.
+
+    The valid competitions are inserted together; the others are reported
+    by their index in ``errors``.
+    """
+
+    serializer_class = BulkCompetitionSerializer
+    parser_classes = (JSONParser, NDJSONParser)
+    permission_classes = (permissions.IsAuthenticated,)
+    max_items = 50000
+    batch_size = 1000
+
+    def get_items(self):
+        items = self.request.data
+        if not isinstance(items, list):
+            raise ValidationError({"error": "Expected a list of competitions."})
+        if len(items) > self.max_items:
+            raise ValidationError(
+                {"error": f"At most {self.max_items} competitions per request."}
+            )
+        return items
+
+    def resolve_names(self, model, names):
+        """Map each of the names that exist to its primary key, in one query"""
+        return dict(model.objects.filter(name__in=names).values_list("name", "pk"))
+
+    def post(self, request, *args, **kwargs):
+        errors = {}
+        valid = []
+        for index, item in enumerate(self.get_items()):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors[index] = serializer.errors
+
+        pilots = self.resolve_names(Pilot, {data["pilot"] for _, data in valid})
+        drones = self.resolve_names(Drone, {data["drone"] for _, data in valid})
+        does_not_exist = SlugRelatedField.default_error_messages["does_not_exist"]
+        competitions = []
+        for index, data in valid:
+            item_errors = {
+                field: [does_not_exist.format(slug_name="name", value=data[field])]
+                for field, ids in (("pilot", pilots), ("drone", drones))
+                if data[field] not in ids
+            }
+            if item_errors:
+                errors[index] = item_errors
+                continue
+            competitions.append(
+                Competition(
+                    pilot_id=pilots[data["pilot"]],
+                    drone_id=drones[data["drone"]],
+                    distance_in_feet=data["distance_in_feet"],
+                    distance_achievement_date=data["distance_achievement_date"],
+                )
+            )
+
+        if competitions:
+            with transaction.atomic():
+                Competition.objects.bulk_create(
+                    competitions, batch_size=self.batch_size
+                )
+                competitions_bulk_created.send(
+                    sender=Competition, competitions=competitions
+                )
+
+        return Response(
+            {
+                "created": len(competitions),
+                "errors": [
+                    {"index": index, "errors": errors[index]}
+                    for index in sorted(errors)
+                ],
+            },
+            status=(
+                status.HTTP_201_CREATED
+                if competitions or not errors
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+
+class DroneExportView(ExportView):
+    queryset = Drone.objects.all()
+    permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
+    filterset_fields = DroneListView.filterset_fields
+    search_fields = DroneListView.search_fields
+    ordering_fields = DroneListView.ordering_fields
+    export_fields = {
+        "pk": "pk",
+        "name": "name",
+        "category": "category__name",
+        "owner": "owner__username",
+        "has_it_competed": "has_it_competed",
+        "manufacturing_date": "manufacturing_date",
+    }
+    throttle_scope = "exports"
+
+
+class PilotExportView(ExportView):
+    queryset = Pilot.objects.all()
+    permission_classes = (permissions.IsAuthenticated,)
+    filterset_fields = PilotListView.filterset_fields
+    search_fields = PilotListView.search_fields
+    ordering_fields = PilotListView.ordering_fields
+    export_fields = {
+        "pk": "pk",
+        "name": "name",
+        "gender": "gender",
+        "races_count": "races_count",
+    }
+    throttle_scope = "exports"
+
+
+class CompetitionRollupView(generics.ListAPIView):
+    """
+    Read the competitions of everyone, or of the given ``pilot``, ``drone``
+    or ``category``, summarized by ``period`` (day, week or month), for the
+    buckets from ``start`` to ``end``. Only the rollups are read.
+    """
+
+    serializer_class = CompetitionRollupSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    filter_backends = ()
+    pagination_class = None
+    max_buckets = 1000
+
+    def get_queryset(self):
+        params = CompetitionRollupQuerySerializer(data=self.request.query_params)
+        if not params.is_valid():
+            raise ValidationError({"error": params.errors})
+        params = params.validated_data
+
+        dimension, subject_id = CompetitionRollup.ALL, rollups.ALL_SUBJECT
+        for name in (
+            CompetitionRollup.PILOT,
+            CompetitionRollup.DRONE,
+            CompetitionRollup.CATEGORY,
+        ):
+            if name in params:
+                dimension, subject_id = name, params[name]
+        queryset = CompetitionRollup.objects.filter(
+            period=params["period"], dimension=dimension, subject_id=subject_id
+        )
+        if "start" in params:
+            start = rollups.truncate(params["start"], params["period"])
+            queryset = queryset.filter(bucket__gte=start)
+        if "end" in params:
+            queryset = queryset.filter(bucket__lte=params["end"])
+        return queryset.order_by("bucket")[: self.max_buckets]
+
+
+class CompetitionExportView(ExportView):
+    queryset = Competition.objects.all()
+    filter_class = CompetitionFilter
+    ordering_fields = CompetitionListView.ordering_fields
+    export_fields = {
+        "pk": "pk",
+        "distance_in_feet": "distance_in_feet",
+        "distance_achievement_date": "distance_achievement_date",
+        "pilot": "pilot__name",
+        "drone": "drone__name",
+    }
+    throttle_scope = "exports"
+
+
+class LeaderboardView(generics.GenericAPIView):
+    """
+    Read ranks ``from_rank`` to ``to_rank`` of a leaderboard, or the first
+    ``top`` ranks
+    """
+
+    serializer_class = LeaderboardEntrySerializer
+    board = None
+    max_ranks = 100
+
+    def get_board(self):
+        return self.board
+
+    def get_rank_range(self):
+        params = self.request.query_params
+        try:
+            if "top" in params:
+                first, last = 1, int(params["top"])
+            else:
+                first = int(params.get("from_rank", 1))
+                last = int(params.get("to_rank", first + api_settings.PAGE_SIZE - 1))
+        except ValueError:
+            raise ValidationError({"error": "Ranks must be integers."})
+
+        if first < 1 or last < first:
+            raise ValidationError(
+                {"error": "Ranks must be a positive, increasing range."}
+            )
+        if last - first >= self.max_ranks:
+            raise ValidationError(
+                {"error": f"At most {self.max_ranks} ranks can be read at once."}
+            )
+        return first, last
+
+    def get(self, request, *args, **kwargs):
+        first, last = self.get_rank_range()
+        board = self.get_board()
+        entries = leaderboard.read_range(board, first, last)
+        serializer = self.get_serializer(entries, many=True)
+        return Response(
+            {"count": leaderboard.board_size(board), "results": serializer.data}
+        )
+
+
+class LeaderboardRankView(generics.GenericAPIView):
+    """
+    Read the rank of a pilot or a drone on a leaderboard
+    """
+
+    serializer_class = LeaderboardEntrySerializer
+    board = None
+
+    def get(self, request, pk, *args, **kwargs):
+        entry = leaderboard.read_rank(self.board, pk)
+        if entry is None:
+            raise Http404
+        data = self.get_serializer(entry).data
+        data["count"] = leaderboard.board_size(self.board)
+        return Response(data)
+
+
+class PilotLeaderboardView(LeaderboardView):
+    board = leaderboard.PILOTS_BOARD
+    permission_classes = (permissions.IsAuthenticated,)
+    throttle_scope = "pilots"
+
+
+class PilotRankView(LeaderboardRankView):
+    board = leaderboard.PILOTS_BOARD
+    permission_classes = (permissions.IsAuthenticated,)
+    throttle_scope = "pilots"
+
+
+class DroneLeaderboardView(LeaderboardView):
+    board = leaderboard.DRONES_BOARD
+    throttle_scope = "drones"
+
+
+class DroneRankView(LeaderboardRankView):
+    board = leaderboard.DRONES_BOARD
+    throttle_scope = "drones"
+
+
+class DroneCategoryLeaderboardView(LeaderboardView):
+    throttle_scope = "drones"
+
+    def get_board(self):
+        category = get_object_or_404(
+            DroneCategory.objects.only("pk"), pk=self.kwargs["pk"]
+        )
+        return leaderboard.category_board(category.pk)
+
+
+class SubjectStatsView(generics.GenericAPIView):
+    """
+    Read the competition statistics of a pilot, a drone or a category
+    """
+
+    serializer_class = SubjectStatsSerializer
+    kind = None
+
+    def get(self, request, pk, *args, **kwargs):
+        _, results = stats.get_stats(self.kind, ids=[pk])
+        if not results:
+            raise Http404
+        return Response(self.get_serializer(results[0]).data)
+
+
+class SubjectStatsListView(generics.GenericAPIView):
+    """
+    Read the competition statistics of the pilots, drones or categories
+    given as comma separated ``ids``, or ``limit`` of them by rank from
+    ``offset``
+    """
+
+    serializer_class = SubjectStatsSerializer
+    kind = None
+    max_limit = 100
+
+    def get_params(self):
+        params = self.request.query_params
+        ids = [pk for pk in params.get("ids", "").split(",") if pk]
+        try:
+            ids = [str(uuid.UUID(pk)) for pk in ids]
+            limit = int(params.get("limit", api_settings.PAGE_SIZE))
+            offset = int(params.get("offset", 0))
+        except ValueError:
+            raise ValidationError({"error": "Invalid ids, limit or offset."})
+        if len(ids) > self.max_limit or not 0 < limit <= self.max_limit:
+            raise ValidationError(
+                {"error": f"At most {self.max_limit} statistics can be read at once."}
+            )
+        return ids, limit, max(offset, 0)
+
+    def get(self, request, *args, **kwargs):
+        ids, limit, offset = self.get_params()
+        count, results = stats.get_stats(self.kind, ids, limit, offset)
+        serializer = self.get_serializer(results, many=True)
+        return Response({"count": count, "results": serializer.data})
+
+
+class PilotStatsView(SubjectStatsView):
+    kind = "pilots"
+    permission_classes = (permissions.IsAuthenticated,)
+    throttle_scope = "pilots"
+
+
+class PilotStatsListView(SubjectStatsListView):
+    kind = "pilots"
+    permission_classes = (permissions.IsAuthenticated,)
+    throttle_scope = "pilots"
+
+
+class DroneStatsView(SubjectStatsView):
+    kind = "drones"
+    throttle_scope = "drones"
+
+
+class DroneStatsListView(SubjectStatsListView):
+    kind = "drones"
+    throttle_scope = "drones"
+
+
+class DroneCategoryStatsView(SubjectStatsView):
+    kind = "categories"
+
+
+class DroneCategoryStatsListView(SubjectStatsListView):
+    kind = "categories"
+
+
+class ResponseCacheStatsView(generics.GenericAPIView):
+    """
+    Hits and misses of the cached list and detail views
+    """
+
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_stats())
+
+
 # API root
 class ApiRoot(generics.GenericAPIView):
     def get(self, request, *args, **kwargs):
@@ -96,5 +523,7 @@ class ApiRoot(generics.GenericAPIView):
                 "drones": reverse("drone-list", request=request),
                 "pilots": reverse("pilot-list", request=request),
                 "competitions": reverse("competition-list", request=request),
+                "pilots-leaderboard": reverse("pilot-leaderboard", request=request),
+                "drones-leaderboard": reverse("drone-leaderboard", request=request),
             }
         )
\ No newline at end of file
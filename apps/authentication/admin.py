@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from apps.authentication.models import User
+from apps.authentication.models import OutboxEmail, User
 
 admin.site.register(User)
+admin.site.register(OutboxEmail)
@@ -0,0 +1,103 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from apps.core.cache import is_process_local
+
+# Fields of the cached users; the others are loaded when first accessed
+SNAPSHOT_FIELDS = ("id", "username", "is_active", "is_verified", "is_staff")
+
+
+def get_token_cache_key(raw_token):
+    return "auth-token:{}".format(hashlib.sha256(raw_token).hexdigest())
+
+
+def get_user_cache_key(user_id):
+    return f"auth-user:{user_id}"
+
+
+def invalidate_user(user_id):
+    cache.delete(get_user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` caching the claims of verified tokens and a
+    snapshot of their users for ``AUTH_CACHE_TIMEOUT`` seconds, so requests
+    with a known token neither verify it again nor query the user.
+
+    Claims are kept no longer than their token is valid. Snapshots are
+    dropped whenever their user is saved or deleted, which includes being
+    deactivated; users are returned with the fields of the snapshot loaded
+    and the others deferred. Users are only cached in a cache shared by
+    every worker, as the other workers would not see a snapshot dropped
+    from the memory of one.
+    """
+
+    def get_validated_token(self, raw_token):
+        key = get_token_cache_key(raw_token)
+        cached = cache.get(key)
+        if cached is not None:
+            index, payload = cached
+            if payload["exp"] > time.time():
+                return self.restore_token(
+                    api_settings.AUTH_TOKEN_CLASSES[index], raw_token, payload
+                )
+
+        validated_token = super().get_validated_token(raw_token)
+        timeout = min(
+            settings.AUTH_CACHE_TIMEOUT, int(validated_token["exp"] - time.time())
+        )
+        if timeout > 0:
+            index = api_settings.AUTH_TOKEN_CLASSES.index(type(validated_token))
+            cache.set(key, (index, validated_token.payload), timeout)
+        return validated_token
+
+    def restore_token(self, token_class, raw_token, payload):
+        """Build a token of ``token_class`` from claims already verified"""
+        token = token_class.__new__(token_class)
+        token.token = raw_token
+        token.current_time = aware_utcnow()
+        token.payload = payload
+        return token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if is_process_local():
+            return super().get_user(validated_token)
+
+        key = get_user_cache_key(user_id)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            user = super().get_user(validated_token)
+            snapshot = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+            cache.set(key, snapshot, settings.AUTH_CACHE_TIMEOUT)
+            return user
+
+        User = get_user_model()
+        # from_db expects the values in the order of the fields of the model
+        fields = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in snapshot
+        ]
+        user = User.from_db(
+            router.db_for_read(User), fields, [snapshot[field] for field in fields]
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.authentication import outbox
+
+
+class Command(BaseCommand):
+    help = "Send the emails waiting in the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of emails sent over one connection",
+        )
+        parser.add_argument(
+            "--lease",
+            type=int,
+            default=300,
+            help="Seconds a batch is hidden from other workers while it is sent",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining, waiting --interval seconds when the outbox is empty",
+        )
+        parser.add_argument("--interval", type=float, default=5)
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = outbox.drain(options["batch_size"], options["lease"])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f"{sent} sent, {failed} failed")
+            elif options["loop"]:
+                time.sleep(options["interval"])
+            else:
+                break
+        self.stdout.write(
+            self.style.SUCCESS(f"{total_sent} emails sent, {total_failed} failed.")
+        )
@@ -3,8 +3,6 @@ import os
 from imagekit.models import ImageSpecField
 from pilkit.processors import ResizeToFill
 
-from rest_framework_simplejwt.tokens import RefreshToken
-
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin
@@ -12,6 +10,8 @@ from django.contrib.auth.models import BaseUserManager
 from django.utils.translation import gettext_lazy as _
 from django.utils.timezone import now as timezone_now
 
+from .tokens import issue_tokens
+
 
 def upload_to(instance, filename):
     now = timezone_now()
@@ -124,5 +124,26 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     @property
     def tokens(self):
-        refresh = RefreshToken.for_user(self)
-        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+        return issue_tokens(self)
+
+
+class OutboxEmail(models.Model):
+    """
+    Email waiting to be sent by the ``drain_outbox`` command, written in the
+    transaction of the change it is about
+    """
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    to = models.EmailField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    send_after = models.DateTimeField(default=timezone_now, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ("send_after",)
+
+    def __str__(self) -> str:
+        return f"{self.subject} to {self.to}"
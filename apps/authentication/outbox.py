@@ -0,0 +1,100 @@
+"""
+Sending of the emails queued in ``OutboxEmail``.
+
+``drain`` claims a batch of due emails, pushing their ``send_after`` past a
+lease so that concurrent workers skip them, and sends them over a single
+connection of the email backend. Sent emails are marked as such; failed
+ones are due again after a backoff doubling at every attempt, until
+``OUTBOX_MAX_ATTEMPTS``.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(subject, body, to):
+    return OutboxEmail.objects.create(subject=subject, body=body, to=to)
+
+
+def pending():
+    return OutboxEmail.objects.filter(
+        sent_at__isnull=True, attempts__lt=settings.OUTBOX_MAX_ATTEMPTS
+    )
+
+
+def claim(batch_size, lease):
+    """
+    Return up to ``batch_size`` due emails, leased for ``lease`` seconds
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            pending()
+            .filter(send_after__lte=now)
+            .order_by("send_after", "pk")
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            send_after=now + timedelta(seconds=lease)
+        )
+    return emails
+
+
+def fail(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.send_after = timezone.now() + timedelta(
+        seconds=settings.OUTBOX_BACKOFF * 2 ** (email.attempts - 1)
+    )
+    email.save(update_fields=("attempts", "last_error", "send_after"))
+    logger.warning("Could not send %s (attempt %s): %s", email, email.attempts, error)
+
+
+def drain(batch_size=100, lease=300):
+    """
+    Send a batch of due emails, and return how many were sent and how many
+    failed.
+    """
+    emails = claim(batch_size, lease)
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            fail(email, error)
+        return 0, len(emails)
+
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                to=[email.to],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                fail(email, error)
+                failed += 1
+            else:
+                email.attempts += 1
+                email.sent_at = timezone.now()
+                email.save(update_fields=("attempts", "sent_at"))
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
@@ -1,28 +1,5 @@
-from rest_framework import renderers
-import json
+from utils.renderers import EnvelopeJSONRenderer
 
 
-class UserRenderer(renderers.JSONRenderer):
-    charset = "utf-8"
-
-    def render(self, data, accepted_media_type, renderer_context):
-
-        response = ""
-
-        if "ErrorDetail" in str(data):
-            response = json.dumps(
-                {
-                    "error": data,
-                    "statusCode": renderer_context.get("response").status_code,
-                }
-            )
-
-        else:
-            response = json.dumps(
-                {
-                    "data": data,
-                    "statusCode": renderer_context.get("response").status_code,
-                }
-            )
-
-        return response
\ No newline at end of file
+class UserRenderer(EnvelopeJSONRenderer):
+    pass
\ No newline at end of file
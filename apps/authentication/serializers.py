@@ -6,6 +6,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 
 from .models import User
+from .tokens import issue_tokens
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -73,17 +74,11 @@ class LoginSerializer(serializers.ModelSerializer):
     tokens = serializers.SerializerMethodField()
 
     def get_tokens(self, obj):
-        user = User.objects.get(email=obj["email"])
-
-        return {
-            "access": user.tokens.get("access"),
-            "refresh": user.tokens.get("refresh"),
-        }
+        return obj["tokens"]
 
     def validate(self, attrs):
         email = attrs.get("email", "")
         password = attrs.get("password", "")
-        tokens = attrs.get("tokens")
 
         user = authenticate(email=email, password=password)
 
@@ -97,7 +92,7 @@ class LoginSerializer(serializers.ModelSerializer):
         return {
             "email": user.email,
             "username": user.username,
-            "tokens": tokens,
+            "tokens": issue_tokens(user),
         }
 
 
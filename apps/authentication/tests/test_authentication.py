@@ -0,0 +1,75 @@
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from apps.authentication.authentication import CachedJWTAuthentication
+from apps.authentication.models import User
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        # A cache shared between processes, as users are only cached in one
+        location = tempfile.TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        shared_cache = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location.name,
+                }
+            }
+        )
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="pilot@example.com", username="pilot", password="p@assw0rd"
+        )
+        self.access = self.user.tokens["access"]
+
+    def authenticate(self):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {self.access}"
+        )
+        return CachedJWTAuthentication().authenticate(request)
+
+    def test_known_tokens_need_no_query(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.username, "pilot")
+        self.assertEqual(token["user_id"], self.user.pk)
+        # Fields out of the snapshot are loaded on access
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "pilot@example.com")
+
+    def test_saved_users_are_loaded_again(self):
+        self.authenticate()
+        self.user.username = "renamed"
+        self.user.save()
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate()
+        self.assertEqual(user.username, "renamed")
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_users_are_not_cached_in_process_memory(self):
+        with override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            }
+        ):
+            self.authenticate()
+            # The claims are still cached, the user is not
+            with self.assertNumQueries(1):
+                user, _ = self.authenticate()
+        self.assertEqual(user, self.user)
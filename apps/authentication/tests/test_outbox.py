@@ -0,0 +1,58 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPServerDisconnected
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.authentication import outbox
+from apps.authentication.models import OutboxEmail
+from .test_setup import TestSetup
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise SMTPServerDisconnected("Connection unexpectedly closed")
+
+
+class OutboxTests(TestSetup):
+    def test_registration_queues_the_verification_email(self):
+        """Ensures registering does not wait for the email to be sent"""
+        response = self.client.post(self.register_url, self.user_data, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, self.user_data["email"])
+
+        call_command("drain_outbox", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user_data["email"]])
+        self.assertIn("?token=", mail.outbox[0].body)
+        email.refresh_from_db()
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(outbox.drain(), (0, 0))
+
+    def test_failed_emails_are_retried_with_backoff(self):
+        email = outbox.enqueue("Subject", "Body", "pilot@example.com")
+        with override_settings(
+            EMAIL_BACKEND="apps.authentication.tests.test_outbox.FailingBackend"
+        ):
+            self.assertEqual(outbox.drain(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("unexpectedly closed", email.last_error)
+        self.assertGreater(email.send_after, timezone.now() + timedelta(seconds=50))
+        # Not due yet
+        self.assertEqual(outbox.drain(), (0, 0))
+
+        OutboxEmail.objects.update(send_after=timezone.now())
+        self.assertEqual(outbox.drain(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_emails_are_given_up_after_max_attempts(self):
+        outbox.enqueue("Subject", "Body", "pilot@example.com")
+        OutboxEmail.objects.update(attempts=5)
+        self.assertEqual(outbox.drain(), (0, 0))
@@ -0,0 +1,57 @@
+import json
+from unittest import mock
+
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.response import Response
+
+from django.test import SimpleTestCase
+
+from apps.authentication.renderers import UserRenderer
+
+
+def legacy_render(data, status_code):
+    """The envelope of the renderers before the errors were told by status"""
+    key = "error" if "ErrorDetail" in str(data) else "data"
+    return json.dumps({key: data, "statusCode": status_code})
+
+
+class RendererTests(SimpleTestCase):
+    payloads = (
+        ({"email": "pilot@example.com", "tokens": {"access": "a.b.c"}}, 200),
+        ([{"name": "Skipper", "distance": 12.5, "tags": ["é", None]}] * 3, 201),
+        ({"email": [ErrorDetail("Enter a valid email address.", "invalid")]}, 400),
+        ({"detail": ErrorDetail("Invalid credentials", "authentication_failed")}, 401),
+    )
+
+    def render(self, data, status_code):
+        response = Response(data, status=status_code)
+        response.exception = status_code >= 400
+        return UserRenderer().render(data, None, {"response": response})
+
+    def test_byte_identical_without_orjson(self):
+        """
+        Ensure the stdlib encoder keeps the exact bytes of the old envelope
+        """
+        with mock.patch("utils.renderers.orjson", None):
+            for data, status_code in self.payloads:
+                self.assertEqual(
+                    self.render(data, status_code),
+                    legacy_render(data, status_code).encode(),
+                )
+
+    def test_same_document_with_any_encoder(self):
+        """
+        Ensure every encoder builds the same JSON document as the old envelope
+        """
+        for data, status_code in self.payloads:
+            self.assertEqual(
+                json.loads(self.render(data, status_code)),
+                json.loads(legacy_render(data, status_code)),
+            )
+
+    def test_errors_are_told_by_status(self):
+        """
+        Ensure error responses without ErrorDetail still get the error key
+        """
+        rendered = json.loads(self.render({"error": "Please login to proceed"}, 401))
+        self.assertEqual(rendered["error"], {"error": "Please login to proceed"})
@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.db import DatabaseError, IntegrityError
+from django.utils import timezone
+
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.authentication.models import User
+from apps.authentication.tokens import OutstandingTokenBuffer
+from .test_setup import TestSetup
+
+
+class TokenTests(TestSetup):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user(is_verified=True, **self.user_data)
+
+    def test_login_issues_one_token_pair(self):
+        """
+        Ensures a login authenticates once and records a single refresh token
+        """
+        # authenticate, outstanding token in a savepoint of the test
+        # transaction
+        with self.assertNumQueries(4):
+            response = self.client.post(self.login_url, self.user_data, format="json")
+        self.assertEqual(response.status_code, 200)
+        tokens = response.data["tokens"]
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("token", flat=True)),
+            [tokens["refresh"]],
+        )
+        refresh = RefreshToken(tokens["refresh"])
+        access = AccessToken(tokens["access"])
+        self.assertEqual(access["user_id"], self.user.pk)
+        self.assertEqual(access["exp"], refresh.access_token["exp"])
+
+    def test_buffer_inserts_in_batches(self):
+        buffer = OutstandingTokenBuffer(size=3, interval=60)
+        self.addCleanup(buffer.flush)
+        buffer.add(self.outstanding_token("a"))
+        buffer.add(self.outstanding_token("b"))
+        self.assertFalse(OutstandingToken.objects.exists())
+
+        # As blacklisting a token not inserted yet does
+        self.outstanding_token("a").save()
+        # One insert, in a savepoint of the test transaction
+        with self.assertNumQueries(3):
+            buffer.add(self.outstanding_token("c"))
+        self.assertEqual(
+            sorted(OutstandingToken.objects.values_list("jti", flat=True)),
+            ["a", "b", "c"],
+        )
+
+    def test_buffer_keeps_rows_that_failed_to_insert(self):
+        """
+        Ensures a failed insert is logged instead of failing the login that
+        filled the buffer, and retried on the next flush
+        """
+        buffer = OutstandingTokenBuffer(size=2, interval=60)
+        self.addCleanup(buffer.flush)
+        buffer.add(self.outstanding_token("a"))
+        with mock.patch.object(
+            OutstandingToken.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertLogs("apps.authentication.tokens", "ERROR"):
+            buffer.add(self.outstanding_token("b"))
+        self.assertFalse(OutstandingToken.objects.exists())
+
+        buffer.flush()
+        self.assertEqual(
+            sorted(OutstandingToken.objects.values_list("jti", flat=True)),
+            ["a", "b"],
+        )
+
+    def test_buffer_drops_rows_the_database_refuses(self):
+        """
+        Ensures a row that can never be inserted doesn't hold back the others
+        """
+        bulk_create = OutstandingToken.objects.bulk_create
+
+        def refuse_bad_rows(rows, **kwargs):
+            if any(row.jti == "bad" for row in rows):
+                raise IntegrityError
+            return bulk_create(rows, **kwargs)
+
+        buffer = OutstandingTokenBuffer(size=3, interval=60)
+        self.addCleanup(buffer.flush)
+        with mock.patch.object(
+            OutstandingToken.objects, "bulk_create", side_effect=refuse_bad_rows
+        ), self.assertLogs("apps.authentication.tokens", "ERROR"):
+            for jti in ("a", "bad", "c"):
+                buffer.add(self.outstanding_token(jti))
+        self.assertEqual(buffer.rows, [])
+        self.assertEqual(
+            sorted(OutstandingToken.objects.values_list("jti", flat=True)),
+            ["a", "c"],
+        )
+
+    def test_buffer_is_capped_while_the_database_fails(self):
+        buffer = OutstandingTokenBuffer(size=2, interval=60, max_rows=3)
+        self.addCleanup(buffer.flush)
+        with mock.patch.object(
+            OutstandingToken.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertLogs("apps.authentication.tokens", "ERROR"):
+            for jti in "abcde":
+                buffer.add(self.outstanding_token(jti))
+            # Only the timer retries them
+            self.assertEqual(OutstandingToken.objects.bulk_create.call_count, 2)
+            buffer.flush()
+        self.assertEqual([row.jti for row in buffer.rows], ["c", "d", "e"])
+
+    def outstanding_token(self, jti):
+        return OutstandingToken(
+            user=self.user, jti=jti, token=jti, expires_at=timezone.now()
+        )
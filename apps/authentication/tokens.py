@@ -0,0 +1,151 @@
+"""
+Issuing of the JWT pairs handed out at login.
+
+``RefreshToken.for_user`` inserts an ``OutstandingToken`` for every token it
+mints. ``issue_tokens`` mints a single refresh token, derives its access
+token, and hands the row to ``outstanding_tokens``, which inserts the rows
+of many logins together.
+
+The rows only serve the blacklist, which creates the row of a token it has
+not seen, so a token can be blacklisted before its row is inserted.
+
+Rows that fail to insert are logged and kept for the next flush, unless the
+database refuses them, so a database error never fails the login that
+triggered the flush. Rows still buffered when the process is killed without
+running its ``atexit`` handlers are lost: up to
+``OUTSTANDING_TOKENS_BUFFER_SIZE`` rows, issued in the last
+``OUTSTANDING_TOKENS_FLUSH_INTERVAL`` seconds, or up to ten times as many
+while the database is failing. Their tokens stay valid and can still be
+blacklisted.
+"""
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+logger = logging.getLogger(__name__)
+
+
+class OutstandingTokenBuffer:
+    """
+    Insert ``OutstandingToken`` rows in batches of ``size``, or after
+    ``interval`` seconds, from a timer thread, when fewer rows come in.
+
+    A batch that fails is inserted again row by row, dropping the rows the
+    database refuses, such as the tokens of users deleted in the meantime.
+    While the database fails, rows are only retried by the timer, and at
+    most ``max_rows`` of them are kept, the most recent ones.
+    """
+
+    def __init__(self, size, interval, max_rows=None):
+        self.size = size
+        self.interval = interval
+        self.max_rows = max_rows or size * 10
+        self.rows = []
+        self.lock = threading.Lock()
+        self.timer = None
+        self.retrying = False
+
+    def add(self, row):
+        with self.lock:
+            self.rows.append(row)
+            full = len(self.rows) >= self.size and not self.retrying
+            if not full:
+                self.start_timer()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            rows, self.rows = self.rows, []
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if not rows:
+            return
+        try:
+            self.insert(rows)
+            rows = []
+        except DatabaseError:
+            logger.exception("Could not insert %s outstanding tokens", len(rows))
+            rows = self.insert_each(rows)
+
+        with self.lock:
+            self.retrying = bool(rows)
+            if not rows:
+                return
+            self.rows[:0] = rows
+            dropped = len(self.rows) - self.max_rows
+            if dropped > 0:
+                logger.error("Dropped %s outstanding tokens", dropped)
+                del self.rows[:dropped]
+            self.start_timer()
+
+    def insert(self, rows):
+        # In a savepoint, not to break the transaction of the request
+        with transaction.atomic():
+            # Rows of tokens blacklisted in the meantime already exist
+            OutstandingToken.objects.bulk_create(rows, ignore_conflicts=True)
+
+    def insert_each(self, rows):
+        """
+        Insert ``rows`` one by one, and return the ones to retry, from the
+        first that failed for another reason than the row itself.
+        """
+        for index, row in enumerate(rows):
+            try:
+                self.insert([row])
+            except IntegrityError:
+                logger.exception("Dropped the outstanding token %s", row.jti)
+            except DatabaseError:
+                return rows[index:]
+        return []
+
+    def start_timer(self):
+        if self.timer is None:
+            self.timer = threading.Timer(self.interval, self.flush_later)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush_later(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread has a connection of its own
+            connection.close()
+
+
+outstanding_tokens = OutstandingTokenBuffer(
+    settings.OUTSTANDING_TOKENS_BUFFER_SIZE, settings.OUTSTANDING_TOKENS_FLUSH_INTERVAL
+)
+atexit.register(outstanding_tokens.flush)
+
+
+def issue_tokens(user):
+    """
+    Return a refresh token and its access token for ``user``, encoded
+    """
+    refresh = RefreshToken()
+    user_id = getattr(user, api_settings.USER_ID_FIELD)
+    refresh[api_settings.USER_ID_CLAIM] = (
+        user_id if isinstance(user_id, int) else str(user_id)
+    )
+    encoded = str(refresh)
+    outstanding_tokens.add(
+        OutstandingToken(
+            user=user,
+            jti=refresh[api_settings.JTI_CLAIM],
+            token=encoded,
+            created_at=refresh.current_time,
+            expires_at=datetime_from_epoch(refresh["exp"]),
+        )
+    )
+    return {"refresh": encoded, "access": str(refresh.access_token)}
@@ -1,5 +1,7 @@
 from django.core.mail import EmailMessage
 
+from . import outbox
+
 
 class Util:
     @staticmethod
@@ -7,4 +9,11 @@ class Util:
         email = EmailMessage(
             subject=data.get("subject"), body=data.get("body"), to=[data.get("to")]
         )
-        email.send()
\ No newline at end of file
+        email.send()
+
+    @staticmethod
+    def queue_email(data):
+        """Write the email to the outbox, sent later by drain_outbox"""
+        return outbox.enqueue(
+            subject=data.get("subject"), body=data.get("body"), to=data.get("to")
+        )
@@ -10,6 +10,7 @@ from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
 from django.contrib.sites.shortcuts import get_current_site
+from django.db import transaction
 
 from apps.authentication.models import User
 from .serializers import (
@@ -30,13 +31,14 @@ class RegisterApiView(generics.GenericAPIView):
     serializer_class = RegistrationSerializer
     renderer_classes = (UserRenderer,)
 
+    # The verification email is queued with the user, or not at all
+    @transaction.atomic
     def post(self, request):
         user = request.data
         serializer = self.serializer_class(data=user)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        user = serializer.save()
         user_data = serializer.data
-        user = User.objects.get(email=user_data["email"])
 
         token = RefreshToken.for_user(user=user).access_token
 
@@ -51,7 +53,7 @@ class RegisterApiView(generics.GenericAPIView):
             "subject": "verify your email",
         }
 
-        Util.send_email(data)
+        Util.queue_email(data)
 
         return Response(user_data, status=status.HTTP_201_CREATED)
 
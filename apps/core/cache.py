@@ -0,0 +1,54 @@
+"""
+Generation counters for cache invalidation.
+
+Every model has a counter in the cache that is bumped whenever one of its
+rows changes. Cache keys built from the counters of the models a cached
+value depends on are never looked up again once any of them changes, so
+nothing has to be deleted explicitly. This only holds when every worker
+shares the cache, which ``apps.core.checks`` enforces outside of
+development.
+"""
+
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def _generation_key(model):
+    return f"generation:{model._meta.label_lower}"
+
+
+def _new_generation():
+    # Never restart from a small number after an eviction, which could make
+    # keys of an older generation valid again.
+    return time.time_ns()
+
+
+def get_generations(models):
+    """
+    Return the current generation of each model, in one cache round trip.
+    """
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, _new_generation(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(model):
+    key = _generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _new_generation(), timeout=None)
+
+
+def is_process_local(alias=DEFAULT_CACHE_ALIAS):
+    """
+    Whether the ``alias`` cache keeps its entries in the memory of each
+    process, so that workers don't see each other's writes.
+    """
+    return isinstance(caches[alias], LocMemCache)
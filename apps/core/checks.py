@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .cache import is_process_local
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Refuse a cache local to each process outside of development, as writes
+    would only invalidate the cached responses of the worker handling them.
+    """
+    if settings.DEBUG or not is_process_local():
+        return []
+    return [
+        Error(
+            "The default cache is local to each process, so the other workers "
+            "keep serving stale responses after a write.",
+            hint="Set CACHE_BACKEND and CACHE_LOCATION to a memcached or Redis "
+            "server shared by every worker.",
+            id="core.E001",
+        )
+    ]
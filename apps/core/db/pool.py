@@ -0,0 +1,143 @@
+"""
+A pool of database connections shared by the threads of a process.
+
+``ConnectionPool`` knows nothing of the driver: it opens connections with
+``connect``, tells whether an idle one still works with ``check`` and makes
+a released one ready for reuse with ``reset``. Connections idle for more
+than ``check_after`` seconds are checked before being handed out; those
+idle for more than ``idle_timeout`` seconds or older than ``max_lifetime``
+are closed instead, so the pool shrinks back when the load drops.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    timer = time.monotonic
+
+    def __init__(
+        self,
+        connect,
+        check,
+        reset,
+        max_size=10,
+        timeout=5,
+        idle_timeout=300,
+        max_lifetime=3600,
+        check_after=30,
+    ):
+        self.connect = connect
+        self.check = check
+        self.reset = reset
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        # (connection, released at), the most recently released last
+        self.idle = deque()
+        self.opened_at = {}
+        # Connections being opened, counted so that the pool never overflows
+        self.opening = 0
+        self.condition = threading.Condition()
+
+    @property
+    def size(self):
+        """Number of connections open, idle or in use"""
+        return len(self.opened_at) + self.opening
+
+    def acquire(self):
+        """
+        Return an idle connection, or a new one while the pool is not full,
+        waiting up to ``timeout`` seconds for one to be released otherwise.
+        """
+        deadline = self.timer() + self.timeout
+        while True:
+            with self.condition:
+                connection, released_at = self.take(deadline)
+            if connection is None:
+                return self.open()
+            if self.timer() - released_at < self.check_after or self.check(connection):
+                return connection
+            self.discard(connection)
+
+    def take(self, deadline):
+        """
+        Return an idle connection and when it was released, or ``None`` if a
+        new one may be opened, with the condition held.
+        """
+        while True:
+            now = self.timer()
+            while self.idle:
+                connection, released_at = self.idle.pop()
+                if self.expired(connection, released_at, now):
+                    self.close(connection)
+                    continue
+                return connection, released_at
+            if self.size < self.max_size:
+                self.opening += 1
+                return None, None
+            remaining = deadline - now
+            if remaining <= 0 or not self.condition.wait(remaining):
+                raise PoolTimeout(
+                    f"No connection released within {self.timeout} seconds, "
+                    f"with all {self.max_size} in use"
+                )
+
+    def open(self):
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self.condition:
+                self.opening -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.opening -= 1
+            self.opened_at[connection] = self.timer()
+        return connection
+
+    def expired(self, connection, released_at, now):
+        return (
+            now - released_at > self.idle_timeout
+            or now - self.opened_at[connection] > self.max_lifetime
+        )
+
+    def release(self, connection):
+        """Give a connection back, closing it if it cannot be reused"""
+        try:
+            reusable = self.reset(connection)
+        except Exception:
+            reusable = False
+        if not reusable or self.timer() - self.opened_at[connection] > (
+            self.max_lifetime
+        ):
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append((connection, self.timer()))
+            self.condition.notify()
+
+    def discard(self, connection):
+        """Close a connection taken from the pool, making room for another"""
+        with self.condition:
+            self.close(connection)
+            self.condition.notify()
+
+    def close(self, connection):
+        self.opened_at.pop(connection, None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_idle(self):
+        with self.condition:
+            while self.idle:
+                self.close(self.idle.pop()[0])
@@ -0,0 +1,198 @@
+"""
+PostgreSQL backend taking its connections from a pool of the process.
+
+Closing a connection, which Django does at the end of every request unless
+``CONN_MAX_AGE`` says otherwise, gives it back to the pool instead, so
+requests skip the connection and authentication handshake. The queries a
+pooled connection runs often are prepared on the server (see
+``apps.core.db.prepared``), and stay so as long as it lives.
+
+The pool is configured by the ``POOL`` key of the database settings:
+
+- ``MAX_SIZE``: connections open at most, in use or idle
+- ``TIMEOUT``: seconds to wait for a connection when they are all in use
+- ``IDLE_TIMEOUT``: seconds after which an idle connection is closed
+- ``MAX_LIFETIME``: seconds after which a connection is closed once released
+- ``CHECK_AFTER``: seconds a connection may be idle without being checked
+  before it is reused
+- ``PREPARE_THRESHOLD``: executions of a query after which it is prepared,
+  ``None`` to prepare none
+- ``MAX_PREPARED``: statements kept prepared per connection
+"""
+
+import atexit
+import functools
+import threading
+
+import psycopg2
+import psycopg2.extras
+from psycopg2 import extensions
+
+from django.db.backends.postgresql import base, creation
+from django.utils.functional import cached_property
+
+from ..pool import ConnectionPool, PoolTimeout
+from ..prepared import StatementCache
+
+DEFAULTS = {
+    "MAX_SIZE": 10,
+    "TIMEOUT": 5,
+    "IDLE_TIMEOUT": 300,
+    "MAX_LIFETIME": 3600,
+    "CHECK_AFTER": 30,
+    "PREPARE_THRESHOLD": 5,
+    "MAX_PREPARED": 100,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PreparingCursor(extensions.cursor):
+    """Cursor executing the queries its connection has prepared by name"""
+
+    def execute(self, sql, params=None):
+        statements = self.connection.statements
+        # Named cursors declare their query, which cannot be a statement
+        plan = None if self.name else statements.plan(sql, params)
+        if plan is None:
+            return super().execute(sql, params)
+
+        for deallocate in plan.deallocate:
+            super().execute(deallocate)
+        if plan.prepare and not self.prepare(plan.prepare):
+            statements.reject(sql)
+            return super().execute(sql, params)
+        try:
+            return super().execute(plan.execute, params)
+        except psycopg2.Error:
+            statements.forget(sql)
+            raise
+
+    def prepare(self, sql):
+        """
+        Run a PREPARE, and return whether it succeeded without aborting the
+        transaction it may be in.
+        """
+        in_transaction = (
+            self.connection.get_transaction_status()
+            != extensions.TRANSACTION_STATUS_IDLE
+        )
+        if in_transaction:
+            super().execute("SAVEPOINT prepare_statement")
+        try:
+            super().execute(sql)
+        except psycopg2.Error:
+            if in_transaction:
+                super().execute("ROLLBACK TO SAVEPOINT prepare_statement")
+            return False
+        if in_transaction:
+            super().execute("RELEASE SAVEPOINT prepare_statement")
+        return True
+
+
+class PooledConnection(extensions.connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = PreparingCursor
+        # Replaced once connected, with the options of the pool
+        self.statements = StatementCache(threshold=None)
+
+
+def connect(conn_params, options, pool_options):
+    """Open a connection as the PostgreSQL backend of Django does"""
+    connection = psycopg2.connect(**conn_params, connection_factory=PooledConnection)
+    if "isolation_level" in options:
+        connection.set_session(isolation_level=options["isolation_level"])
+    psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+    connection.statements = StatementCache(
+        pool_options["PREPARE_THRESHOLD"], pool_options["MAX_PREPARED"]
+    )
+    return connection
+
+
+def check(connection):
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor(cursor_factory=extensions.cursor) as cursor:
+            cursor.execute("SELECT 1")
+    except psycopg2.Error:
+        return False
+    return True
+
+
+def reset(connection):
+    """Roll back what a released connection left, if it is still usable"""
+    if connection.closed:
+        return False
+    status = connection.get_transaction_status()
+    if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    if status != extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+    return True
+
+
+def get_pool(alias, settings_dict, conn_params):
+    key = (alias, settings_dict["HOST"], settings_dict["PORT"], settings_dict["NAME"])
+    with _pools_lock:
+        if key not in _pools:
+            options = {**DEFAULTS, **settings_dict.get("POOL", {})}
+            _pools[key] = ConnectionPool(
+                functools.partial(
+                    connect, conn_params, settings_dict["OPTIONS"], options
+                ),
+                check,
+                reset,
+                max_size=options["MAX_SIZE"],
+                timeout=options["TIMEOUT"],
+                idle_timeout=options["IDLE_TIMEOUT"],
+                max_lifetime=options["MAX_LIFETIME"],
+                check_after=options["CHECK_AFTER"],
+            )
+        return _pools[key]
+
+
+@atexit.register
+def close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_idle()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # The test database cannot be dropped while connected to
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @cached_property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict, self.get_connection_params())
+
+    @base.async_unsafe
+    def get_new_connection(self, conn_params):
+        try:
+            connection = self.pool.acquire()
+        except PoolTimeout as error:
+            raise base.Database.OperationalError(str(error)) from error
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django keeps using it until the block exits, so it cannot
+                # be handed to another thread
+                self.pool.discard(self.connection)
+            else:
+                self.pool.release(self.connection)
@@ -0,0 +1,130 @@
+"""
+Server-side prepared statements for the queries a connection runs often.
+
+The ORM sends every query as text, which PostgreSQL parses and plans anew
+each time. ``StatementCache`` counts the queries of a connection by their
+SQL and, once one has run ``threshold`` times, has it prepared and then
+executed by name, like psycopg 3 does. Only the ``max_size`` most recently
+used statements are kept prepared, the others are deallocated.
+
+Only reads with positional parameters are prepared; they are what the list
+and detail views run on every request. Queries that fail to prepare are
+remembered, up to ``max_size * 4`` of them, and run as is.
+"""
+
+import re
+from collections import OrderedDict
+
+PLACEHOLDER = re.compile(r"%%|%s")
+
+
+def to_prepare_sql(sql, params):
+    """
+    Return ``sql`` with its ``%s`` placeholders numbered as PostgreSQL
+    expects, and how many there are
+    """
+    if params is None:
+        # Not interpolated by the driver, so % signs are not escaped
+        return sql, 0
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group() == "%%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return PLACEHOLDER.sub(replace, sql), count
+
+
+def is_preparable(sql, params):
+    return (
+        (params is None or isinstance(params, (list, tuple)))
+        and sql.lstrip()[:6].upper() == "SELECT"
+        and "%(" not in sql
+    )
+
+
+class Plan:
+    """
+    What to run for a query: ``deallocate`` statements evicted from the
+    cache, ``prepare`` when it is not prepared yet, then ``execute``.
+    """
+
+    def __init__(self, execute, prepare=None, deallocate=()):
+        self.execute = execute
+        self.prepare = prepare
+        self.deallocate = deallocate
+
+
+class StatementCache:
+    def __init__(self, threshold=5, max_size=100, prefix="django_"):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.prefix = prefix
+        self.counts = OrderedDict()
+        # SQL to the name of its statement, the most recently used last
+        self.prepared = OrderedDict()
+        # SQL that could not be prepared, the most recently seen last
+        self.rejected = OrderedDict()
+        self.sequence = 0
+
+    def plan(self, sql, params):
+        """
+        Return the ``Plan`` of a query once it should run prepared, and
+        ``None`` while it should run as is.
+        """
+        name = self.prepared.get(sql)
+        if name is not None:
+            self.prepared.move_to_end(sql)
+            return Plan(self.execute_sql(name, params))
+        if self.threshold is None:
+            return None
+        if sql in self.rejected:
+            self.rejected.move_to_end(sql)
+            return None
+        if not is_preparable(sql, params):
+            return None
+
+        count = self.counts.pop(sql, 0) + 1
+        if count < self.threshold:
+            self.counts[sql] = count
+            # Forget the queries that stopped running first
+            while len(self.counts) > self.max_size * 4:
+                self.counts.popitem(last=False)
+            return None
+
+        self.sequence += 1
+        name = f"{self.prefix}{self.sequence}"
+        self.prepared[sql] = name
+        deallocate = []
+        while len(self.prepared) > self.max_size:
+            deallocate.append(f"DEALLOCATE {self.prepared.popitem(last=False)[1]}")
+        prepare_sql, _ = to_prepare_sql(sql, params)
+        return Plan(
+            self.execute_sql(name, params),
+            prepare=f"PREPARE {name} AS {prepare_sql}",
+            deallocate=deallocate,
+        )
+
+    def execute_sql(self, name, params):
+        if not params:
+            return f"EXECUTE {name}"
+        return "EXECUTE {} ({})".format(name, ", ".join(["%s"] * len(params)))
+
+    def reject(self, sql):
+        """Run ``sql`` as is from now on, as it could not be prepared"""
+        self.forget(sql)
+        self.rejected[sql] = None
+        while len(self.rejected) > self.max_size * 4:
+            self.rejected.popitem(last=False)
+
+    def forget(self, sql):
+        """
+        Stop using the statement of ``sql``, which is left on the server
+        until the connection closes, as it may not be deallocated in an
+        aborted transaction
+        """
+        self.prepared.pop(sql, None)
+        self.counts.pop(sql, None)
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.media import delete_files, find_orphans
+
+
+class Command(BaseCommand):
+    help = "Delete the uploaded files and thumbnails that no row refers to"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the orphaned files",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            help="Keep files modified in the last seconds "
+            "(default: MEDIA_GC_MIN_AGE)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of files deleted per batch",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Number of files deleted concurrently",
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        batch = []
+        for name in find_orphans(min_age=options["min_age"]):
+            count += 1
+            if options["dry_run"] or options["verbosity"] > 1:
+                self.stdout.write(name)
+            if options["dry_run"]:
+                continue
+            batch.append(name)
+            if len(batch) >= options["batch_size"]:
+                delete_files(batch, workers=options["workers"])
+                batch = []
+        if batch:
+            delete_files(batch, workers=options["workers"])
+
+        verb = "would be deleted" if options["dry_run"] else "deleted"
+        self.stdout.write(self.style.SUCCESS(f"{count} orphaned files {verb}."))
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.thumbnails import (
+    create_executor,
+    generate_missing,
+    is_pending,
+    iter_spec_fields,
+    source_exists,
+)
+
+
+class Command(BaseCommand):
+    help = "Render the missing thumbnails of every image spec field in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Number of worker processes (default: one per core)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of thumbnails submitted to the workers at once",
+        )
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="Only report the missing and pending thumbnails",
+        )
+
+    def iter_missing(self, model, spec_field, source_field):
+        instances = model.objects.only(model._meta.pk.name, source_field)
+        for instance in instances.iterator():
+            file = getattr(instance, spec_field)
+            if source_exists(file) and not file.storage.exists(file.name):
+                yield file
+
+    def handle(self, *args, **options):
+        if options["status"]:
+            for model, spec_field, source_field in iter_spec_fields():
+                label = f"{model._meta.label}.{spec_field}"
+                missing = list(self.iter_missing(model, spec_field, source_field))
+                pending = sum(1 for file in missing if is_pending(file))
+                self.stdout.write(f"{label}: {len(missing)} missing, {pending} pending")
+            return
+
+        # One pool for the whole run: starting workers, and Django in each of
+        # them, costs more than rendering a small batch
+        with create_executor(options["workers"]) as executor:
+            for model, spec_field, source_field in iter_spec_fields():
+                self.generate(executor, model, spec_field, source_field, options)
+
+    def generate(self, executor, model, spec_field, source_field, options):
+        label = f"{model._meta.label}.{spec_field}"
+        generated = failed = 0
+        batch = []
+        for file in self.iter_missing(model, spec_field, source_field):
+            batch.append(file)
+            if len(batch) >= options["batch_size"]:
+                failed += generate_missing(batch, executor)
+                generated += len(batch)
+                batch = []
+                self.stdout.write(f"{label}: {generated} generated")
+        if batch:
+            failed += generate_missing(batch, executor)
+            generated += len(batch)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: {generated - failed} generated, {failed} failed."
+            )
+        )
@@ -0,0 +1,98 @@
+"""
+Garbage collection of uploaded files no row refers to anymore.
+
+Queryset deletes, cascades and renames leave the files of the affected rows
+behind. ``find_orphans`` diffs the files under ``MEDIA_GC_PREFIXES`` against
+the names stored in every file field, read with one streaming query per
+model, and ``delete_files`` removes them in parallel.
+
+The thumbnails imagekit renders under ``IMAGEKIT_CACHEFILE_DIR`` are named
+after their source, and are orphans when their source is no longer
+referenced.
+"""
+
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+from django.utils import timezone
+
+
+def walk(storage, directory):
+    """Yield the name of every file under ``directory``, recursively"""
+    if not storage.exists(directory):
+        return
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for name in directories:
+        yield from walk(storage, posixpath.join(directory, name))
+
+
+def referenced_names(prefixes):
+    """
+    Return the names stored in the file fields of every model that start
+    with one of ``prefixes``.
+    """
+    names = set()
+    for model in apps.get_models():
+        fields = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if isinstance(field, models.FileField)
+        ]
+        if not fields:
+            continue
+        rows = model._base_manager.values_list(*fields).iterator(chunk_size=5000)
+        for row in rows:
+            names.update(name for name in row if name and name.startswith(prefixes))
+    return names
+
+
+def find_orphans(storage=default_storage, prefixes=None, min_age=None):
+    """
+    Yield the files under ``prefixes`` and their thumbnails that no row
+    refers to.
+
+    Files are listed before the rows are read, and files younger than
+    ``min_age`` are kept, so an upload whose row is not committed yet is not
+    taken for an orphan.
+    """
+    prefixes = tuple(prefixes or settings.MEDIA_GC_PREFIXES)
+    min_age = timedelta(
+        seconds=settings.MEDIA_GC_MIN_AGE if min_age is None else min_age
+    )
+    cache_dir = settings.IMAGEKIT_CACHEFILE_DIR
+    candidates = [
+        name
+        for prefix in prefixes
+        for directory in (prefix, posixpath.join(cache_dir, prefix))
+        for name in walk(storage, directory.rstrip("/"))
+    ]
+
+    referenced = referenced_names(prefixes)
+    # source_name_as_path names thumbnails <cache dir>/<source stem>/<hash>
+    referenced_stems = {
+        posixpath.join(cache_dir, os.path.splitext(name)[0]) for name in referenced
+    }
+    limit = timezone.now() - min_age
+    for name in candidates:
+        if name.startswith(cache_dir + "/"):
+            if posixpath.dirname(name) in referenced_stems:
+                continue
+        elif name in referenced:
+            continue
+        if storage.get_modified_time(name) > limit:
+            continue
+        yield name
+
+
+def delete_files(names, storage=default_storage, workers=8):
+    """Delete ``names`` from the storage with a pool of threads"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(storage.delete, names))
@@ -0,0 +1,26 @@
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.checks import check_shared_cache
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+FILE_BASED = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/tmp/drones-cache",
+    }
+}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(DEBUG=False, CACHES=LOCMEM)
+    def test_process_local_cache_is_refused(self):
+        errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ["core.E001"])
+
+    @override_settings(DEBUG=True, CACHES=LOCMEM)
+    def test_process_local_cache_is_allowed_in_development(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(DEBUG=False, CACHES=FILE_BASED)
+    def test_shared_cache_is_allowed(self):
+        self.assertEqual(check_shared_cache(None), [])
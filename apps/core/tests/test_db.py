@@ -0,0 +1,142 @@
+import unittest
+
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+
+from apps.core.db.pool import ConnectionPool, PoolTimeout
+from apps.core.db.prepared import StatementCache, to_prepare_sql
+
+POOLED = connection.settings_dict["ENGINE"] == "apps.core.db.postgresql"
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.usable = True
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.now = 0
+        self.pool = ConnectionPool(
+            FakeConnection,
+            check=lambda connection: connection.usable,
+            reset=lambda connection: not connection.closed,
+            max_size=2,
+            timeout=0,
+            idle_timeout=300,
+            max_lifetime=3600,
+            check_after=30,
+        )
+        self.pool.timer = lambda: self.now
+
+    def test_released_connections_are_reused(self):
+        first = self.pool.acquire()
+        self.pool.release(first)
+        self.assertIs(self.pool.acquire(), first)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_size_is_bounded(self):
+        self.pool.acquire()
+        second = self.pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire()
+
+        self.pool.discard(second)
+        self.assertIsNot(self.pool.acquire(), second)
+
+    def test_idle_connections_are_checked_then_closed(self):
+        first = self.pool.acquire()
+        self.pool.release(first)
+        self.now = 60
+        first.usable = False
+        replacement = self.pool.acquire()
+        self.assertIsNot(replacement, first)
+        self.assertTrue(first.closed)
+
+        self.pool.release(replacement)
+        self.now = 600
+        self.assertIsNot(self.pool.acquire(), replacement)
+        self.assertTrue(replacement.closed)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_old_or_broken_connections_are_not_kept(self):
+        first = self.pool.acquire()
+        first.closed = True
+        self.pool.release(first)
+        self.assertEqual(self.pool.size, 0)
+
+        second = self.pool.acquire()
+        self.now = 4000
+        self.pool.release(second)
+        self.assertTrue(second.closed)
+        self.assertEqual(self.pool.size, 0)
+
+
+class StatementCacheTests(SimpleTestCase):
+    sql = "SELECT name FROM drones_drone WHERE id = %s AND name LIKE '%%a'"
+
+    def test_placeholders(self):
+        self.assertEqual(
+            to_prepare_sql(self.sql, [1, 2]),
+            ("SELECT name FROM drones_drone WHERE id = $1 AND name LIKE '%a'", 1),
+        )
+        self.assertEqual(to_prepare_sql("SELECT '%'", None), ("SELECT '%'", 0))
+
+    def test_queries_are_prepared_past_the_threshold(self):
+        statements = StatementCache(threshold=2, max_size=1)
+        self.assertIsNone(statements.plan(self.sql, [1]))
+        plan = statements.plan(self.sql, [1])
+        self.assertEqual(plan.prepare.split(" AS ")[0], "PREPARE django_1")
+        self.assertEqual(plan.execute, "EXECUTE django_1 (%s)")
+
+        plan = statements.plan(self.sql, [2])
+        self.assertIsNone(plan.prepare)
+        self.assertEqual(plan.execute, "EXECUTE django_1 (%s)")
+
+        statements.plan("SELECT 1", None)
+        plan = statements.plan("SELECT 1", None)
+        self.assertEqual(plan.execute, "EXECUTE django_2")
+        self.assertEqual(plan.deallocate, ["DEALLOCATE django_1"])
+
+    def test_writes_and_rejected_queries_are_not_prepared(self):
+        statements = StatementCache(threshold=1)
+        self.assertIsNone(statements.plan("UPDATE drones_drone SET name = %s", ["a"]))
+        statements.reject(self.sql)
+        self.assertIsNone(statements.plan(self.sql, [1]))
+
+    def test_rejected_queries_are_bounded(self):
+        statements = StatementCache(threshold=1, max_size=1)
+        statements.reject(self.sql)
+        for index in range(4):
+            statements.reject(f"SELECT {index}")
+        self.assertEqual(len(statements.rejected), 4)
+        self.assertIsNotNone(statements.plan(self.sql, [1]))
+
+
+@unittest.skipUnless(POOLED, "Requires the pooled PostgreSQL backend")
+class PooledBackendTests(TransactionTestCase):
+    def backend_pid(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            return cursor.fetchone()[0]
+
+    def test_connections_are_reused(self):
+        pid = self.backend_pid()
+        connection.close()
+        self.assertEqual(self.backend_pid(), pid)
+
+    def test_hot_queries_are_prepared(self):
+        for _ in range(10):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT %s + 1", [1])
+                self.assertEqual(cursor.fetchone()[0], 2)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_prepared_statements WHERE statement LIKE %s",
+                ["%SELECT $1 + 1%"],
+            )
+            self.assertEqual(cursor.fetchone()[0], 1)
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones.models import Drone, DroneCategory
+
+
+class DeleteOrphanedMediaTests(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+        owner = User.objects.create_user(
+            email="owner@example.com", username="owner", password="p@assw0rd"
+        )
+        Drone.objects.create(
+            name="Skipper",
+            picture="drones/Skipper.png",
+            category=DroneCategory.objects.create(name="Racers"),
+            owner=owner,
+            manufacturing_date=timezone.now(),
+        )
+        self.files = {
+            "drones/Skipper.png": True,
+            "CACHE/images/drones/Skipper/abc.png": True,
+            "drones/Gone.png": False,
+            "CACHE/images/drones/Gone/abc.png": False,
+            "pilots/Gone.png": False,
+            "drone.png": True,
+        }
+        for name in self.files:
+            self.write(name, age=7200)
+
+    def write(self, name, age):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(b"picture")
+        modified = time.time() - age
+        os.utime(path, (modified, modified))
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.media_root, name))
+
+    def test_dry_run(self):
+        """
+        Ensure a dry run lists the orphans and deletes nothing
+        """
+        stdout = StringIO()
+        call_command("delete_orphaned_media", "--dry-run", stdout=stdout)
+        output = stdout.getvalue()
+        for name, referenced in self.files.items():
+            self.assertEqual(name in output, not referenced, name)
+            self.assertTrue(self.exists(name))
+        self.assertIn("3 orphaned files would be deleted", output)
+
+    def test_delete_orphans(self):
+        """
+        Ensure only old files that no row refers to are deleted
+        """
+        self.write("avatars/2021/01/01/recent.png", age=0)
+        call_command("delete_orphaned_media", "--batch-size", "2", stdout=StringIO())
+        for name, referenced in self.files.items():
+            self.assertEqual(self.exists(name), referenced, name)
+        self.assertTrue(self.exists("avatars/2021/01/01/recent.png"))
@@ -0,0 +1,91 @@
+import io
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from PIL import Image
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.core import thumbnails
+from apps.drones.models import Pilot
+
+
+def make_picture(name="pilot.png"):
+    content = io.BytesIO()
+    Image.new("RGB", (1024, 768), "navy").save(content, "PNG")
+    return SimpleUploadedFile(name, content.getvalue(), "image/png")
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def wait_for_workers(self):
+        thumbnails.get_executor().shutdown(wait=True)
+        thumbnails._executor = None
+
+    def test_saving_a_picture_enqueues_its_thumbnail(self):
+        """
+        Ensure the thumbnail is rendered by the pool once the save is committed
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            pilot = Pilot.objects.create(
+                name="Penelope", races_count=1, picture=make_picture()
+            )
+            thumbnail = pilot.picture_thumbnail
+            self.assertFalse(thumbnail.storage.exists(thumbnail.name))
+        self.wait_for_workers()
+
+        self.assertTrue(thumbnail.storage.exists(thumbnail.name))
+        self.assertFalse(thumbnails.is_pending(thumbnail))
+        with Image.open(thumbnail.storage.path(thumbnail.name)) as image:
+            self.assertEqual(image.size, (728, 250))
+
+    def test_backfill(self):
+        """
+        Ensure the command reports and renders the missing thumbnails
+        """
+        pilot = Pilot.objects.create(
+            name="Penelope", races_count=1, picture=make_picture()
+        )
+        Pilot.objects.create(name="Pablo", races_count=1)
+        stdout = StringIO()
+        call_command("generate_thumbnails", "--status", stdout=stdout)
+        self.assertIn("drones.Pilot.picture_thumbnail: 1 missing", stdout.getvalue())
+
+        call_command("generate_thumbnails", "--workers", "1", stdout=StringIO())
+        thumbnail = Pilot.objects.get(pk=pilot.pk).picture_thumbnail
+        self.assertTrue(thumbnail.storage.exists(thumbnail.name))
+
+    def test_backfill_uses_one_pool(self):
+        """
+        Ensure every batch of the command is rendered by the same workers
+        """
+        pilots = [
+            Pilot.objects.create(name=name, races_count=1, picture=make_picture())
+            for name in ("Penelope", "Pablo")
+        ]
+        with mock.patch(
+            "apps.core.management.commands.generate_thumbnails.create_executor",
+            wraps=thumbnails.create_executor,
+        ) as create_executor:
+            call_command(
+                "generate_thumbnails",
+                "--workers",
+                "1",
+                "--batch-size",
+                "1",
+                stdout=StringIO(),
+            )
+        create_executor.assert_called_once_with(1)
+        for pilot in Pilot.objects.filter(pk__in=[pilot.pk for pilot in pilots]):
+            thumbnail = pilot.picture_thumbnail
+            self.assertTrue(thumbnail.storage.exists(thumbnail.name))
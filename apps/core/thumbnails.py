@@ -0,0 +1,132 @@
+"""
+Thumbnail generation off the request path.
+
+``ProcessPool`` is an imagekit cache file backend rendering spec files in a
+pool of worker processes, so the PIL decode, resize and encode neither block
+nor share the GIL of the web worker. ``GenerateOnSave`` enqueues them as
+soon as their source is saved, once the transaction is committed.
+
+While a thumbnail is rendered its state is ``generating``; ``is_pending``
+tells so without touching the storage.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from imagekit.cachefiles.backends import BaseAsync, CacheFileState
+from imagekit.cachefiles.strategies import JustInTime
+from imagekit.models.fields.utils import ImageSpecFileDescriptor
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _init_worker():
+    # Workers started with "spawn" do not inherit the configured project
+    django.setup()
+
+
+def _generate_file(file):
+    file.cachefile_backend.generate_now(file, force=True)
+
+
+def create_executor(workers=None):
+    """
+    Return a pool of ``workers`` processes, one per core by default, set up
+    to render spec files.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(), initializer=_init_worker
+    )
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = create_executor(settings.THUMBNAIL_WORKERS)
+    return _executor
+
+
+def iter_spec_fields():
+    """
+    Yield ``(model, spec field name, source field name)`` for every
+    ``ImageSpecField`` of the project.
+    """
+    for model in apps.get_models():
+        for name, attribute in vars(model).items():
+            if isinstance(attribute, ImageSpecFileDescriptor):
+                yield model, name, attribute.source_field_name
+
+
+def source_exists(file):
+    source = file.generator.source
+    return bool(source) and source.storage.exists(source.name)
+
+
+def is_pending(file):
+    backend = file.cachefile_backend
+    state = backend.get_state(file, check_if_unknown=False)
+    return state == CacheFileState.GENERATING
+
+
+class ProcessPool(BaseAsync):
+    """
+    Render spec files in the processes of ``get_executor()``.
+
+    The state is kept by the submitting process, which is the one serving
+    the requests, as worker processes may not share its cache.
+    """
+
+    def schedule_generation(self, file, force=False):
+        if not source_exists(file):
+            return
+        self.set_state(file, CacheFileState.GENERATING)
+        future = get_executor().submit(_generate_file, file)
+        future.add_done_callback(lambda future: self.generation_done(file, future))
+        return future
+
+    def generation_done(self, file, future):
+        if future.exception() is None:
+            self.set_state(file, CacheFileState.EXISTS)
+        else:
+            logger.error(
+                "Could not generate %s", file.name, exc_info=future.exception()
+            )
+            self.set_state(file, CacheFileState.DOES_NOT_EXIST)
+
+
+class GenerateOnSave(JustInTime):
+    """
+    Enqueue spec files when their source is saved, and when they are needed
+    and missing, like ``JustInTime``.
+    """
+
+    def on_source_saved(self, file):
+        # Render again even if a thumbnail exists: the source has changed
+        transaction.on_commit(
+            lambda: file.cachefile_backend.schedule_generation(file, force=True)
+        )
+
+
+def generate_missing(files, executor):
+    """
+    Render ``files`` in the processes of ``executor``, wait for them and
+    return how many failed.
+    """
+    failures = 0
+    futures = {executor.submit(_generate_file, file): file for file in files}
+    for future, file in futures.items():
+        if future.exception() is None:
+            file.cachefile_backend.set_state(file, CacheFileState.EXISTS)
+        else:
+            failures += 1
+            logger.error(
+                "Could not generate %s", file.name, exc_info=future.exception()
+            )
+    return failures
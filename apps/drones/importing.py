@@ -0,0 +1,229 @@
+"""
+Bulk import of categories, drones and pilots from CSV or JSON lines files.
+
+Records are read lazily and handled in batches: the categories and owners
+a batch refers to are resolved with one query each, records whose name
+already exists are skipped, and the rest are inserted in one transaction
+per batch, with ``COPY`` on Postgres and ``bulk_create`` elsewhere. Since
+existing names are skipped, an interrupted import can safely be resumed
+from the last committed batch.
+"""
+
+import csv
+import datetime
+import io
+import json
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.cache import bump_generation
+from .models import Drone, DroneCategory, Pilot
+
+
+def read_records(path):
+    """
+    Yield the records of a ``.csv`` file, or of a JSON lines file with any
+    other extension, as dicts.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            yield from csv.DictReader(file)
+            return
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield exc
+
+
+def _copy_value(value):
+    if value is None:
+        return r"\N"
+    return value
+
+
+def copy_insert(model, instances):
+    """
+    Insert ``instances`` with a single ``COPY``, which skips the per-row
+    overhead of ``INSERT`` on Postgres.
+    """
+    fields = model._meta.concrete_fields
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for instance in instances:
+        writer.writerow(
+            _copy_value(
+                field.get_db_prep_save(field.pre_save(instance, True), connection)
+            )
+            for field in fields
+        )
+    buffer.seek(0)
+    sql = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')".format(
+        connection.ops.quote_name(model._meta.db_table),
+        ", ".join(connection.ops.quote_name(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+
+class Importer:
+    """
+    Import records of ``model``, reading the ``columns`` model fields.
+    """
+
+    model = None
+    columns = ()
+
+    def __init__(self, batch_size=5000, use_copy=True):
+        self.batch_size = batch_size
+        self.use_copy = use_copy and connection.vendor == "postgresql"
+        self.created = 0
+        self.existing = 0
+        self.errors = []
+
+    def clean(self, record):
+        """Return the model field values of a record"""
+        values = {}
+        for name in self.columns:
+            field = self.model._meta.get_field(name)
+            value = record.get(name)
+            if value in (None, "") and field.has_default():
+                continue
+            value = field.clean(value, None)
+            if isinstance(value, datetime.datetime) and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            values[name] = value
+        return values
+
+    def resolve(self, records):
+        """Load the objects a batch of records refers to"""
+
+    def build(self, record):
+        return self.model(**self.clean(record))
+
+    def insert(self, instances):
+        if self.use_copy:
+            copy_insert(self.model, instances)
+        else:
+            self.model.objects.bulk_create(instances, batch_size=self.batch_size)
+
+    def import_batch(self, records, first_number):
+        """
+        Import a batch of records, numbered from ``first_number`` in the
+        error messages.
+        """
+        valid = [record for record in records if isinstance(record, dict)]
+        self.resolve(valid)
+
+        instances = {}
+        built = 0
+        for number, record in enumerate(records, first_number):
+            try:
+                if not isinstance(record, dict):
+                    raise ValidationError(str(record))
+                instance = self.build(record)
+            except ValidationError as exc:
+                self.errors.append((number, "; ".join(exc.messages)))
+                continue
+            built += 1
+            # The first record wins over the later ones of the same name
+            instances.setdefault(instance.name, instance)
+
+        existing = set(
+            self.model.objects.filter(name__in=instances).values_list("name", flat=True)
+        )
+        new = [instance for name, instance in instances.items() if name not in existing]
+        with transaction.atomic():
+            self.insert(new)
+        bump_generation(self.model)
+        self.created += len(new)
+        self.existing += built - len(instances) + len(existing)
+
+    def run(self, records, skip=0, on_batch=None):
+        """
+        Import the records after the first ``skip`` ones, calling
+        ``on_batch`` with the number of records handled after each batch.
+        """
+        batch = []
+        number = 0
+        for number, record in enumerate(records, 1):
+            if number <= skip:
+                continue
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self.import_batch(batch, number - len(batch) + 1)
+                batch = []
+                if on_batch:
+                    on_batch(number)
+        if batch:
+            self.import_batch(batch, number - len(batch) + 1)
+            if on_batch:
+                on_batch(number)
+
+
+class CategoryImporter(Importer):
+    model = DroneCategory
+    columns = ("name",)
+
+
+class PilotImporter(Importer):
+    model = Pilot
+    columns = ("name", "gender", "races_count", "picture")
+
+
+class DroneImporter(Importer):
+    """
+    Drones refer to their category and owner by name; missing categories
+    are created, missing owners make the record invalid.
+    """
+
+    model = Drone
+    columns = ("name", "manufacturing_date", "has_it_competed", "picture")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.categories = {}
+        self.owners = {}
+
+    def resolve(self, records):
+        names = {record.get("category") for record in records} - {None, ""}
+        names -= set(self.categories)
+        if names:
+            DroneCategory.objects.bulk_create(
+                [DroneCategory(name=name) for name in names], ignore_conflicts=True
+            )
+            bump_generation(DroneCategory)
+            self.categories.update(
+                DroneCategory.objects.filter(name__in=names).values_list("name", "pk")
+            )
+
+        usernames = {record.get("owner") for record in records} - {None, ""}
+        usernames -= set(self.owners)
+        if usernames:
+            self.owners.update(
+                get_user_model()
+                .objects.filter(username__in=usernames)
+                .values_list("username", "pk")
+            )
+
+    def build(self, record):
+        instance = super().build(record)
+        for name, ids in (("category", self.categories), ("owner", self.owners)):
+            if record.get(name) not in ids:
+                raise ValidationError(f"Unknown {name} {record.get(name)!r}.")
+        instance.category_id = self.categories[record["category"]]
+        instance.owner_id = self.owners[record["owner"]]
+        return instance
+
+
+IMPORTERS = {
+    "categories": CategoryImporter,
+    "drones": DroneImporter,
+    "pilots": PilotImporter,
+}
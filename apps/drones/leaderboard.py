@@ -0,0 +1,268 @@
+"""
+Incrementally maintained leaderboards of best competition distances.
+
+Every pilot and every drone has at most one ``LeaderboardEntry`` per board,
+holding its best competition. No position is stored: a write only inserts,
+updates or deletes the entry of its subject, whatever the size of the
+board. Ranks are computed when read, from the ranking index on ``(board,
+-distance_in_feet, distance_achievement_date, subject_id)``:
+
+* the rank of a subject counts the index entries ranked before it;
+* ranks ``first`` to ``last`` skip the ``first - 1`` entries before them;
+* the size of a board counts its index entries.
+
+Reads are index-only scans of at most the size of the board (the rank, for
+the first two), never a sort or a table scan.
+
+Boards:
+
+* ``pilots``: best distance of each pilot
+* ``drones``: best distance of each drone
+* ``category:<uuid>``: best distance of each drone of a category
+"""
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Competition, Drone, LeaderboardEntry, Pilot
+
+PILOTS_BOARD = "pilots"
+DRONES_BOARD = "drones"
+CATEGORY_BOARD_PREFIX = "category:"
+
+# Best first; ties go to the earliest achievement, then to the lowest id.
+RANKING = ("-distance_in_feet", "distance_achievement_date")
+
+
+def category_board(category_id):
+    return f"{CATEGORY_BOARD_PREFIX}{category_id}"
+
+
+def get_subject_model(board):
+    return Pilot if board == PILOTS_BOARD else Drone
+
+
+def _lock_subject(board, subject_id):
+    """
+    Serialize writers of the entry of ``subject_id`` on ``board`` for the
+    rest of the transaction, so that concurrent refreshes cannot both insert
+    it.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(hashtext(%s))", [f"{board}:{subject_id}"]
+            )
+
+
+def _ranked_before(distance_in_feet, distance_achievement_date, subject_id):
+    return (
+        Q(distance_in_feet__gt=distance_in_feet)
+        | Q(
+            distance_in_feet=distance_in_feet,
+            distance_achievement_date__lt=distance_achievement_date,
+        )
+        | Q(
+            distance_in_feet=distance_in_feet,
+            distance_achievement_date=distance_achievement_date,
+            subject_id__lt=subject_id,
+        )
+    )
+
+
+def _rank_of(entry):
+    """
+    Rank of ``entry`` on its board, counted from the ranking index.
+    """
+    ranked_before = LeaderboardEntry.objects.filter(board=entry.board).filter(
+        _ranked_before(
+            entry.distance_in_feet, entry.distance_achievement_date, entry.subject_id
+        )
+    )
+    return ranked_before.count() + 1
+
+
+def set_best(board, subject_id, best):
+    """
+    Set the best competition of ``subject_id`` on ``board``, or remove it
+    when ``best`` is ``None``.
+
+    ``best`` is a ``(competition_id, distance_in_feet,
+    distance_achievement_date)`` tuple.
+    """
+    with transaction.atomic():
+        _lock_subject(board, subject_id)
+        entry = LeaderboardEntry.objects.filter(
+            board=board, subject_id=subject_id
+        ).first()
+
+        if best is None:
+            if entry is not None:
+                entry.delete()
+            return
+
+        if entry is None:
+            entry = LeaderboardEntry(board=board, subject_id=subject_id)
+        elif best == (
+            entry.competition_id,
+            entry.distance_in_feet,
+            entry.distance_achievement_date,
+        ):
+            return
+        (
+            entry.competition_id,
+            entry.distance_in_feet,
+            entry.distance_achievement_date,
+        ) = best
+        entry.save()
+
+
+def get_best(**filters):
+    return (
+        Competition.objects.filter(**filters)
+        .order_by(*RANKING, "pk")
+        .values_list("pk", "distance_in_feet", "distance_achievement_date")
+        .first()
+    )
+
+
+def refresh_pilot(pilot_id):
+    set_best(PILOTS_BOARD, pilot_id, get_best(pilot_id=pilot_id))
+
+
+def refresh_drone(drone_id):
+    """
+    Update the drone on the drones board and on the board of its category,
+    removing it from any board of a category it no longer belongs to.
+    """
+    best = get_best(drone_id=drone_id)
+    set_best(DRONES_BOARD, drone_id, best)
+
+    category_id = (
+        Drone.objects.filter(pk=drone_id).values_list("category_id", flat=True).first()
+    )
+    current_board = category_board(category_id) if category_id else None
+    stale_boards = (
+        LeaderboardEntry.objects.filter(
+            board__startswith=CATEGORY_BOARD_PREFIX, subject_id=drone_id
+        )
+        .exclude(board=current_board)
+        .values_list("board", flat=True)
+    )
+    for board in list(stale_boards):
+        set_best(board, drone_id, None)
+    if current_board:
+        set_best(current_board, drone_id, best)
+
+
+def refresh_many(pilot_ids, drone_ids, rebuild_threshold=500):
+    """
+    Refresh the given pilots and drones, or rebuild every board when there
+    are so many of them that streaming all competitions once is cheaper.
+    """
+    if len(pilot_ids) + len(drone_ids) > rebuild_threshold:
+        rebuild()
+        return
+    for pilot_id in pilot_ids:
+        refresh_pilot(pilot_id)
+    for drone_id in drone_ids:
+        refresh_drone(drone_id)
+
+
+def read_range(board, first, last):
+    """
+    Return the entries ranked ``first`` to ``last`` (inclusive), with their
+    ``rank`` and their pilot or drone as ``subject``.
+    """
+    entries = list(LeaderboardEntry.objects.filter(board=board)[first - 1 : last])
+    for rank, entry in enumerate(entries, first):
+        entry.rank = rank
+    attach_subjects(board, entries)
+    return entries
+
+
+def read_rank(board, subject_id):
+    entry = LeaderboardEntry.objects.filter(board=board, subject_id=subject_id).first()
+    if entry is not None:
+        entry.rank = _rank_of(entry)
+        attach_subjects(board, [entry])
+    return entry
+
+
+def board_size(board):
+    """
+    Number of entries of the board, counted from the ranking index.
+    """
+    return LeaderboardEntry.objects.filter(board=board).count()
+
+
+def attach_subjects(board, entries):
+    subjects = (
+        get_subject_model(board)
+        .objects.only("pk", "name")
+        .in_bulk([entry.subject_id for entry in entries])
+    )
+    for entry in entries:
+        entry.subject = subjects.get(entry.subject_id)
+
+
+def _rebuild_board(rows, board_for_row, subject_for_row, batch_size):
+    batch = []
+    seen = set()
+    for row in rows:
+        board = board_for_row(row)
+        subject_id = subject_for_row(row)
+        if (board, subject_id) in seen:
+            continue
+        seen.add((board, subject_id))
+        batch.append(
+            LeaderboardEntry(
+                board=board,
+                subject_id=subject_id,
+                competition_id=row["pk"],
+                distance_in_feet=row["distance_in_feet"],
+                distance_achievement_date=row["distance_achievement_date"],
+            )
+        )
+        if len(batch) >= batch_size:
+            LeaderboardEntry.objects.bulk_create(batch)
+            batch = []
+    LeaderboardEntry.objects.bulk_create(batch)
+
+
+def rebuild(batch_size=1000):
+    """
+    Recompute every board from the competitions, streaming them once per
+    kind of board in ranking order.
+    """
+    fields = ("pk", "distance_in_feet", "distance_achievement_date")
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+
+        pilot_rows = (
+            Competition.objects.order_by(*RANKING, "pilot_id", "pk")
+            .values("pilot_id", *fields)
+            .iterator()
+        )
+        _rebuild_board(
+            pilot_rows,
+            lambda row: PILOTS_BOARD,
+            lambda row: row["pilot_id"],
+            batch_size,
+        )
+
+        drone_rows = Competition.objects.order_by(*RANKING, "drone_id", "pk").values(
+            "drone_id", "drone__category_id", *fields
+        )
+        _rebuild_board(
+            drone_rows.iterator(),
+            lambda row: DRONES_BOARD,
+            lambda row: row["drone_id"],
+            batch_size,
+        )
+        _rebuild_board(
+            drone_rows.iterator(),
+            lambda row: category_board(row["drone__category_id"]),
+            lambda row: row["drone_id"],
+            batch_size,
+        )
@@ -0,0 +1,88 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.drones.importing import IMPORTERS, read_records
+
+
+class Command(BaseCommand):
+    help = "Import categories, drones or pilots from a CSV or JSON lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument(
+            "path", help="A .csv file, or a JSON lines file with any other extension"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of records inserted per transaction",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Insert with bulk_create even on Postgres",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File recording the records already imported "
+            "(default: <path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the records recorded in the checkpoint",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+
+        skip = 0
+        if options["resume"] and os.path.exists(checkpoint):
+            with open(checkpoint) as file:
+                state = json.load(file)
+            if state["kind"] != options["kind"]:
+                raise CommandError(f"{checkpoint} is a checkpoint of {state['kind']}.")
+            skip = state["records"]
+            self.stdout.write(f"Resuming after record {skip}.")
+
+        importer = IMPORTERS[options["kind"]](
+            batch_size=options["batch_size"], use_copy=not options["no_copy"]
+        )
+        started = time.monotonic()
+
+        def on_batch(records):
+            # Only committed batches are recorded
+            with open(checkpoint, "w") as file:
+                json.dump({"kind": options["kind"], "records": records}, file)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                "{} records read, {} created, {} existing, {} invalid "
+                "({:.0f} records/s)".format(
+                    records,
+                    importer.created,
+                    importer.existing,
+                    len(importer.errors),
+                    (records - skip) / elapsed if elapsed else 0,
+                )
+            )
+
+        importer.run(read_records(path), skip=skip, on_batch=on_batch)
+
+        for number, message in importer.errors:
+            self.stderr.write(f"Record {number}: {message}")
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{importer.created} {options['kind']} imported, "
+                f"{importer.existing} already existing, "
+                f"{len(importer.errors)} invalid."
+            )
+        )
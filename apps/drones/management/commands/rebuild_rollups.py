@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.drones import rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute every competition rollup from the competitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rollups inserted per query",
+        )
+
+    def handle(self, *args, **options):
+        rollups.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS("Rollups rebuilt."))
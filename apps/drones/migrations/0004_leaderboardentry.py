@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0003_auto_20210131_1203'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(max_length=64)),
+                ('subject_id', models.UUIDField()),
+                ('position', models.PositiveIntegerField()),
+                ('competition_id', models.UUIDField()),
+                ('distance_in_feet', models.IntegerField()),
+                ('distance_achievement_date', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'Leaderboard Entries',
+                'ordering': ('board', 'position'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['board', 'position'], name='drones_lead_board_313ef8_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='leaderboardentry',
+            unique_together={('board', 'subject_id')},
+        ),
+    ]
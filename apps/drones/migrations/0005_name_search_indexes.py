@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Serve the icontains/istartswith lookups of the search filter, which
+# compile to UPPER("name"::text) LIKE UPPER(...)
+INDEXED_TABLES = ("drones_drone", "drones_pilot", "drones_dronecategory")
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in INDEXED_TABLES:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_name_trgm "
+            f"ON {table} USING gin ((UPPER(name::text)) gin_trgm_ops)"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in INDEXED_TABLES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {table}_name_trgm")
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("drones", "0004_leaderboardentry"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0005_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='competition',
+            name='distance_achievement_date',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.CreateModel(
+            name='CompetitionRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('dimension', models.CharField(choices=[('all', 'All'), ('pilot', 'Pilot'), ('drone', 'Drone'), ('category', 'Category')], max_length=8)),
+                ('subject_id', models.UUIDField()),
+                ('bucket', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('distance_sum', models.BigIntegerField(default=0)),
+                ('distance_min', models.IntegerField(null=True)),
+                ('distance_max', models.IntegerField(null=True)),
+            ],
+            options={
+                'ordering': ('period', 'dimension', 'subject_id', 'bucket'),
+                'unique_together': {('period', 'dimension', 'subject_id', 'bucket')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0006_competitionrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['board', 'distance_in_feet', 'distance_achievement_date', 'subject_id'], name='drones_lead_board_b7d4e6_idx'),
+        ),
+    ]
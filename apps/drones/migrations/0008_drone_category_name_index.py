@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0007_leaderboardentry_ranking_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='drone',
+            index=models.Index(fields=['category', 'name'], name='drones_dron_categor_a9beb9_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0008_drone_category_name_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='competition',
+            index=models.Index(fields=['pilot', 'distance_in_feet'], name='drones_comp_pilot_i_e57e83_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0009_competition_pilot_distance_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='leaderboardentry',
+            options={'ordering': ('board', '-distance_in_feet', 'distance_achievement_date', 'subject_id'), 'verbose_name_plural': 'Leaderboard Entries'},
+        ),
+        migrations.RemoveIndex(
+            model_name='leaderboardentry',
+            name='drones_lead_board_313ef8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='leaderboardentry',
+            name='drones_lead_board_b7d4e6_idx',
+        ),
+        migrations.RemoveField(
+            model_name='leaderboardentry',
+            name='position',
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['board', '-distance_in_feet', 'distance_achievement_date', 'subject_id'], name='drones_lead_board_71ec53_idx'),
+        ),
+    ]
@@ -5,13 +5,36 @@ import uuid
 from imagekit.models import ImageSpecField
 from pilkit.processors import ResizeToFill
 
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.models import CreationModificationDateBase
 
 
+def related_count(model, field_name):
+    """
+    Count of the ``model`` rows whose ``field_name`` points to the outer
+    row, as a correlated subquery, so only the rows actually returned get
+    their related rows counted.
+    """
+    count = (
+        model.objects.filter(**{field_name: models.OuterRef("pk")})
+        .order_by()
+        .values(field_name)
+        .annotate(count=models.Count("pk"))
+        .values("count")
+    )
+    return Coalesce(models.Subquery(count, output_field=models.IntegerField()), 0)
+
+
+class DroneCategoryQuerySet(models.QuerySet):
+    def with_drones_count(self):
+        return self.annotate(drones_count=related_count(Drone, "category"))
+
+
 class DroneCategory(CreationModificationDateBase):
     uuid = models.UUIDField(
         primary_key=True,
@@ -23,6 +46,8 @@ class DroneCategory(CreationModificationDateBase):
         unique=True,
     )
 
+    objects = DroneCategoryQuerySet.as_manager()
+
     class Meta:
         ordering = ("name",)
         verbose_name_plural = "Drone Categories"
@@ -31,6 +56,11 @@ class DroneCategory(CreationModificationDateBase):
         return self.name
 
 
+class PilotQuerySet(models.QuerySet):
+    def with_competitions_count(self):
+        return self.annotate(competitions_count=related_count(Competition, "pilot"))
+
+
 def drone_upload_to(instance, filename):
     base, extention = os.path.splitext(filename)
     extention = extention.lower()
@@ -69,6 +99,8 @@ class Drone(CreationModificationDateBase):
 
     class Meta:
         ordering = ("name",)
+        # The drones embedded in a category, see apps.api.eagerloading
+        indexes = (models.Index(fields=("category", "name")),)
 
     def __str__(self) -> str:
         return self.name
@@ -76,7 +108,7 @@ class Drone(CreationModificationDateBase):
     def delete(self, *args, **kwargs):
         from django.core.files.storage import default_storage
 
-        if self.picture:
+        if self.picture and not settings.MEDIA_DEFERRED_CLEANUP:
             with contextlib.suppress(FileNotFoundError):
                 default_storage.delete(self.picture_thumbnail.path)
             self.picture.delete()
@@ -105,6 +137,8 @@ class Pilot(CreationModificationDateBase):
     )
     races_count = models.IntegerField()
 
+    objects = PilotQuerySet.as_manager()
+
     class Meta:
         ordering = ("name",)
 
@@ -114,7 +148,7 @@ class Pilot(CreationModificationDateBase):
     def delete(self, *args, **kwargs):
         from django.core.files.storage import default_storage
 
-        if self.picture:
+        if self.picture and not settings.MEDIA_DEFERRED_CLEANUP:
             with contextlib.suppress(FileNotFoundError):
                 default_storage.delete(self.picture_thumbnail.path)
             self.picture.delete()
@@ -134,10 +168,94 @@ class Competition(CreationModificationDateBase):
         on_delete=models.CASCADE,
     )
     distance_in_feet = models.IntegerField()
-    distance_achievement_date = models.DateTimeField()
+    distance_achievement_date = models.DateTimeField(db_index=True)
 
     class Meta:
         ordering = ("-distance_in_feet",)
+        # The competitions embedded in a pilot, see apps.api.eagerloading
+        indexes = (models.Index(fields=("pilot", "distance_in_feet")),)
 
     def __str__(self) -> str:
         return f"Competition by {self.pilot.name} with {self.drone.name}"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Best competition of a pilot or a drone on a leaderboard, kept up to date
+    by ``apps.drones.leaderboard``. Ranks are counted from the ranking index
+    when read, so a write only touches the entry of its subject.
+    """
+
+    board = models.CharField(max_length=64)
+    subject_id = models.UUIDField()
+    competition_id = models.UUIDField()
+    distance_in_feet = models.IntegerField()
+    distance_achievement_date = models.DateTimeField()
+
+    class Meta:
+        ordering = (
+            "board",
+            "-distance_in_feet",
+            "distance_achievement_date",
+            "subject_id",
+        )
+        unique_together = ("board", "subject_id")
+        indexes = (
+            # Ranking of the entries, see apps.drones.leaderboard
+            models.Index(
+                fields=(
+                    "board",
+                    "-distance_in_feet",
+                    "distance_achievement_date",
+                    "subject_id",
+                )
+            ),
+        )
+        verbose_name_plural = "Leaderboard Entries"
+
+    def __str__(self) -> str:
+        return f"{self.subject_id} on {self.board}"
+
+
+class CompetitionRollup(models.Model):
+    """
+    Competitions of a pilot, a drone, a category or of everyone summarized
+    over a day, a week or a month. Kept up to date by
+    ``apps.drones.rollups`` so charts read one row per bucket.
+    """
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    PERIOD_CHOICES = ((DAY, "Day"), (WEEK, "Week"), (MONTH, "Month"))
+
+    ALL = "all"
+    PILOT = "pilot"
+    DRONE = "drone"
+    CATEGORY = "category"
+    DIMENSION_CHOICES = (
+        (ALL, "All"),
+        (PILOT, "Pilot"),
+        (DRONE, "Drone"),
+        (CATEGORY, "Category"),
+    )
+
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    dimension = models.CharField(max_length=8, choices=DIMENSION_CHOICES)
+    subject_id = models.UUIDField()
+    bucket = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    distance_sum = models.BigIntegerField(default=0)
+    distance_min = models.IntegerField(null=True)
+    distance_max = models.IntegerField(null=True)
+
+    class Meta:
+        ordering = ("period", "dimension", "subject_id", "bucket")
+        unique_together = ("period", "dimension", "subject_id", "bucket")
+
+    def __str__(self) -> str:
+        return f"{self.dimension} {self.subject_id} on {self.period} {self.bucket}"
+
+    @property
+    def distance_average(self):
+        return self.distance_sum / self.count if self.count else None
@@ -0,0 +1,320 @@
+"""
+Competition rollups by day, week and month.
+
+Every pilot, drone and category, and everyone together (the ``all``
+dimension), has one ``CompetitionRollup`` per period and bucket they have
+competitions in, holding their count and the sum, minimum and maximum of
+their distances. Charts read one row per bucket, whatever the number of
+competitions.
+
+Rollups are updated incrementally: adding competitions adds to the count
+and the sum of their buckets and widens their bounds, all the buckets
+receiving the same amounts in one query. Removing competitions subtracts
+from them, and only the buckets whose minimum or maximum was removed are
+recomputed from their competitions.
+
+Buckets start at midnight in the current time zone, weeks on Monday.
+"""
+
+import uuid
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, DateField, F, Max, Min, Q, Sum
+from django.db.models.functions import (
+    Coalesce,
+    Greatest,
+    Least,
+    TruncDay,
+    TruncMonth,
+    TruncWeek,
+)
+from django.utils import timezone
+
+from .models import Competition, CompetitionRollup, Drone
+
+# Subject of the rows of the ``all`` dimension
+ALL_SUBJECT = uuid.UUID(int=0)
+
+PERIODS = {
+    CompetitionRollup.DAY: TruncDay,
+    CompetitionRollup.WEEK: TruncWeek,
+    CompetitionRollup.MONTH: TruncMonth,
+}
+
+# Dimension: (key of the competition values, lookup from a competition)
+DIMENSIONS = {
+    CompetitionRollup.ALL: (None, None),
+    CompetitionRollup.PILOT: ("pilot_id", "pilot_id"),
+    CompetitionRollup.DRONE: ("drone_id", "drone_id"),
+    CompetitionRollup.CATEGORY: ("category_id", "drone__category_id"),
+}
+
+VALUES = ("pilot_id", "drone_id", "distance_in_feet", "distance_achievement_date")
+
+# Number of buckets matched by a single query
+CHUNK_SIZE = 200
+
+
+def truncate(day, period):
+    """Return the first day of the bucket of ``period`` containing ``day``"""
+    if period == CompetitionRollup.WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == CompetitionRollup.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def bucket_start(value, period):
+    return truncate(timezone.localtime(value).date(), period)
+
+
+def bucket_end(start, period):
+    if period == CompetitionRollup.WEEK:
+        return start + timedelta(days=7)
+    if period == CompetitionRollup.MONTH:
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_range(start, period):
+    """Return the aware datetimes bounding the bucket, end excluded"""
+    return tuple(
+        timezone.make_aware(datetime.combine(day, time.min))
+        for day in (start, bucket_end(start, period))
+    )
+
+
+def competition_values(competition):
+    """
+    Return the values of ``competition`` a rollup depends on, with the
+    category of its drone.
+    """
+    values = {name: getattr(competition, name) for name in VALUES}
+    values["category_id"] = competition.drone.category_id
+    return values
+
+
+def query_values(competitions):
+    """
+    Return the values of ``competitions`` a rollup depends on, reading the
+    categories of their drones in one query.
+    """
+    categories = dict(
+        Drone.objects.filter(
+            pk__in={competition.drone_id for competition in competitions}
+        ).values_list("pk", "category_id")
+    )
+    return [
+        dict(
+            {name: getattr(competition, name) for name in VALUES},
+            category_id=categories.get(competition.drone_id),
+        )
+        for competition in competitions
+    ]
+
+
+def _keys(values, dimensions):
+    for period in PERIODS:
+        bucket = bucket_start(values["distance_achievement_date"], period)
+        for dimension in dimensions:
+            name = DIMENSIONS[dimension][0]
+            subject_id = values[name] if name else ALL_SUBJECT
+            if subject_id is not None:
+                yield period, dimension, subject_id, bucket
+
+
+def _deltas(values_list, dimensions):
+    """Map the key of every bucket touched to its count, sum, min and max"""
+    deltas = {}
+    for values in values_list:
+        distance = values["distance_in_feet"]
+        for key in _keys(values, dimensions):
+            count, total, low, high = deltas.get(key, (0, 0, distance, distance))
+            deltas[key] = (
+                count + 1,
+                total + distance,
+                min(low, distance),
+                max(high, distance),
+            )
+    return deltas
+
+
+def _key_filter(key):
+    period, dimension, subject_id, bucket = key
+    return Q(period=period, dimension=dimension, subject_id=subject_id, bucket=bucket)
+
+
+def _matching(keys):
+    """Yield querysets matching ``keys``, a chunk of them at a time"""
+    keys = list(keys)
+    for index in range(0, len(keys), CHUNK_SIZE):
+        chunk = keys[index : index + CHUNK_SIZE]
+        yield CompetitionRollup.objects.filter(reduce(or_, map(_key_filter, chunk)))
+
+
+def _group_by_delta(deltas, amounts):
+    groups = defaultdict(list)
+    for key, delta in deltas.items():
+        groups[amounts(delta)].append(key)
+    return groups.items()
+
+
+def add_many(values_list, dimensions=tuple(DIMENSIONS)):
+    """Add competitions, given their values, to the rollups"""
+    deltas = _deltas(values_list, dimensions)
+    with transaction.atomic():
+        CompetitionRollup.objects.bulk_create(
+            [
+                CompetitionRollup(
+                    period=period,
+                    dimension=dimension,
+                    subject_id=subject_id,
+                    bucket=bucket,
+                )
+                for period, dimension, subject_id, bucket in deltas
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        for (count, total, low, high), keys in _group_by_delta(
+            deltas, lambda delta: delta
+        ):
+            for rollups in _matching(keys):
+                rollups.update(
+                    count=F("count") + count,
+                    distance_sum=F("distance_sum") + total,
+                    # A new row has no bounds yet
+                    distance_min=Least(Coalesce(F("distance_min"), low), low),
+                    distance_max=Greatest(Coalesce(F("distance_max"), high), high),
+                )
+
+
+def _subtract(values_list, dimensions):
+    """
+    Subtract competitions from the count and the sum of their buckets, and
+    return the rollups whose bounds may have been removed with them.
+    """
+    deltas = _deltas(values_list, dimensions)
+    for (count, total), keys in _group_by_delta(deltas, lambda delta: delta[:2]):
+        for rollups in _matching(keys):
+            rollups.update(
+                count=F("count") - count, distance_sum=F("distance_sum") - total
+            )
+
+    stale = []
+    for rollups in _matching(deltas):
+        for rollup in rollups:
+            key = (rollup.period, rollup.dimension, rollup.subject_id, rollup.bucket)
+            _, _, low, high = deltas[key]
+            if (
+                rollup.count <= 0
+                or low <= rollup.distance_min
+                or high >= rollup.distance_max
+            ):
+                stale.append(rollup)
+    return stale
+
+
+def remove_many(values_list, dimensions=tuple(DIMENSIONS)):
+    """Remove competitions, given their values, from the rollups"""
+    with transaction.atomic():
+        for rollup in _subtract(values_list, dimensions):
+            recompute(rollup)
+
+
+def record(previous, current):
+    """
+    Move a competition from its ``previous`` values to its ``current`` ones,
+    either of them being ``None`` when it is created or deleted.
+    """
+    if previous == current:
+        return
+    with transaction.atomic():
+        stale = _subtract([previous], DIMENSIONS) if previous is not None else []
+        if current is not None:
+            add_many([current])
+        # Recomputed last, as they read the competition in its current state
+        for rollup in stale:
+            recompute(rollup)
+
+
+def move_drone(drone_id, previous_category_id, category_id):
+    """Move the competitions of a drone to the rollups of its new category"""
+    values_list = [
+        dict(values, category_id=previous_category_id)
+        for values in Competition.objects.filter(drone_id=drone_id).values(*VALUES)
+    ]
+    with transaction.atomic():
+        remove_many(values_list, dimensions=(CompetitionRollup.CATEGORY,))
+        add_many(
+            [dict(values, category_id=category_id) for values in values_list],
+            dimensions=(CompetitionRollup.CATEGORY,),
+        )
+
+
+def recompute(rollup):
+    """Recompute ``rollup`` from the competitions of its bucket"""
+    start, end = bucket_range(rollup.bucket, rollup.period)
+    competitions = Competition.objects.filter(
+        distance_achievement_date__gte=start, distance_achievement_date__lt=end
+    )
+    lookup = DIMENSIONS[rollup.dimension][1]
+    if lookup:
+        competitions = competitions.filter(**{lookup: rollup.subject_id})
+    summary = competitions.aggregate(
+        count=Count("pk"),
+        distance_sum=Sum("distance_in_feet"),
+        distance_min=Min("distance_in_feet"),
+        distance_max=Max("distance_in_feet"),
+    )
+    if not summary["count"]:
+        rollup.delete()
+        return
+    for name, value in summary.items():
+        setattr(rollup, name, value)
+    rollup.save(update_fields=tuple(summary))
+
+
+def rebuild(batch_size=1000):
+    """
+    Recompute every rollup from the competitions, with one grouped query per
+    period and dimension.
+    """
+    with transaction.atomic():
+        CompetitionRollup.objects.all().delete()
+        for period, trunc in PERIODS.items():
+            for dimension, (_, lookup) in DIMENSIONS.items():
+                rows = (
+                    Competition.objects.annotate(
+                        bucket=trunc("distance_achievement_date", DateField())
+                    )
+                    .values("bucket", *filter(None, [lookup]))
+                    .annotate(
+                        count=Count("pk"),
+                        distance_sum=Sum("distance_in_feet"),
+                        distance_min=Min("distance_in_feet"),
+                        distance_max=Max("distance_in_feet"),
+                    )
+                    .order_by()
+                )
+                batch = []
+                for row in rows.iterator():
+                    subject_id = row.pop(lookup) if lookup else ALL_SUBJECT
+                    if subject_id is None:
+                        continue
+                    batch.append(
+                        CompetitionRollup(
+                            period=period,
+                            dimension=dimension,
+                            subject_id=subject_id,
+                            **row,
+                        )
+                    )
+                    if len(batch) >= batch_size:
+                        CompetitionRollup.objects.bulk_create(batch)
+                        batch = []
+                CompetitionRollup.objects.bulk_create(batch)
@@ -1,8 +1,17 @@
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import Signal, receiver
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
 
-from .models import Drone
+from apps.core.cache import bump_generation
+from . import leaderboard, rollups
+from .models import Competition, Drone, DroneCategory, Pilot
+
+# Sent with the ``competitions`` inserted by ``bulk_create``, which sends
+# no post_save
+competitions_bulk_created = Signal()
 
 
 @receiver(post_save, sender=Drone)
@@ -10,8 +19,93 @@ def drone_save_handler(sender, **kwargs):
     if settings.DEBUG:
         print(f"{kwargs['instance']} saved.")
 
+    if not kwargs["created"]:
+        # The drone may have moved to another category board
+        instance = kwargs["instance"]
+        leaderboard.refresh_drone(instance.pk)
+        previous_category_id = getattr(instance, "_previous_category_id", None)
+        if previous_category_id != instance.category_id:
+            rollups.move_drone(instance.pk, previous_category_id, instance.category_id)
+
+
+@receiver(pre_save, sender=Drone)
+def drone_pre_save_handler(sender, instance, **kwargs):
+    instance._previous_category_id = None
+    if not instance._state.adding:
+        instance._previous_category_id = (
+            Drone.objects.filter(pk=instance.pk)
+            .values_list("category_id", flat=True)
+            .first()
+        )
+
 
 @receiver(post_delete, sender=Drone)
 def drone_delete_handler(sender, **kwargs):
     if settings.DEBUG:
-        print(f"{kwargs['instance']} deleted.")
\ No newline at end of file
+        print(f"{kwargs['instance']} deleted.")
+
+
+@receiver(pre_save, sender=Competition)
+def competition_pre_save_handler(sender, instance, **kwargs):
+    # Keep the values being replaced, as the competition may move to
+    # another pilot, drone or bucket
+    instance._previous_values = None
+    if not instance._state.adding:
+        instance._previous_values = (
+            Competition.objects.filter(pk=instance.pk)
+            .values(*rollups.VALUES, category_id=F("drone__category_id"))
+            .first()
+        )
+
+
+@receiver(post_save, sender=Competition)
+def competition_save_handler(sender, instance, **kwargs):
+    pilot_ids = {instance.pilot_id}
+    drone_ids = {instance.drone_id}
+    previous = getattr(instance, "_previous_values", None)
+    if previous:
+        pilot_ids.add(previous["pilot_id"])
+        drone_ids.add(previous["drone_id"])
+
+    for pilot_id in pilot_ids:
+        leaderboard.refresh_pilot(pilot_id)
+    for drone_id in drone_ids:
+        leaderboard.refresh_drone(drone_id)
+
+    rollups.record(previous, rollups.competition_values(instance))
+
+
+@receiver(post_delete, sender=Competition)
+def competition_delete_handler(sender, instance, **kwargs):
+    leaderboard.refresh_pilot(instance.pilot_id)
+    leaderboard.refresh_drone(instance.drone_id)
+    rollups.record(rollups.competition_values(instance), None)
+
+
+@receiver(competitions_bulk_created, sender=Competition)
+def competitions_bulk_created_handler(sender, competitions, **kwargs):
+    leaderboard.refresh_many(
+        {competition.pilot_id for competition in competitions},
+        {competition.drone_id for competition in competitions},
+    )
+    rollups.add_many(rollups.query_values(competitions))
+    # generation_handler never sees the rows of a bulk insert
+    bump_generation(Competition)
+    transaction.on_commit(lambda: bump_generation(Competition))
+
+
+@receiver(post_save, sender=Drone)
+@receiver(post_delete, sender=Drone)
+@receiver(post_save, sender=DroneCategory)
+@receiver(post_delete, sender=DroneCategory)
+@receiver(post_save, sender=Pilot)
+@receiver(post_delete, sender=Pilot)
+@receiver(post_save, sender=Competition)
+@receiver(post_delete, sender=Competition)
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def generation_handler(sender, **kwargs):
+    # Invalidates the cached responses built from this model, and again once
+    # committed, as concurrent readers may cache the old rows until then
+    bump_generation(sender)
+    transaction.on_commit(lambda: bump_generation(sender))
\ No newline at end of file
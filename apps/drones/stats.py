@@ -0,0 +1,183 @@
+"""
+Competition statistics of pilots, drones and categories.
+
+All the statistics of a kind of subject come from one query: a window
+numbers the competitions of each subject by recency, they are aggregated per
+subject and left-joined onto the subject table, then every subject is ranked
+over all of them and within its partition (the category of a drone; all of
+them for pilots and categories). Subjects without competitions come last.
+The requested subjects are counted on their own, so the count does not
+depend on the page. Results are cached until a competition, a drone or a
+subject changes.
+"""
+
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.core.cache import get_generations
+from .models import Competition, Drone, DroneCategory, Pilot
+
+KINDS = {
+    "pilots": (Pilot, "competition.pilot_id", "NULL"),
+    "drones": (Drone, "competition.drone_id", "subject.category_id"),
+    "categories": (DroneCategory, "drone.category_id", "NULL"),
+}
+
+STATS_SQL = """
+WITH recent AS (
+    SELECT
+        {subject} AS subject_id,
+        competition.distance_in_feet,
+        competition.distance_achievement_date,
+        ROW_NUMBER() OVER (
+            PARTITION BY {subject}
+            ORDER BY competition.distance_achievement_date DESC, competition.uuid
+        ) AS recency
+    FROM {competition_table} competition
+    JOIN {drone_table} drone ON drone.uuid = competition.drone_id
+),
+per_subject AS (
+    SELECT
+        subject_id,
+        COUNT(*) AS competitions_count,
+        MAX(distance_in_feet) AS best_distance,
+        AVG(distance_in_feet) AS average_distance,
+        MAX(CASE WHEN recency = 1 THEN distance_in_feet END) AS latest_distance,
+        MAX(distance_achievement_date) AS latest_achievement_date
+    FROM recent
+    GROUP BY subject_id
+),
+subjects AS (
+    SELECT subject.{subject_pk} AS subject_id, {partition} AS partition_id
+    FROM {subject_table} subject
+),
+ranked AS (
+    SELECT
+        subjects.subject_id,
+        COALESCE(per_subject.competitions_count, 0) AS competitions_count,
+        per_subject.best_distance,
+        per_subject.average_distance,
+        per_subject.latest_distance,
+        per_subject.latest_achievement_date,
+        RANK() OVER (
+            ORDER BY
+                CASE WHEN per_subject.best_distance IS NULL THEN 1 ELSE 0 END,
+                per_subject.best_distance DESC
+        ) AS rank,
+        PERCENT_RANK() OVER (
+            PARTITION BY subjects.partition_id
+            ORDER BY
+                CASE WHEN per_subject.best_distance IS NULL THEN 0 ELSE 1 END,
+                per_subject.best_distance
+        ) AS percentile
+    FROM subjects
+    LEFT JOIN per_subject ON per_subject.subject_id = subjects.subject_id
+),
+requested AS (
+    SELECT COUNT(*) AS total FROM subjects {where}
+),
+page AS (
+    SELECT * FROM ranked {where}
+    ORDER BY rank, subject_id
+    LIMIT %s OFFSET %s
+)
+SELECT
+    page.subject_id,
+    page.competitions_count,
+    page.best_distance,
+    page.average_distance,
+    page.latest_distance,
+    page.latest_achievement_date,
+    page.rank,
+    page.percentile,
+    requested.total
+FROM requested
+LEFT JOIN page ON 1 = 1
+ORDER BY page.rank, page.subject_id
+"""
+
+COLUMNS = (
+    "id",
+    "competitions_count",
+    "best_distance_in_feet",
+    "average_distance_in_feet",
+    "latest_distance_in_feet",
+    "latest_achievement_date",
+    "rank",
+    "percentile",
+)
+
+
+def _to_datetime(value):
+    # SQLite hands back the text it stores, naive and in UTC
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if isinstance(value, datetime.datetime) and timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.utc)
+    return value
+
+
+def _query(kind, ids, limit, offset):
+    model, subject, partition = KINDS[kind]
+    pk_field = model._meta.pk
+    params = [pk_field.get_db_prep_value(pk, connection) for pk in ids]
+    where = ""
+    if ids:
+        where = "WHERE subject_id IN ({})".format(", ".join(["%s"] * len(ids)))
+    sql = STATS_SQL.format(
+        subject=subject,
+        partition=partition,
+        subject_pk=pk_field.column,
+        subject_table=model._meta.db_table,
+        competition_table=Competition._meta.db_table,
+        drone_table=Drone._meta.db_table,
+        where=where,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + params + [limit, offset])
+        rows = cursor.fetchall()
+
+    total = 0
+    results = []
+    for row in rows:
+        *values, total = row
+        if values[0] is None:
+            # The page is empty, only the count was returned
+            continue
+        stats = dict(zip(COLUMNS, values))
+        stats["id"] = pk_field.to_python(stats["id"])
+        if stats["average_distance_in_feet"] is not None:
+            stats["average_distance_in_feet"] = float(stats["average_distance_in_feet"])
+        stats["latest_achievement_date"] = _to_datetime(
+            stats["latest_achievement_date"]
+        )
+        stats["percentile"] = round(float(stats["percentile"]) * 100, 1)
+        results.append(stats)
+    return total, results
+
+
+def get_stats(kind, ids=(), limit=100, offset=0):
+    """
+    Return the number of existing subjects of ``kind`` among the given
+    ``ids`` (or of all of them), and the statistics of those, or of the
+    ``limit`` best ones after ``offset``.
+    """
+    ids = sorted(str(pk) for pk in ids)
+    limit = len(ids) if ids else limit
+    generations = get_generations((Competition, Drone, KINDS[kind][0]))
+    key = "stats:{}".format(
+        hashlib.sha256(
+            repr((kind, ids, limit, offset, generations)).encode()
+        ).hexdigest()
+    )
+    stats = cache.get(key)
+    if stats is None:
+        stats = _query(kind, ids, limit, offset)
+        cache.set(key, stats, settings.RESPONSE_CACHE_TIMEOUT)
+    return stats
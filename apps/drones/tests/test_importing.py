@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.authentication.models import User
+from apps.drones.models import Drone, DroneCategory, Pilot
+
+
+class ImportRecordsTests(TestCase):
+    def setUp(self) -> None:
+        User.objects.create_user(
+            email="owner@example.com", username="owner", password="p@assw0rd"
+        )
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def import_records(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_records", *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_drones_csv(self):
+        """
+        Ensure drones are imported in batches, creating their missing
+        categories and reporting invalid records
+        """
+        DroneCategory.objects.create(name="Quadcopter")
+        rows = ["name,category,owner,manufacturing_date,has_it_competed"]
+        rows += [
+            f"Drone {index},{'Quadcopter' if index % 2 else 'Hexacopter'},owner,"
+            "2020-01-01T10:00:00,True"
+            for index in range(5)
+        ]
+        rows.append("Stray,Quadcopter,nobody,2020-01-01T10:00:00,False")
+        rows.append("Undated,Quadcopter,owner,,False")
+        path = self.write("drones.csv", "\n".join(rows))
+
+        stdout, stderr = self.import_records("drones", path, "--batch-size", "2")
+        self.assertEqual(Drone.objects.count(), 5)
+        self.assertEqual(
+            set(DroneCategory.objects.values_list("name", flat=True)),
+            {"Quadcopter", "Hexacopter"},
+        )
+        self.assertTrue(Drone.objects.get(name="Drone 0").has_it_competed)
+        self.assertIn("Record 6: Unknown owner 'nobody'.", stderr)
+        self.assertIn("Record 7:", stderr)
+        self.assertIn("5 drones imported", stdout)
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+    def test_resume_import_pilots_jsonl(self):
+        """
+        Ensure a resumed import skips the records of the checkpoint, and that
+        names which already exist are never imported twice
+        """
+        path = self.write(
+            "pilots.jsonl",
+            "\n".join(
+                json.dumps({"name": f"Pilot {index}", "races_count": index})
+                for index in range(4)
+            ),
+        )
+        self.write(
+            "pilots.jsonl.checkpoint", json.dumps({"kind": "pilots", "records": 2})
+        )
+        self.import_records("pilots", path, "--resume")
+        self.assertEqual(
+            list(Pilot.objects.values_list("name", flat=True)), ["Pilot 2", "Pilot 3"]
+        )
+
+        stdout, _ = self.import_records("pilots", path)
+        self.assertIn("2 pilots imported, 2 already existing", stdout)
+        self.assertEqual(Pilot.objects.count(), 4)
@@ -0,0 +1,183 @@
+import random
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones import leaderboard
+from apps.drones.models import (
+    Competition,
+    Drone,
+    DroneCategory,
+    LeaderboardEntry,
+    Pilot,
+)
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self) -> None:
+        self.random = random.Random(7)
+        self.now = timezone.now()
+        owner = User.objects.create_user(
+            email="owner@example.com", username="owner", password="p@assw0rd"
+        )
+        self.categories = [
+            DroneCategory.objects.create(name=f"Category {index}") for index in range(2)
+        ]
+        self.drones = [
+            Drone.objects.create(
+                name=f"Drone {index}",
+                category=self.categories[index % 2],
+                owner=owner,
+                manufacturing_date=self.now,
+            )
+            for index in range(6)
+        ]
+        self.pilots = [
+            Pilot.objects.create(name=f"Pilot {index}", races_count=0)
+            for index in range(6)
+        ]
+
+    def create_competition(self, **kwargs):
+        values = {
+            "pilot": self.random.choice(self.pilots),
+            "drone": self.random.choice(self.drones),
+            # A small range of distances, so there are ties
+            "distance_in_feet": self.random.randint(1, 5) * 100,
+            "distance_achievement_date": self.now
+            - timedelta(days=self.random.randint(0, 3)),
+        }
+        values.update(kwargs)
+        return Competition.objects.create(**values)
+
+    def expected_boards(self):
+        """Rank every subject from scratch, the slow way"""
+        boards = {}
+        for competition in Competition.objects.select_related("drone"):
+            key = (
+                -competition.distance_in_feet,
+                competition.distance_achievement_date,
+            )
+            for board, subject_id in (
+                (leaderboard.PILOTS_BOARD, competition.pilot_id),
+                (leaderboard.DRONES_BOARD, competition.drone_id),
+                (
+                    leaderboard.category_board(competition.drone.category_id),
+                    competition.drone_id,
+                ),
+            ):
+                best = boards.setdefault(board, {})
+                if subject_id not in best or key < best[subject_id]:
+                    best[subject_id] = key
+        return {
+            board: sorted(best, key=lambda subject_id: (best[subject_id], subject_id))
+            for board, best in boards.items()
+        }
+
+    def current_boards(self):
+        boards = {}
+        boards_with_entries = LeaderboardEntry.objects.order_by().values_list(
+            "board", flat=True
+        )
+        for board in boards_with_entries.distinct():
+            entries = leaderboard.read_range(board, 1, leaderboard.board_size(board))
+            for rank, entry in enumerate(entries, 1):
+                self.assertEqual(entry.rank, rank)
+                self.assertEqual(
+                    leaderboard.read_rank(board, entry.subject_id).rank, rank
+                )
+            boards[board] = [entry.subject_id for entry in entries]
+        return boards
+
+    def assert_boards_match(self):
+        self.assertEqual(self.current_boards(), self.expected_boards())
+
+    def test_boards_follow_creates_updates_and_deletes(self):
+        competitions = [self.create_competition() for _ in range(25)]
+        self.assert_boards_match()
+
+        for competition in self.random.sample(competitions, 10):
+            competition.distance_in_feet = self.random.randint(1, 5) * 100
+            competition.pilot = self.random.choice(self.pilots)
+            competition.drone = self.random.choice(self.drones)
+            competition.save()
+        self.assert_boards_match()
+
+        for competition in self.random.sample(competitions, 10):
+            competition.delete()
+        self.assert_boards_match()
+
+    def test_boards_follow_drone_category_change(self):
+        for _ in range(10):
+            self.create_competition()
+        drone = Drone.objects.filter(drone__isnull=False).first()
+        drone.category = (
+            self.categories[1]
+            if drone.category == self.categories[0]
+            else self.categories[0]
+        )
+        drone.save()
+        self.assert_boards_match()
+
+    def test_boards_follow_pilot_and_drone_deletes(self):
+        for _ in range(15):
+            self.create_competition()
+        self.pilots[0].delete()
+        self.drones[0].delete()
+        self.assert_boards_match()
+
+    def test_rebuild(self):
+        for _ in range(20):
+            self.create_competition()
+        before = self.current_boards()
+        LeaderboardEntry.objects.all().delete()
+        leaderboard.rebuild(batch_size=3)
+        self.assertEqual(self.current_boards(), before)
+
+    def test_read_rank_and_range(self):
+        first = self.create_competition(pilot=self.pilots[0], distance_in_feet=900)
+        self.create_competition(pilot=self.pilots[1], distance_in_feet=500)
+        self.create_competition(pilot=self.pilots[2], distance_in_feet=700)
+
+        entry = leaderboard.read_rank(leaderboard.PILOTS_BOARD, self.pilots[2].pk)
+        self.assertEqual(entry.rank, 2)
+        self.assertEqual(entry.subject.name, self.pilots[2].name)
+
+        entries = leaderboard.read_range(leaderboard.PILOTS_BOARD, 1, 2)
+        self.assertEqual(
+            [entry.subject_id for entry in entries],
+            [self.pilots[0].pk, self.pilots[2].pk],
+        )
+        self.assertEqual(entries[0].competition_id, first.pk)
+        self.assertEqual(leaderboard.board_size(leaderboard.PILOTS_BOARD), 3)
+
+    def test_writes_only_touch_the_entry_of_the_subject(self):
+        for index, distance in enumerate((900, 700, 500, 300)):
+            self.create_competition(pilot=self.pilots[index], distance_in_feet=distance)
+        board = leaderboard.PILOTS_BOARD
+        competition_id = leaderboard.read_rank(board, self.pilots[2].pk).competition_id
+
+        with CaptureQueriesContext(connection) as queries:
+            leaderboard.set_best(
+                board, self.pilots[2].pk, (competition_id, 800, self.now)
+            )
+        self.assertEqual(
+            [entry.subject_id for entry in leaderboard.read_range(board, 1, 4)],
+            [self.pilots[index].pk for index in (0, 2, 1, 3)],
+        )
+        writes = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        self.assertEqual(len(writes), 1)
+
+        leaderboard.set_best(board, self.pilots[2].pk, (competition_id, 100, self.now))
+        self.assertEqual(
+            [entry.subject_id for entry in leaderboard.read_range(board, 1, 4)],
+            [self.pilots[index].pk for index in (0, 1, 3, 2)],
+        )
+        self.assertEqual(leaderboard.read_rank(board, self.pilots[2].pk).rank, 4)
@@ -0,0 +1,141 @@
+import random
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.drones import rollups
+from apps.drones.models import (
+    Competition,
+    CompetitionRollup,
+    Drone,
+    DroneCategory,
+    Pilot,
+)
+from apps.drones.signals import competitions_bulk_created
+
+
+class RollupTests(TestCase):
+    def setUp(self) -> None:
+        self.random = random.Random(11)
+        # Close to the end of a month, so buckets overlap several periods
+        self.start = timezone.make_aware(datetime(2021, 1, 25, 12))
+        owner = User.objects.create_user(
+            email="owner@example.com", username="owner", password="p@assw0rd"
+        )
+        self.categories = [
+            DroneCategory.objects.create(name=f"Category {index}") for index in range(2)
+        ]
+        self.drones = [
+            Drone.objects.create(
+                name=f"Drone {index}",
+                category=self.categories[index % 2],
+                owner=owner,
+                manufacturing_date=self.start,
+            )
+            for index in range(4)
+        ]
+        self.pilots = [
+            Pilot.objects.create(name=f"Pilot {index}", races_count=0)
+            for index in range(3)
+        ]
+
+    def competition_values(self):
+        return {
+            "pilot": self.random.choice(self.pilots),
+            "drone": self.random.choice(self.drones),
+            "distance_in_feet": self.random.randint(1, 9) * 100,
+            "distance_achievement_date": self.start
+            + timedelta(
+                days=self.random.randint(0, 12), hours=self.random.randint(0, 23)
+            ),
+        }
+
+    def create_competition(self):
+        return Competition.objects.create(**self.competition_values())
+
+    def expected_rollups(self):
+        """Summarize every bucket from scratch, the slow way"""
+        expected = {}
+        for competition in Competition.objects.select_related("drone"):
+            values = rollups.competition_values(competition)
+            distance = competition.distance_in_feet
+            for key in rollups._keys(values, rollups.DIMENSIONS):
+                count, total, low, high = expected.get(key, (0, 0, distance, distance))
+                expected[key] = (
+                    count + 1,
+                    total + distance,
+                    min(low, distance),
+                    max(high, distance),
+                )
+        return expected
+
+    def current_rollups(self):
+        return {
+            (
+                rollup.period,
+                rollup.dimension,
+                rollup.subject_id,
+                rollup.bucket,
+            ): (
+                rollup.count,
+                rollup.distance_sum,
+                rollup.distance_min,
+                rollup.distance_max,
+            )
+            for rollup in CompetitionRollup.objects.all()
+        }
+
+    def assert_rollups_match(self):
+        self.assertEqual(self.current_rollups(), self.expected_rollups())
+
+    def test_rollups_follow_creates_updates_and_deletes(self):
+        competitions = [self.create_competition() for _ in range(30)]
+        self.assert_rollups_match()
+
+        for competition in self.random.sample(competitions, 12):
+            for name, value in self.competition_values().items():
+                setattr(competition, name, value)
+            competition.save()
+        self.assert_rollups_match()
+
+        for competition in self.random.sample(competitions, 12):
+            competition.delete()
+        self.assert_rollups_match()
+
+    def test_rollups_follow_drone_category_change_and_deletes(self):
+        for _ in range(20):
+            self.create_competition()
+        drone = self.drones[0]
+        drone.category = self.categories[1]
+        drone.save()
+        self.assert_rollups_match()
+
+        self.pilots[0].delete()
+        self.categories[1].delete()
+        self.assert_rollups_match()
+
+    def test_rollups_follow_bulk_created_competitions(self):
+        self.create_competition()
+        competitions = Competition.objects.bulk_create(
+            [Competition(**self.competition_values()) for _ in range(40)]
+        )
+        competitions_bulk_created.send(sender=Competition, competitions=competitions)
+        self.assert_rollups_match()
+
+    def test_buckets(self):
+        value = timezone.make_aware(datetime(2021, 2, 3, 23, 59))
+        self.assertEqual(str(rollups.bucket_start(value, "day")), "2021-02-03")
+        self.assertEqual(str(rollups.bucket_start(value, "week")), "2021-02-01")
+        self.assertEqual(str(rollups.bucket_start(value, "month")), "2021-02-01")
+        start, end = rollups.bucket_range(rollups.bucket_start(value, "month"), "month")
+        self.assertEqual(end - start, timedelta(days=28))
+
+    def test_rebuild(self):
+        for _ in range(25):
+            self.create_competition()
+        before = self.current_rollups()
+        CompetitionRollup.objects.all().delete()
+        rollups.rebuild(batch_size=7)
+        self.assertEqual(self.current_rollups(), before)
@@ -0,0 +1,165 @@
+"""
+Compare the sync drone list view, served by a pool of threads as under
+WSGI, with its async version served by an event loop as under ASGI, for
+clients sending requests concurrently.
+
+Every query is delayed by a fixed latency, as with a database over the
+network, since overlapping that wait is what the async view is for.
+
+Run from the repository root:
+
+    python benchmarks/async_views.py [requests] [clients] [latency ms]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for name in ("DJANGO_SECRET_KEY", "DB_NAME", "DB_USERNAME", "DB_PASSWORD"):
+    os.environ.setdefault(name, "benchmark")
+os.environ.setdefault("DJANGO_DEBUG", "False")
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_PORT", "5432")
+
+from settings import _base  # noqa: E402
+
+DATABASE = os.path.join(tempfile.mkdtemp(), "benchmark.sqlite3")
+settings.configure(
+    **{
+        name: getattr(_base, name)
+        for name in dir(_base)
+        if name.isupper() and name not in ("DATABASES", "CACHES", "REST_FRAMEWORK")
+    },
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": DATABASE}},
+    # Every request reaches the database
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+    REST_FRAMEWORK=dict(_base.REST_FRAMEWORK, DEFAULT_THROTTLE_CLASSES=()),
+)
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.db.backends import utils  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from apps.api import asyncviews, views  # noqa: E402
+from apps.authentication.models import User  # noqa: E402
+from apps.drones.models import Drone, DroneCategory  # noqa: E402
+
+latency = 0.005
+execute = utils.CursorWrapper.execute
+
+
+def slow_execute(self, sql, params=None):
+    time.sleep(latency)
+    return execute(self, sql, params)
+
+
+def seed():
+    call_command("migrate", verbosity=0)
+    owner = User.objects.create_user(
+        username="pilot", email="pilot@example.com", password="p@assw0rd"
+    )
+    category = DroneCategory.objects.create(name="Quadcopter")
+    Drone.objects.bulk_create(
+        Drone(
+            name=f"Drone {index}",
+            category=category,
+            owner=owner,
+            manufacturing_date=timezone.now(),
+        )
+        for index in range(200)
+    )
+
+
+def request():
+    return APIRequestFactory().get(
+        "/api/drones/", {"limit": 20, "offset": 40}, HTTP_HOST="localhost"
+    )
+
+
+def timed(view):
+    started = time.perf_counter()
+    response = view(request())
+    response.render()
+    return time.perf_counter() - started
+
+
+def bench_sync(count, clients, threads):
+    """
+    Return the requests per second and the seconds every request took from
+    the time its client sent it
+    """
+    view = views.DroneListView.as_view()
+
+    def serve():
+        try:
+            return timed(view)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(threads) as pool:
+
+        def client(requests):
+            durations = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                pool.submit(serve).result()
+                durations.append(time.perf_counter() - started)
+            return durations
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(clients) as senders:
+            results = senders.map(client, [count // clients] * clients)
+            durations = [duration for result in results for duration in result]
+    return len(durations) / (time.perf_counter() - started), durations
+
+
+def bench_async(count, clients):
+    view = asyncviews.DroneListView.as_view()
+    durations = []
+
+    async def client(requests):
+        for _ in range(requests):
+            started = time.perf_counter()
+            await view(request())
+            durations.append(time.perf_counter() - started)
+
+    async def serve():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(clients * 2))
+        await asyncio.gather(*(client(count // clients) for _ in range(clients)))
+
+    started = time.perf_counter()
+    asyncio.run(serve())
+    return len(durations) / (time.perf_counter() - started), durations
+
+
+def report(name, throughput, durations):
+    durations = sorted(durations)
+    p50 = statistics.median(durations) * 1000
+    p99 = durations[int(len(durations) * 0.99) - 1] * 1000
+    print(f"{name:6} {throughput:8.0f} req/s  p50 {p50:6.1f} ms  p99 {p99:6.1f} ms")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 320
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 20) / 1000
+    seed()
+    utils.CursorWrapper.execute = slow_execute
+
+    print(f"{count} requests, {clients} clients, {latency * 1000:.0f} ms per query")
+    # Threads of a WSGI server, as many as the clients or a quarter of them
+    for threads in (clients, max(1, clients // 4)):
+        report(f"wsgi/{threads}", *bench_sync(count, clients, threads))
+    report("asgi", *bench_async(count, clients))
@@ -0,0 +1,121 @@
+"""
+Compare the requests per second of the drone list and detail views with
+the stock PostgreSQL backend, connecting at every request, and with the
+pooled one (apps.core.db.postgresql).
+
+Requests go through the WSGI handler, which closes the connection when the
+response is, as a server does. Requires a PostgreSQL database configured
+by the DB_* variables, as for the project; it is migrated and filled with
+drones. Run from the repository root:
+
+    python benchmarks/db_pool.py [requests] [threads]
+"""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+os.environ.setdefault("DJANGO_DEBUG", "False")
+
+ENGINES = {
+    "stock": "django.db.backends.postgresql",
+    "pooled": "apps.core.db.postgresql",
+}
+
+
+def configure(engine):
+    from settings import _base
+
+    settings.configure(
+        **{
+            name: getattr(_base, name)
+            for name in dir(_base)
+            if name.isupper() and name not in ("CACHES", "REST_FRAMEWORK")
+        },
+        # Every request reaches the database
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+        REST_FRAMEWORK=dict(_base.REST_FRAMEWORK, DEFAULT_THROTTLE_CLASSES=()),
+    )
+    settings.DATABASES["default"]["ENGINE"] = ENGINES[engine]
+    django.setup()
+
+
+def seed():
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from apps.authentication.models import User
+    from apps.drones.models import Drone, DroneCategory
+
+    call_command("migrate", verbosity=0)
+    if Drone.objects.filter(name__startswith="Benchmark ").exists():
+        return
+    owner, _ = User.objects.get_or_create(
+        username="benchmark", email="benchmark@example.com"
+    )
+    category, _ = DroneCategory.objects.get_or_create(name="Benchmark")
+    Drone.objects.bulk_create(
+        Drone(
+            name=f"Benchmark {index}",
+            category=category,
+            owner=owner,
+            manufacturing_date=timezone.now(),
+        )
+        for index in range(200)
+    )
+
+
+def bench(count, threads):
+    """Return the requests per second, alternating lists and details"""
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.test import RequestFactory
+
+    from apps.drones.models import Drone
+
+    handler = WSGIHandler()
+    pks = list(Drone.objects.values_list("pk", flat=True)[:50])
+    connection.close()
+    paths = [
+        "/api/drones/?limit=20&offset=20" if index % 2 else f"/api/drones/{pk}/"
+        for index, pk in enumerate(pks)
+    ]
+
+    def serve(index):
+        environ = RequestFactory().get(paths[index % len(paths)]).environ
+        environ["HTTP_HOST"] = "localhost"
+        response = handler(environ, lambda status, headers: None)
+        assert response.status_code == 200, response.status_code
+        # Ends the request, closing or releasing the connection
+        response.close()
+
+    with ThreadPoolExecutor(threads) as pool:
+        # Warm up, so that the pooled backend has its connections open
+        list(pool.map(serve, range(threads * 10)))
+        started = time.perf_counter()
+        list(pool.map(serve, range(count)))
+        return count / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    if len(sys.argv) > 3:
+        configure(sys.argv[3])
+        seed()
+        print(f"{sys.argv[3]:6} {bench(count, threads):8.0f} req/s")
+    else:
+        print(f"{count} requests, {threads} threads")
+        # One process per backend, as settings are configured once
+        for engine in ENGINES:
+            subprocess.run(
+                [sys.executable, __file__, str(count), str(threads), engine],
+                check=True,
+            )
@@ -0,0 +1,98 @@
+"""
+Compare the throughput of the login serializer with the one it replaced.
+
+Passwords are hashed with MD5 so the token issuing, which is what changed,
+is not hidden behind the cost of PBKDF2.
+
+Run from the repository root:
+
+    python benchmarks/login.py [logins]
+"""
+
+import os
+import sys
+import time
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+settings.configure(
+    SECRET_KEY="benchmark",
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    INSTALLED_APPS=[
+        "django.contrib.auth",
+        "django.contrib.contenttypes",
+        "rest_framework_simplejwt.token_blacklist",
+        "apps.authentication",
+    ],
+    AUTH_USER_MODEL="authentication.User",
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    OUTSTANDING_TOKENS_BUFFER_SIZE=100,
+    OUTSTANDING_TOKENS_FLUSH_INTERVAL=5,
+    AUTH_CACHE_TIMEOUT=60,
+)
+django.setup()
+
+from django.contrib.auth import authenticate  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from apps.authentication.models import User  # noqa: E402
+from apps.authentication.serializers import LoginSerializer  # noqa: E402
+from apps.authentication.tokens import outstanding_tokens  # noqa: E402
+
+CREDENTIALS = {"email": "pilot@example.com", "password": "p@assw0rd"}
+
+
+def legacy_login(data):
+    user = authenticate(**data)
+    user = User.objects.get(email=user.email)
+    refresh = RefreshToken.for_user(user)
+    access = str(refresh.access_token)
+    refresh = RefreshToken.for_user(user)
+    return {"access": access, "refresh": str(refresh)}
+
+
+def login(data):
+    serializer = LoginSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    return serializer.data
+
+
+def bench(function, count):
+    """Return the logins per second and the queries per login"""
+    queries = 0
+
+    def count_query(execute, *args):
+        nonlocal queries
+        queries += 1
+        return execute(*args)
+
+    with connection.execute_wrapper(count_query):
+        started = time.perf_counter()
+        for _ in range(count):
+            function(CREDENTIALS)
+        outstanding_tokens.flush()
+        elapsed = time.perf_counter() - started
+    return count / elapsed, queries / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    call_command("migrate", verbosity=0)
+    User.objects.create_user(username="pilot", is_verified=True, **CREDENTIALS)
+
+    legacy, legacy_queries = bench(legacy_login, count)
+    current, queries = bench(login, count)
+    print(f"{count} logins")
+    print(f"{'legacy':10} {legacy:8.0f} logins/s  {legacy_queries:.2f} queries/login")
+    print(
+        f"{'current':10} {current:8.0f} logins/s  {queries:.2f} queries/login"
+        f"  x{current / legacy:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
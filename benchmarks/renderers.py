@@ -0,0 +1,92 @@
+"""
+Compare the envelope renderer with the one it replaced on large lists.
+
+Run from the repository root:
+
+    python benchmarks/renderers.py [rows]
+"""
+
+import json
+import os
+import sys
+import timeit
+import uuid
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+settings.configure()
+django.setup()
+
+from rest_framework import renderers  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+
+from utils import renderers as envelope_renderers  # noqa: E402
+
+
+class LegacyRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type, renderer_context):
+        key = "error" if "ErrorDetail" in str(data) else "data"
+        return json.dumps(
+            {key: data, "statusCode": renderer_context.get("response").status_code}
+        )
+
+
+def make_rows(count):
+    return [
+        {
+            "url": f"http://localhost:8000/api/v1/drones/{uuid.uuid4()}/",
+            "pk": str(uuid.uuid4()),
+            "name": f"Drone {index}",
+            "category": "Quadcopter",
+            "owner": "owner",
+            "manufacturing_date": "2020-01-01T10:00:00Z",
+            "has_it_competed": index % 2 == 0,
+            "inserted_timestamp": "2020-01-01T10:00:00.123000Z",
+        }
+        for index in range(count)
+    ]
+
+
+def bench(renderer, data, context, number):
+    # Responses are rendered to bytes by DRF, include that for the legacy str
+    def render():
+        content = renderer.render(data, None, context)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+
+    return min(timeit.repeat(render, number=number, repeat=5)) / number
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    data = make_rows(count)
+    context = {"response": Response(data)}
+    number = max(1, 100000 // count)
+
+    legacy = bench(LegacyRenderer(), data, context, number)
+    results = [("legacy str() + json.dumps", legacy)]
+    results.append(
+        (
+            "envelope, orjson" if envelope_renderers.orjson else "envelope, json",
+            bench(envelope_renderers.EnvelopeJSONRenderer(), data, context, number),
+        )
+    )
+    if envelope_renderers.orjson:
+        orjson, envelope_renderers.orjson = envelope_renderers.orjson, None
+        results.append(
+            (
+                "envelope, json",
+                bench(envelope_renderers.EnvelopeJSONRenderer(), data, context, number),
+            )
+        )
+        envelope_renderers.orjson = orjson
+
+    print(f"{count} rows")
+    for name, seconds in results:
+        print(f"{name:28} {seconds * 1000:8.2f} ms  x{legacy / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
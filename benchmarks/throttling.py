@@ -0,0 +1,90 @@
+"""
+Compare the per-request cost of the token bucket throttle with the DRF
+throttles it replaced, for a client sending requests to a scoped view.
+
+Run from the repository root:
+
+    python benchmarks/throttling.py [requests]
+"""
+
+import os
+import sys
+import time
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+settings.configure(
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "database": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "throttle_cache",
+        },
+    },
+    INSTALLED_APPS=["django.contrib.auth", "django.contrib.contenttypes"],
+    REST_FRAMEWORK={
+        # High enough for no request to be throttled
+        "DEFAULT_THROTTLE_RATES": {
+            "anon": "1000000/hour",
+            "user": "1000000/hour",
+            "drones": "1000000/hour",
+        }
+    },
+    THROTTLE_CACHE="default",
+)
+django.setup()
+
+from django.core.cache import caches  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from rest_framework import throttling  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from utils.throttling import TokenBucketThrottle  # noqa: E402
+
+
+class View:
+    throttle_scope = "drones"
+
+
+def bench(throttle_classes, count):
+    """Return the mean seconds the throttles take per request"""
+    caches["default"].clear()
+    request = Request(APIRequestFactory().get("/"))
+    view = View()
+    started = time.perf_counter()
+    for _ in range(count):
+        for throttle_class in throttle_classes:
+            if not throttle_class().allow_request(request, view):
+                raise RuntimeError("Throttled")
+    return (time.perf_counter() - started) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    call_command("migrate", verbosity=0)
+    call_command("createcachetable", verbosity=0)
+
+    legacy = bench(
+        (
+            throttling.AnonRateThrottle,
+            throttling.UserRateThrottle,
+            throttling.ScopedRateThrottle,
+        ),
+        count,
+    )
+    results = [("anon + user + scoped, locmem", legacy)]
+    results.append(("token bucket, locmem", bench((TokenBucketThrottle,), count)))
+    settings.THROTTLE_CACHE = "database"
+    results.append(("token bucket, database", bench((TokenBucketThrottle,), count)))
+
+    print(f"{count} requests of one client")
+    for name, seconds in results:
+        print(f"{name:30} {seconds * 1e6:8.1f} us  x{legacy / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -81,16 +81,93 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        # With DB_POOL, connections are taken from a pool of the process and
+        # given back at the end of every request, using the POOL options (see
+        # apps/core/db/postgresql/base.py)
+        "ENGINE": (
+            "apps.core.db.postgresql"
+            if config("DB_POOL", default=False, cast=bool)
+            else "django.db.backends.postgresql"
+        ),
         "NAME": config("DB_NAME"),
         "USER": config("DB_USERNAME"),
         "PASSWORD": config("DB_PASSWORD"),
         "HOST": config("DB_HOST"),
         "PORT": config("DB_PORT"),
+        # Seconds connections are kept open, for the threads of the async
+        # views when they are not pooled (see apps.api.checks)
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=0, cast=int),
+        "POOL": {
+            "MAX_SIZE": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+            "TIMEOUT": 5,
+            "IDLE_TIMEOUT": config("DB_POOL_IDLE_TIMEOUT", default=300, cast=int),
+            "MAX_LIFETIME": 3600,
+            "CHECK_AFTER": 30,
+            "PREPARE_THRESHOLD": 5,
+            "MAX_PREPARED": 100,
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+# Cached responses, counts and validators are invalidated by the generation
+# counters of apps.core.cache, which every worker has to share: deployments
+# with DEBUG off must point this to a memcached or Redis server, e.g.
+# CACHE_BACKEND=django.core.cache.backends.memcached.PyMemcacheCache and
+# CACHE_LOCATION=127.0.0.1:11211 (see apps.core.checks).
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
+}
+
+# Seconds a cached API response is kept. Responses are also invalidated as
+# soon as a row they depend on changes.
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Seconds shared caches (CDN, reverse proxy) may serve anonymous API
+# responses without revalidating them.
+PUBLIC_CACHE_MAX_AGE = 60
+
+# Seconds the claims of verified tokens and the users they authenticate are
+# cached. Users are dropped from the cache as soon as they are saved, and
+# only cached when the cache is shared by every worker.
+AUTH_CACHE_TIMEOUT = 60
+
+# Outstanding refresh tokens issued at login are inserted by batches of this
+# size, or after this many seconds when fewer logins come in.
+OUTSTANDING_TOKENS_BUFFER_SIZE = config(
+    "OUTSTANDING_TOKENS_BUFFER_SIZE", default=100, cast=int
+)
+OUTSTANDING_TOKENS_FLUSH_INTERVAL = 5
+
+# Emails of the outbox are retried after OUTBOX_BACKOFF seconds, doubled at
+# every attempt, up to OUTBOX_MAX_ATTEMPTS attempts.
+OUTBOX_BACKOFF = 60
+OUTBOX_MAX_ATTEMPTS = 5
+
+# Serve the list and detail views of the API with their async versions, as
+# config/asgi.py does. Their queries run in the threads of the event loop,
+# each with its own connection, unless ASYNC_API_THREADS is False; this
+# requires DB_POOL or DB_CONN_MAX_AGE.
+ASYNC_API = config("ASYNC_API", default=False, cast=bool)
+ASYNC_API_THREADS = True
+
+# Unfiltered API lists of tables estimated to hold more rows than this are
+# counted from the estimate of the PostgreSQL planner, unless ?count=exact.
+COUNT_ESTIMATE_THRESHOLD = 10000
+
+# Cache keeping the throttle buckets. Limits are per worker unless it is
+# shared, like a django-redis or a database cache.
+THROTTLE_CACHE = config("THROTTLE_CACHE", default="default")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -145,10 +222,24 @@ STATIC_ROOT = str(BASE_DIR.joinpath("static"))
 MEDIA_ROOT = str(BASE_DIR.joinpath("uploads"))
 MEDIA_URL = "/uploads/"
 
+# Thumbnails are rendered in a pool of THUMBNAIL_WORKERS processes as soon as
+# their picture is saved (see apps.core.thumbnails)
+IMAGEKIT_DEFAULT_CACHEFILE_BACKEND = "apps.core.thumbnails.ProcessPool"
+IMAGEKIT_DEFAULT_CACHEFILE_STRATEGY = "apps.core.thumbnails.GenerateOnSave"
+THUMBNAIL_WORKERS = config("THUMBNAIL_WORKERS", default=2, cast=int)
+
+# Uploads under these directories are deleted by the delete_orphaned_media
+# command once no row refers to them and they are older than MEDIA_GC_MIN_AGE
+# seconds. With MEDIA_DEFERRED_CLEANUP, deleting a drone or a pilot leaves
+# its files to that command instead of deleting them during the request.
+MEDIA_GC_PREFIXES = ("drones/", "pilots/", "avatars/")
+MEDIA_GC_MIN_AGE = 3600
+MEDIA_DEFERRED_CLEANUP = config("MEDIA_DEFERRED_CLEANUP", default=False, cast=bool)
+
 # REST Framework Settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.authentication.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "NONE_FIELD_ERRORS_KEY": "error",
@@ -157,17 +248,15 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.OrderingFilter",
-        "rest_framework.filters.SearchFilter",
-    ),
-    "DEFAULT_THROTTLE_CLASSES": (
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "apps.api.filters.RankedSearchFilter",
     ),
+    "DEFAULT_THROTTLE_CLASSES": ("utils.throttling.TokenBucketThrottle",),
     "DEFAULT_THROTTLE_RATES": {
         "anon": "300/hour",
         "user": "100/hour",
         "drones": "200/hour",
         "pilots": "150/hour",
+        "exports": "30/hour",
     },
     "EXCEPTION_HANDLER": "utils.exception_handler.custom_exception_handler",
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.NamespaceVersioning",
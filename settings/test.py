@@ -1 +1,7 @@
-from ._base import *
\ No newline at end of file
+from ._base import *
+
+# Tests read the outstanding tokens as soon as they are issued
+OUTSTANDING_TOKENS_BUFFER_SIZE = 1
+
+# Queries run in the thread holding the transaction of the test
+ASYNC_API_THREADS = False
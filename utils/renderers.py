@@ -1,28 +1,44 @@
-from rest_framework import renderers
 import json
 
+from rest_framework import renderers
+from rest_framework.utils import encoders
 
-class CustomJSONRenderer(renderers.JSONRenderer):
-    charset = "utf-8"
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-    def render(self, data, accepted_media_type, renderer_context):
 
-        response = ""
+class EnvelopeJSONRenderer(renderers.JSONRenderer):
+    """
+    Wrap the data in ``{"data": ..., "statusCode": ...}``, or in
+    ``{"error": ..., "statusCode": ...}`` for error responses.
 
-        if "ErrorDetail" in str(data):
-            response = json.dumps(
-                {
-                    "error": data,
-                    "statusCode": renderer_context.get("response").status_code,
-                }
-            )
+    Errors are told apart by the response status and the exception flag DRF
+    sets on responses built by its exception handler, without looking into
+    the data. Encodes with orjson when it is installed, and otherwise
+    exactly like ``json.dumps``.
+    """
 
-        else:
-            response = json.dumps(
-                {
-                    "data": data,
-                    "statusCode": renderer_context.get("response").status_code,
-                }
+    charset = "utf-8"
+
+    def get_envelope(self, data, renderer_context):
+        response = (renderer_context or {}).get("response")
+        status_code = response.status_code if response is not None else 200
+        is_error = status_code >= 400 or getattr(response, "exception", False)
+        return {"error" if is_error else "data": data, "statusCode": status_code}
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        envelope = self.get_envelope(data, renderer_context)
+        if orjson is not None:
+            return orjson.dumps(
+                envelope,
+                default=encoders.JSONEncoder().default,
+                # DRF and orjson do not format datetimes the same way
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
             )
+        return json.dumps(envelope, cls=encoders.JSONEncoder).encode(self.charset)
+
 
-        return response
\ No newline at end of file
+class CustomJSONRenderer(EnvelopeJSONRenderer):
+    pass
\ No newline at end of file
@@ -0,0 +1,175 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# KEYS[1]: the hash of the client; ARGV: now, ttl, then a scope, its
+# capacity and its refill rate per bucket. Returns the seconds to wait, as a
+# string since Redis truncates Lua numbers to integers.
+CONSUME_SCRIPT = """
+local now = tonumber(ARGV[1])
+local levels = {}
+local wait = 0
+for i = 3, #ARGV, 3 do
+    local capacity = tonumber(ARGV[i + 1])
+    local rate = tonumber(ARGV[i + 2])
+    local state = redis.call(
+        "HMGET", KEYS[1], ARGV[i] .. ":tokens", ARGV[i] .. ":updated"
+    )
+    local level = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - updated) * rate)
+    levels[i] = level
+    if level < 1 then
+        wait = math.max(wait, (1 - level) / rate)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i = 3, #ARGV, 3 do
+    redis.call(
+        "HSET", KEYS[1], ARGV[i] .. ":tokens", levels[i] - 1, ARGV[i] .. ":updated", now
+    )
+end
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+return "0"
+"""
+
+
+def parse_rate(rate):
+    """
+    Return the ``(capacity, seconds)`` of a rate like ``"100/hour"``
+    """
+    num, period = rate.split("/")
+    return int(num), DURATIONS[period[0]]
+
+
+def consume(state, buckets, now):
+    """
+    Take a token from every bucket of ``state`` if they all have one, and
+    return the seconds to wait otherwise.
+
+    ``state`` maps a scope to its ``[tokens, updated]``; ``buckets`` are
+    ``(scope, capacity, rate)`` tuples, rates in tokens per second.
+    """
+    levels = {}
+    wait = 0
+    for scope, capacity, rate in buckets:
+        tokens, updated = state.get(scope, (capacity, now))
+        level = min(capacity, tokens + max(0, now - updated) * rate)
+        levels[scope] = level
+        if level < 1:
+            wait = max(wait, (1 - level) / rate)
+    if wait == 0:
+        for scope, level in levels.items():
+            state[scope] = [level - 1, now]
+    return wait
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle a client by all the scopes applying to a request in one atomic
+    step: the ``throttle_scope`` of the view if it has one, like
+    ``ScopedRateThrottle``, and ``user`` or ``anon`` otherwise.
+
+    Every scope of a client is a token bucket holding the number of requests
+    of its rate, refilled continuously, so the state is a fixed pair of
+    numbers per scope rather than a history of timestamps. All the scopes of
+    a client are kept under a single key of ``THROTTLE_CACHE``: updated by
+    a Lua script on django-redis caches, and under a lock taken with
+    ``cache.add`` on the others, such as the database cache. Limits are only
+    shared by the workers sharing that cache.
+    """
+
+    cache_format = "throttle:{}"
+    lock_timeout = 1
+    lock_attempts = 20
+    lock_delay = 0.005
+    timer = time.time
+
+    _scripts = {}
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE]
+        self.wait_time = None
+
+    def get_scopes(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope:
+            return [scope]
+        return ["user" if request.user.is_authenticated else "anon"]
+
+    def get_cache_key(self, request):
+        if request.user.is_authenticated:
+            return self.cache_format.format(f"user:{request.user.pk}")
+        return self.cache_format.format(f"anon:{self.get_ident(request)}")
+
+    def get_buckets(self, request, view):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        buckets = []
+        for scope in self.get_scopes(request, view):
+            if rates.get(scope) is None:
+                continue
+            capacity, seconds = parse_rate(rates[scope])
+            buckets.append((scope, capacity, capacity / seconds))
+        return buckets
+
+    def allow_request(self, request, view):
+        buckets = self.get_buckets(request, view)
+        if not buckets:
+            return True
+        key = self.get_cache_key(request)
+        # Time for the fullest bucket to refill, after which it is as if new
+        ttl = max(int(capacity / rate) + 1 for _, capacity, rate in buckets)
+        now = self.timer()
+        script = self.get_script()
+        if script is not None:
+            args = [now, ttl]
+            for bucket in buckets:
+                args.extend(bucket)
+            self.wait_time = float(script(keys=[key], args=args))
+        else:
+            self.wait_time = self.consume_locked(key, buckets, now, ttl)
+        return self.wait_time == 0
+
+    def get_script(self):
+        """
+        Return the consume script registered on the Redis client of the
+        cache, if it is a django-redis one
+        """
+        client = getattr(self.cache, "client", None)
+        if not hasattr(client, "get_client"):
+            return None
+        alias = settings.THROTTLE_CACHE
+        if alias not in self._scripts:
+            redis = client.get_client(write=True)
+            self._scripts[alias] = redis.register_script(CONSUME_SCRIPT)
+        return self._scripts[alias]
+
+    def consume_locked(self, key, buckets, now, ttl):
+        lock = f"{key}:lock"
+        for _ in range(self.lock_attempts):
+            if self.cache.add(lock, 1, self.lock_timeout):
+                break
+            time.sleep(self.lock_delay)
+        else:
+            # Let the request through rather than stall on a stuck lock,
+            # which expires after lock_timeout
+            return 0
+        try:
+            state = self.cache.get(key) or {}
+            wait = consume(state, buckets, now)
+            if wait == 0:
+                self.cache.set(key, state, ttl)
+            return wait
+        finally:
+            self.cache.delete(lock)
+
+    def wait(self):
+        return self.wait_time